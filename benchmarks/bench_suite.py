@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# this_file: benchmarks/bench_suite.py
+"""Time fontnemo on a synthetic corpus and gate throughput regressions.
+
+Usage:
+    python benchmarks/bench_suite.py run [--corpus DIR] [--output FILE]
+        [--repeat N] [--batch N] [--quick] [--compare BASELINE]
+        [--threshold F]
+    python benchmarks/bench_suite.py compare BASELINE CURRENT [--threshold F]
+
+``run`` builds (or reuses) the corpus of benchmarks/corpus.py and times,
+for every corpus font:
+
+- ``view/KIND``: reading the family name
+- ``plan/KIND``: a dry run (``--dry-run``)
+- ``COMMAND/KIND``: each mutating command, to an explicit output path
+- ``modeN/KIND``: a suffix rename in output modes 0, 1 and 2
+
+plus ``batch/jobsN`` (renaming copies of the TrueType font in-process and
+with all cores) and ``cli/view`` (a complete ``fontnemo view`` process).
+Each case runs ``repeat`` times; the JSON results give the median and
+minimum seconds and the throughput (fonts per second at the median).
+
+``compare`` (or ``run --compare``) exits with status 1 if a case's
+throughput dropped by more than ``threshold`` (default 0.2 = 20%) against
+the baseline results.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Final
+
+from corpus import build_corpus
+
+from fontnemo import __version__
+from fontnemo.batch import run_batch
+from fontnemo.log import configure_logging
+from fontnemo.operations import (
+    plan_rename,
+    read_font_names,
+    rename_font,
+    resolve_params,
+)
+
+# Arguments of each mutating command, as the CLI passes them
+COMMANDS: Final[dict[str, dict[str, Any]]] = {
+    "new": {"new_family": "Bench Renamed"},
+    "replace": {"find": "Bench", "replace": "Marked"},
+    "suffix": {"suffix": " Beta"},
+    "prefix": {"prefix": "Draft "},
+    "timestamp": {},
+    "chain": {"steps": "prefix:Draft ;replace:Bench=Marked;timestamp"},
+}
+
+SAVE_MODES: Final[tuple[str, ...]] = ("0", "1", "2")
+
+# Corpus settings of --quick runs
+QUICK_CORPUS: Final[dict[str, int]] = {
+    "glyphs": 3000,
+    "instances": 50,
+    "languages": 100,
+}
+
+DEFAULT_THRESHOLD: Final[float] = 0.2
+
+
+def measure(
+    run: Callable[[], Any],
+    repeat: int,
+    setup: Callable[[], None] | None = None,
+    items: int = 1,
+) -> dict[str, Any]:
+    """Time run() repeat times (setup() runs untimed before each run).
+
+    Returns:
+        Median/minimum seconds, number of runs and fonts per second
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        "median_s": round(median, 6),
+        "min_s": round(min(times), 6),
+        "runs": repeat,
+        "items": items,
+        "ops_per_s": round(items / median, 3) if median else None,
+    }
+
+
+def _check(result: Any) -> None:
+    if not result.ok:
+        raise RuntimeError(f"{result.input_path}: {result.error}")
+
+
+def _clear(directory: Path) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir()
+
+
+def font_cases(
+    kind: str, source: Path, scratch: Path, repeat: int
+) -> dict[str, dict[str, Any]]:
+    """Time view, dry run, every command and every save mode on one font."""
+    results = {}
+    size = source.stat().st_size
+
+    def record(name: str, timing: dict[str, Any]) -> None:
+        results[f"{name}/{kind}"] = timing | {"bytes": size}
+        print(f"{name}/{kind}: {timing['median_s'] * 1000:.1f} ms", file=sys.stderr)
+
+    record("view", measure(lambda: _check(read_font_names(source)), repeat))
+    suffix = resolve_params("suffix", COMMANDS["suffix"])
+    record(
+        "plan",
+        measure(lambda: _check(plan_rename(source, "suffix", suffix)), repeat),
+    )
+
+    output = scratch / f"out{source.suffix}"
+    for command, params in COMMANDS.items():
+        resolved = resolve_params(command, params)
+        record(
+            command,
+            measure(
+                lambda c=command, p=resolved: _check(rename_font(source, c, p, output)),
+                repeat,
+            ),
+        )
+
+    # Modes 0/1 overwrite the input and 1/2 add files: start from a fresh copy
+    work = scratch / f"work{source.suffix}"
+    for mode in SAVE_MODES:
+
+        def setup() -> None:
+            _clear(scratch)
+            shutil.copyfile(source, work)
+
+        record(
+            f"mode{mode}",
+            measure(
+                lambda m=mode: _check(rename_font(work, "suffix", suffix, m)),
+                repeat,
+                setup,
+            ),
+        )
+    _clear(scratch)
+    return results
+
+
+def batch_cases(
+    source: Path, scratch: Path, repeat: int, count: int
+) -> dict[str, dict[str, Any]]:
+    """Time renaming count copies of a font in-process and with all cores."""
+    results = {}
+    inputs = scratch / "inputs"
+    outputs = scratch / "outputs"
+    _clear(scratch)
+    inputs.mkdir()
+    paths = []
+    for i in range(count):
+        paths.append(inputs / f"font{i:03d}{source.suffix}")
+        shutil.copyfile(source, paths[-1])
+    suffix = resolve_params("suffix", COMMANDS["suffix"])
+
+    for jobs in (1, 0):
+
+        def run(jobs: int = jobs) -> None:
+            for result in run_batch(
+                rename_font, paths, "suffix", suffix, str(outputs), jobs=jobs
+            ):
+                _check(result)
+
+        timing = measure(run, repeat, lambda: _clear(outputs), items=count)
+        results[f"batch/jobs{jobs}"] = timing | {"bytes": source.stat().st_size * count}
+        print(f"batch/jobs{jobs}: {timing['ops_per_s']:.1f} fonts/s", file=sys.stderr)
+    _clear(scratch)
+    return results
+
+
+def cli_cases(source: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time a complete ``fontnemo view`` process, startup included."""
+    command = [sys.executable, "-m", "fontnemo", "view", str(source)]
+    timing = measure(
+        lambda: subprocess.run(command, check=True, capture_output=True), repeat
+    )
+    print(f"cli/view: {timing['median_s'] * 1000:.1f} ms", file=sys.stderr)
+    return {"cli/view": timing | {"bytes": source.stat().st_size}}
+
+
+def run_suite(
+    corpus_dir: Path, repeat: int, batch: int, settings: dict[str, int]
+) -> dict[str, Any]:
+    """Build the corpus and run every case; return the JSON report."""
+    description = build_corpus(
+        corpus_dir, log=lambda message: print(message, file=sys.stderr), **settings
+    )
+    fonts = {kind: corpus_dir / name for kind, name in description["fonts"].items()}
+
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="fontnemo-bench-") as tmp:
+        scratch = Path(tmp) / "scratch"
+        scratch.mkdir()
+        for kind, path in fonts.items():
+            results |= font_cases(kind, path, scratch, repeat)
+        results |= batch_cases(fonts["tt"], scratch, repeat, batch)
+        results |= cli_cases(fonts["tt"], repeat)
+
+    return {
+        "fontnemo": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": description["settings"],
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """Print per-case throughput changes; return the regressed case names."""
+    regressions = []
+    base_results = baseline["results"]
+    print(f"{'case':28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        base = base_results.get(name)
+        if base is None or not base.get("ops_per_s") or not result.get("ops_per_s"):
+            print(f"{name:28} {'-':>12} {result.get('ops_per_s') or '-':>12}")
+            continue
+        change = result["ops_per_s"] / base["ops_per_s"] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:28} {base['ops_per_s']:>12.2f} {result['ops_per_s']:>12.2f}"
+            f" {change:>+8.1%}{flag}"
+        )
+    for name in base_results.keys() - current["results"].keys():
+        print(f"{name:28} (missing from current results)")
+    return regressions
+
+
+def _load(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _gate(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> None:
+    regressions = compare(baseline, current, threshold)
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) regressed by more than {threshold:.0%}: "
+            + ", ".join(regressions),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def main() -> None:
+    """Run the suite or compare two result files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--corpus", type=Path, help="Corpus directory (reused)")
+    run.add_argument("--output", type=Path, help="Results file (default: stdout)")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--batch", type=int, default=32, help="Fonts per batch run")
+    run.add_argument("--quick", action="store_true", help="Small corpus, 3 runs")
+    run.add_argument("--compare", type=Path, help="Baseline results to gate on")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    cmp = commands.add_parser("compare", help="Compare two results files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        _gate(_load(args.baseline), _load(args.current), args.threshold)
+        return
+
+    configure_logging(False)
+    settings = QUICK_CORPUS if args.quick else {}
+    repeat = min(args.repeat, 3) if args.quick else args.repeat
+    name = "fontnemo-bench-corpus" + ("-quick" if args.quick else "")
+    corpus_dir = args.corpus or Path(tempfile.gettempdir()) / name
+
+    report = run_suite(corpus_dir, repeat, args.batch, settings)
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    if args.compare:
+        _gate(_load(args.compare), report, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# this_file: benchmarks/corpus.py
+"""Generate a synthetic font corpus of real-world sizes for the benchmarks.
+
+Usage:
+    python benchmarks/corpus.py DIR [--glyphs N] [--instances N] [--languages N]
+
+The corpus holds:
+
+- ``tt.ttf``: TrueType font with ``glyphs`` outlines (default 30,000)
+- ``cff.otf``: CFF font with as many charstrings
+- ``variable.ttf``: variable TrueType font with a ``gvar`` delta per glyph
+  and ``instances`` named instances (each with its own name record)
+- ``localized.ttf``: small font with family/style/full/PostScript names in
+  ``languages`` Windows languages (thousands of name records)
+- ``collection.ttc``: four faces of ``tt.ttf`` sharing all tables but ``name``
+- ``tt.woff``/``tt.woff2``: ``tt.ttf`` as web fonts (WOFF2 needs brotli)
+
+Building the 30k-glyph fonts takes a while, so an existing corpus with the
+same parameters is reused (see ``corpus.json``).
+"""
+
+import argparse
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Final
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTCollection, TTFont
+from fontTools.ttLib.tables.TupleVariation import TupleVariation
+
+# Bumped when the generated fonts change
+CORPUS_VERSION: Final[int] = 1
+
+# Description of the corpus, written next to the fonts
+CORPUS_FILE: Final[str] = "corpus.json"
+
+DEFAULT_GLYPHS: Final[int] = 30_000
+DEFAULT_INSTANCES: Final[int] = 200
+DEFAULT_LANGUAGES: Final[int] = 500
+
+# Glyphs of the variable and localized fonts (their size is not the point)
+SMALL_GLYPHS: Final[int] = 500
+
+# First code point mapped to the generated glyphs (CJK Extension B, plane 2)
+FIRST_CODE_POINT: Final[int] = 0x20000
+
+# Name IDs written per language in the localized font
+LOCALIZED_NAME_IDS: Final[tuple[int, ...]] = (1, 2, 4, 6, 16, 17)
+
+
+def glyph_order(count: int) -> list[str]:
+    """Return ``.notdef``, ``space`` and generated glyph names."""
+    return [".notdef", "space"] + [f"g{i:05d}" for i in range(count - 2)]
+
+
+def outline_contours(index: int) -> list[list[tuple[int, int]]]:
+    """Return two closed polygons that differ from glyph to glyph.
+
+    About 80 points per glyph, so glyph data sizes are close to those of
+    real CJK fonts.
+    """
+    contours = []
+    for contour in range(2):
+        corners = 16 + (index + contour * 7) % 48
+        contours.append(
+            [
+                (
+                    50 + contour * 450 + (i * 397 + index * 31) % 400,
+                    50 + (i * 211 + index * 17 + contour * 101) % 650,
+                )
+                for i in range(corners)
+            ]
+        )
+    return contours
+
+
+def draw_glyph(pen: Any, index: int) -> int:
+    """Draw glyph index with pen; return its left side bearing."""
+    contours = outline_contours(index)
+    for points in contours:
+        pen.moveTo(points[0])
+        for point in points[1:]:
+            pen.lineTo(point)
+        pen.closePath()
+    return min(x for points in contours for x, _ in points)
+
+
+def _setup_common(fb: FontBuilder, names: list[str]) -> None:
+    fb.setupGlyphOrder(names)
+    fb.setupCharacterMap(
+        {FIRST_CODE_POINT + i: name for i, name in enumerate(names[2:])}
+        | {0x20: "space"}
+    )
+
+
+def _finish(fb: FontBuilder, family: str, metrics: dict[str, tuple[int, int]]) -> None:
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable(
+        {
+            "familyName": family,
+            "styleName": "Regular",
+            "psName": family.replace(" ", "") + "-Regular",
+            "typographicFamily": family,
+        }
+    )
+    fb.setupOS2(sTypoAscender=800, usWinAscent=800, usWinDescent=200)
+    fb.setupPost()
+
+
+def build_truetype(count: int, family: str) -> TTFont:
+    """Build a TrueType font with count glyphs."""
+    names = glyph_order(count)
+    fb = FontBuilder(1000, isTTF=True)
+    _setup_common(fb, names)
+    glyphs = {}
+    for index, name in enumerate(names):
+        pen = TTGlyphPen(None)
+        if name != "space":
+            draw_glyph(pen, index)
+        glyphs[name] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    glyf = fb.font["glyf"]
+    _finish(fb, family, {name: (600, getattr(glyf[name], "xMin", 0)) for name in names})
+    return fb.font
+
+
+def build_cff(count: int, family: str) -> TTFont:
+    """Build a CFF-flavored OpenType font with count glyphs."""
+    names = glyph_order(count)
+    fb = FontBuilder(1000, isTTF=False)
+    _setup_common(fb, names)
+    charstrings = {}
+    metrics = {}
+    for index, name in enumerate(names):
+        pen = T2CharStringPen(600, None)
+        left = draw_glyph(pen, index) if name != "space" else 0
+        charstrings[name] = pen.getCharString()
+        metrics[name] = (600, left)
+    ps_name = family.replace(" ", "") + "-Regular"
+    fb.setupCFF(ps_name, {"FullName": family}, charstrings, {})
+    _finish(fb, family, metrics)
+    return fb.font
+
+
+def build_variable(instances: int, family: str) -> TTFont:
+    """Build a variable TrueType font with a weight axis and named instances."""
+    font = build_truetype(SMALL_GLYPHS, family)
+    fb = FontBuilder(font=font)
+    fb.setupFvar(
+        [("wght", 100, 400, 900, "Weight")],
+        [
+            {
+                "location": {"wght": 100 + 800 * i / max(instances - 1, 1)},
+                "stylename": f"Weight {i:03d}",
+            }
+            for i in range(instances)
+        ],
+    )
+    glyf = font["glyf"]
+    variations = {}
+    for name in font.getGlyphOrder():
+        glyph = glyf[name]
+        points = glyph.numberOfContours and len(glyph.coordinates) or 0
+        # One delta per outline point plus the four phantom points
+        deltas = [(20, 0)] * points + [(0, 0)] * 4
+        variations[name] = [TupleVariation({"wght": (0, 1, 1)}, deltas)]
+    fb.setupGvar(variations)
+    return font
+
+
+def build_localized(languages: int, family: str) -> TTFont:
+    """Build a small font with its names in many Windows languages."""
+    font = build_truetype(SMALL_GLYPHS, family)
+    name_table = font["name"]
+    lang_ids = [lang for lang in range(0x0401, 0x0401 + languages + 1) if lang != 0x409]
+    for lang_id in lang_ids[:languages]:
+        # Short strings: the name table's string storage is limited to 64 KB
+        local = f"Bench {lang_id:04x}"
+        strings = {
+            1: local,
+            2: "Regular",
+            4: f"{local} Regular",
+            6: f"{local.replace(' ', '')}-Regular",
+            16: local,
+            17: "Regular",
+        }
+        for name_id in LOCALIZED_NAME_IDS:
+            name_table.setName(strings[name_id], name_id, 3, 1, lang_id)
+    return font
+
+
+def build_collection(source: Path, output: Path, faces: int = 4) -> None:
+    """Save faces copies of source as a collection sharing all other tables."""
+    collection = TTCollection()
+    for face in range(faces):
+        font = TTFont(str(source))
+        for record in font["name"].names:
+            if record.nameID in (1, 16):
+                record.string = f"Bench Face {face}"
+        collection.fonts.append(font)
+    collection.save(str(output), shareTables=True)
+
+
+def _save(font: TTFont, path: Path, flavor: str | None = None) -> None:
+    font.flavor = flavor
+    font.save(str(path))
+
+
+def build_corpus(
+    directory: Path,
+    glyphs: int = DEFAULT_GLYPHS,
+    instances: int = DEFAULT_INSTANCES,
+    languages: int = DEFAULT_LANGUAGES,
+    log: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    """Build the corpus in directory, or reuse one built with the same settings.
+
+    Returns:
+        Corpus description: settings and font file names by kind
+    """
+    settings = {
+        "version": CORPUS_VERSION,
+        "glyphs": glyphs,
+        "instances": instances,
+        "languages": languages,
+    }
+    description_path = directory / CORPUS_FILE
+    if description_path.exists():
+        description = json.loads(description_path.read_text())
+        if description.get("settings") == settings and all(
+            (directory / name).exists() for name in description["fonts"].values()
+        ):
+            return description
+
+    directory.mkdir(parents=True, exist_ok=True)
+    fonts: dict[str, str] = {}
+
+    log(f"Building {glyphs}-glyph TrueType font")
+    tt = build_truetype(glyphs, "Bench TrueType")
+    _save(tt, directory / "tt.ttf")
+    fonts["tt"] = "tt.ttf"
+    for flavor in ("woff", "woff2"):
+        try:
+            _save(TTFont(str(directory / "tt.ttf")), directory / f"tt.{flavor}", flavor)
+        except ImportError:
+            log(f"brotli not installed: skipping {flavor.upper()}")
+            continue
+        fonts[flavor] = f"tt.{flavor}"
+
+    log(f"Building {glyphs}-glyph CFF font")
+    _save(build_cff(glyphs, "Bench CFF"), directory / "cff.otf")
+    fonts["cff"] = "cff.otf"
+
+    log(f"Building variable font with {instances} named instances")
+    _save(build_variable(instances, "Bench Variable"), directory / "variable.ttf")
+    fonts["variable"] = "variable.ttf"
+
+    log(f"Building font with names in {languages} languages")
+    _save(build_localized(languages, "Bench Localized"), directory / "localized.ttf")
+    fonts["localized"] = "localized.ttf"
+
+    log("Building collection")
+    build_collection(directory / "tt.ttf", directory / "collection.ttc")
+    fonts["collection"] = "collection.ttc"
+
+    description = {"settings": settings, "fonts": fonts}
+    description_path.write_text(json.dumps(description, indent=2) + "\n")
+    return description
+
+
+def main() -> None:
+    """Build the corpus from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--glyphs", type=int, default=DEFAULT_GLYPHS)
+    parser.add_argument("--instances", type=int, default=DEFAULT_INSTANCES)
+    parser.add_argument("--languages", type=int, default=DEFAULT_LANGUAGES)
+    args = parser.parse_args()
+    description = build_corpus(
+        args.directory, args.glyphs, args.instances, args.languages
+    )
+    for kind, name in description["fonts"].items():
+        size = (args.directory / name).stat().st_size
+        print(f"{kind:12} {name:16} {size:>12,} bytes")
+
+
+if __name__ == "__main__":
+    main()
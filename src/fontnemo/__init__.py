@@ -1,10 +1,44 @@
 #!/usr/bin/env python3
 # this_file: src/fontnemo/__init__.py
-"""fontnemo - CLI tool for modifying font family names."""
+"""fontnemo - CLI tool for modifying font family names.
+
+Library use, without temp files::
+
+    from fontnemo import rename_font_data, rename_ttfont
+
+    renamed = rename_font_data(font_bytes, "suffix", {"suffix": " Beta"})
+    font = rename_ttfont(font, "new", {"new_family": "My Family"})
+
+From asyncio code, ``AsyncRenamer`` (fontnemo.aio) runs the same work in
+thread and process pools.
+"""
+
+from typing import Any
 
 try:
     from fontnemo._version import __version__
 except ImportError:
     __version__ = "0.0.0+unknown"
 
-__all__ = ["__version__"]
+# Public API, imported on first access so `import fontnemo` stays cheap
+_LAZY_EXPORTS = {
+    "rename_font": "fontnemo.operations",
+    "rename_font_data": "fontnemo.operations",
+    "rename_ttfont": "fontnemo.operations",
+    "read_font_names": "fontnemo.operations",
+    "FontNameHandler": "fontnemo.core",
+    "FontCollectionHandler": "fontnemo.core",
+    "AsyncRenamer": "fontnemo.aio",
+}
+
+__all__ = ["__version__", *_LAZY_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public API members lazily (PEP 562)."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'fontnemo' has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(module), name)
@@ -1,443 +1,1372 @@
 #!/usr/bin/env python3
 # this_file: src/fontnemo/__main__.py
-"""CLI entry point for fontnemo using Fire."""
+"""CLI entry point for fontnemo.
 
-import sys
-
-import fire
-from loguru import logger
+Known commands are dispatched directly (see fontnemo.dispatch); fire is only
+imported for help output and anything the lightweight parser does not handle.
+"""
 
-from fontnemo.core import FontNameHandler, save_font_safely
-from fontnemo.utils import make_slug, make_timestamp
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.batch import expand_input_paths, resolve_jobs, run_batch
+from fontnemo.core import parse_faces, parse_formats
+from fontnemo.discover import DEFAULT_SYMLINKS
+from fontnemo.fileops import (
+    DEFAULT_DURABILITY,
+    batch_durability,
+    parse_durability,
+    sync_directories,
+)
+from fontnemo.log import configure_logging, logger
+from fontnemo.operations import (
+    STDIO_PATH,
+    TIMESTAMP_SEPARATOR,
+    RenameResult,
+    plan_record,
+    plan_rename,
+    read_font_names,
+    rename_font,
+    rename_stream,
+    resolve_params,
+    written_directories,
+)
 
 
 class FontNemoCLI:
-    """fontnemo CLI - Modify font family names in OpenType/TrueType fonts."""
+    """fontnemo CLI - Modify font family names in OpenType/TrueType fonts.
+
+    Every command accepts one or more input paths, glob patterns or
+    directories, and a --jobs option to process fonts in parallel.
+    Directories are searched for files with a font signature; --include,
+    --exclude and --symlinks control the search.
+    Font collections (.ttc/.otc) are supported; --face selects faces.
+    WOFF and WOFF2 web fonts are renamed without converting them to sfnt.
+    """
 
-    def __init__(self, verbose: bool = False) -> None:
+    def __init__(
+        self,
+        verbose: bool = False,
+        include: str = "",
+        exclude: str = "",
+        symlinks: str = DEFAULT_SYMLINKS,
+    ) -> None:
         """Initialize CLI with optional verbose logging.
 
         Args:
             verbose: Enable debug logging
+            include: Comma-separated patterns files found in directories
+                must match, e.g. "*.otf,*.ttf" (default: all fonts)
+            exclude: Comma-separated patterns of files and directories to
+                skip in directories, e.g. ".git,build/*"
+            symlinks: In directories, "skip" symlinks, follow those to
+                "files" (default), or "follow" them all
         """
-        # Configure loguru
-        logger.remove()  # Remove default handler
-        if verbose:
-            logger.add(sys.stderr, level="DEBUG")
-        else:
-            logger.add(sys.stderr, level="WARNING")
-
+        configure_logging(verbose)
         self.verbose = verbose
+        self.include = include
+        self.exclude = exclude
+        self.symlinks = symlinks
+
+    def _expand(self, input_paths: tuple[str, ...], jobs: int) -> list[Path]:
+        """Expand inputs into font files (see batch.expand_input_paths).
+
+        Raises:
+            ValueError: If no fonts are given or the symlink policy is unknown
+            FileNotFoundError: If a glob matches nothing
+        """
+        paths = expand_input_paths(
+            input_paths, self.include, self.exclude, self.symlinks, jobs
+        )
+        if not paths:
+            raise ValueError("No input fonts given")
+        return paths
+
+    def _print_results(self, results: list[RenameResult], long: bool) -> None:
+        """Print per-file results and exit non-zero if any file failed."""
+        failed = 0
+        for result in results:
+            if not result.ok:
+                failed += 1
+                logger.error(f"Error: {result.input_path}: {result.error}")
+                continue
+
+            path = result.output_path or result.input_path
+            if result.faces is not None:
+                # Collections: one line per face, path#index in long mode
+                for index, name in result.faces:
+                    print(f"{path}#{index}:{name}" if long else name)
+                continue
+
+            family = result.new_family_name or result.family_name
+            if long:
+                for output in result.output_paths or [path]:
+                    print(f"{output}:{family}")
+            else:
+                print(family)
+
+        if failed:
+            if len(results) > 1:
+                logger.error(f"{failed} of {len(results)} font(s) failed")
+            sys.exit(1)
 
-    def view(self, input_path: str, long: bool = False) -> None:
+    def _positional(
+        self,
+        input_paths: tuple[str, ...],
+        values: dict[str, str | None],
+        output_path: str,
+    ) -> tuple[tuple[str, ...], dict[str, str], str]:
+        """Resolve the single-font positional form, e.g. ``new FONT FAMILY``.
+
+        Values not given as flags are taken, in order, from the positional
+        arguments after one input font, optionally followed by the output
+        path, as before batch mode. Values must be all flags or all
+        positional.
+
+        Returns:
+            (input paths, values, output path)
+        """
+        given = {name: value for name, value in values.items() if value is not None}
+        if len(given) == len(values):
+            return input_paths, given, output_path
+        count = len(values)
+        if given or not count + 1 <= len(input_paths) <= count + 2:
+            flags = " and ".join(f"--{name}" for name in values)
+            usage = " ".join(name.upper() for name in values)
+            logger.error(
+                f"Error: Give {flags}, or one font followed by {usage} [OUTPUT_PATH]"
+            )
+            sys.exit(1)
+        positional = input_paths[1 : count + 1]
+        if len(input_paths) == count + 2:
+            if str(output_path) != "0":
+                logger.error("Error: output_path given twice")
+                sys.exit(1)
+            output_path = input_paths[-1]
+        return input_paths[:1], dict(zip(values, positional, strict=True)), output_path
+
+    def _rename(
+        self,
+        operation: str,
+        input_paths: tuple[str, ...],
+        params: dict[str, Any],
+        output_path: str,
+        long: bool,
+        jobs: int,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
+        """Expand inputs and run one rename operation over all of them."""
+        output_path = str(output_path)
+        if dry_run:
+            self._plan(operation, input_paths, params, output_path, jobs, face, formats)
+            return
+        measure = profile or bool(profile_json)
+        if STDIO_PATH in input_paths or output_path == STDIO_PATH:
+            # Streamed output leaves no file to record, so --cache is moot
+            self._rename_stream(
+                operation, input_paths, params, output_path, verify, face, formats
+            )
+            return
+
+        try:
+            paths = self._expand(input_paths, jobs)
+
+            if (
+                len(paths) > 1
+                and output_path not in ("0", "1", "2")
+                and not Path(output_path).is_dir()
+            ):
+                raise ValueError(
+                    "With multiple input fonts, output_path must be "
+                    "0, 1, 2 or an existing directory"
+                )
+
+            resolved = resolve_params(operation, params)
+            faces = parse_faces(face)
+            output_formats = parse_formats(formats)
+            level = parse_durability(durability)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
+        # Batches sync each output directory once, after all fonts
+        font_durability = batch_durability(level) if len(paths) > 1 else level
+
+        def run(todo: list[Path]) -> Iterator[RenameResult]:
+            return run_batch(
+                rename_font,
+                todo,
+                operation,
+                resolved,
+                output_path,
+                verify,
+                faces,
+                output_formats,
+                measure,
+                font_durability,
+                jobs=jobs,
+                initializer=configure_logging,
+                initargs=(self.verbose,),
+            )
+
+        if not cache:
+            results = list(run(paths))
+            self._sync_outputs(results, level, font_durability)
+            self._report_profiles(results, profile, profile_json)
+            self._print_results(results, long)
+            return
+
+        from fontnemo.cache import RenameCache, run_with_cache
+
+        key = (operation, resolved, output_path, faces, output_formats)
+        try:
+            rename_cache = RenameCache()
+        except Exception as e:
+            logger.error(f"Error: cache: {e}")
+            sys.exit(1)
+        with rename_cache:
+            results = list(
+                run_with_cache(
+                    rename_cache,
+                    paths,
+                    lambda path: rename_cache.lookup(path, *key),
+                    run,
+                    lambda path, result: rename_cache.record(result, *key),
+                )
+            )
+        self._sync_outputs(results, level, font_durability)
+        self._report_profiles(results, profile, profile_json)
+        self._print_results(results, long)
+
+    def _sync_outputs(
+        self, results: list[RenameResult], durability: str, font_durability: str
+    ) -> None:
+        """Sync the output directories of a batch whose fonts did not."""
+        if durability == font_durability:
+            return
+        try:
+            sync_directories(written_directories(results))
+        except OSError as e:
+            logger.error(f"Error: sync: {e}")
+            sys.exit(1)
+
+    def _report_profiles(
+        self, results: list[RenameResult], profile: bool, profile_json: str
+    ) -> None:
+        """Print the profile total to stderr and/or write per-font profiles.
+
+        Cached results were not run, so they have no profile.
+        """
+        if not profile and not profile_json:
+            return
+        import json
+
+        from fontnemo.instrument import aggregate, format_summary
+
+        profiles = [result.profile for result in results if result.profile]
+        total = aggregate(profiles)
+        if profile:
+            print(format_summary(total), file=sys.stderr)
+        if profile_json:
+            try:
+                with open(profile_json, "w", encoding="utf-8") as f:
+                    for record in profiles:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.write(json.dumps({"total": total}) + "\n")
+            except OSError as e:
+                logger.error(f"Error: profile: {e}")
+
+    def _plan(
+        self,
+        operation: str,
+        input_paths: tuple[str, ...],
+        params: dict[str, Any],
+        output_path: str,
+        jobs: int,
+        face: str,
+        formats: str,
+    ) -> None:
+        """Print one JSON line per font with the changes a rename would make."""
+        try:
+            paths = self._expand(input_paths, jobs)
+            resolved = resolve_params(operation, params)
+            faces = parse_faces(face)
+            output_formats = parse_formats(formats)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
+
+        import json
+
+        failed = 0
+        for result in run_batch(
+            plan_rename,
+            paths,
+            operation,
+            resolved,
+            output_path,
+            faces,
+            output_formats,
+            jobs=jobs,
+            initializer=configure_logging,
+            initargs=(self.verbose,),
+        ):
+            failed += not result.ok
+            print(json.dumps(plan_record(result), ensure_ascii=False), flush=True)
+        if failed:
+            logger.error(f"{failed} of {len(paths)} font(s) failed")
+            sys.exit(1)
+
+    def _rename_stream(
+        self,
+        operation: str,
+        input_paths: tuple[str, ...],
+        params: dict[str, Any],
+        output_path: str,
+        verify: bool,
+        face: str,
+        formats: str,
+    ) -> None:
+        """Rename one font from a file or stdin and write it to stdout."""
+        try:
+            if len(input_paths) != 1:
+                raise ValueError("Streaming with '-' works on a single font")
+            if output_path not in ("0", STDIO_PATH):
+                raise ValueError(
+                    "A font read from stdin can only be written to stdout "
+                    "(--output_path=-)"
+                )
+            if sys.stdout.isatty():
+                raise ValueError("Refusing to write font data to a terminal")
+            resolved = resolve_params(operation, params)
+            faces = parse_faces(face)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
+
+        result = rename_stream(
+            input_paths[0],
+            operation,
+            resolved,
+            sys.stdout.buffer,
+            verify,
+            faces,
+            formats or None,
+        )
+        if not result.ok:
+            logger.error(f"Error: {result.input_path}: {result.error}")
+            sys.exit(1)
+
+    def view(
+        self, *input_paths: str, long: bool = False, jobs: int = 1, face: str = ""
+    ) -> None:
         """Display current font family name.
 
         Args:
-            input_path: Input font file (.ttf, .otf)
+            input_paths: Input font files (.ttf, .otf, .ttc, .otc, .woff,
+                .woff2), globs or directories
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            face: Collection faces to show, e.g. "0" or "0,2" (default: all)
 
         Examples:
             fontnemo view font.ttf
             fontnemo v font.ttf --long
+            fontnemo v "fonts/**/*.ttf" --long --jobs=0
+            fontnemo v family.ttc --face=0,2
         """
         try:
-            handler = FontNameHandler(input_path)
-            family_name = handler.read_family_name()
-            handler.close()
-
-            if long:
-                print(f"{input_path}:{family_name}")
-            else:
-                print(family_name)
-
+            paths = self._expand(input_paths, jobs)
+            faces = parse_faces(face)
         except Exception as e:
             logger.error(f"Error: {e}")
             sys.exit(1)
 
-    def v(self, input_path: str, long: bool = False) -> None:
+        results = list(
+            run_batch(
+                read_font_names,
+                paths,
+                faces,
+                jobs=jobs,
+                initializer=configure_logging,
+                initargs=(self.verbose,),
+            )
+        )
+        self._print_results(results, long)
+
+    def v(
+        self, *input_paths: str, long: bool = False, jobs: int = 1, face: str = ""
+    ) -> None:
         """Alias for view command."""
-        return self.view(input_path=input_path, long=long)
+        return self.view(*input_paths, long=long, jobs=jobs, face=face)
 
     def new(
         self,
-        input_path: str,
-        new_family: str,
+        *input_paths: str,
+        new_family: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Set new font family name.
 
         Args:
-            input_path: Input font file
-            new_family: New family name
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
+            new_family: New family name (or the positional form below)
             output_path: Output mode:
                 - "0" (default): Replace input file
                 - "1": Backup original, then replace
                 - "2": Save with timestamp suffix
-                - path string: Save to specific path
+                - "-": Write the font to stdout (also the default when the
+                  input is "-", i.e. stdin)
+                - path string: Save to specific path (a directory when
+                  processing several fonts)
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
 
         Examples:
             fontnemo new font.ttf --new_family="My New Font"
             fontnemo n font.ttf --new_family="Test" --output_path="output.ttf"
+            fontnemo n fonts/ --new_family="Test" --jobs=0
+            fontnemo new font.ttf "My New Font" output.ttf
         """
-        try:
-            handler = FontNameHandler(input_path)
-
-            # Generate slug from new family name
-            new_slug = make_slug(new_family)
-
-            logger.info(f"Setting family_name: {new_family!r}")
-            logger.info(f"Setting family_slug: {new_slug!r}")
-
-            # Write changes
-            handler.write_family_name(new_family)
-            handler.write_family_slug(new_slug)
-
-            # Save with appropriate mode
-            final_path = save_font_safely(handler, output_path)
-            handler.close()
-
-            # Print final result
-            result_handler = FontNameHandler(final_path)
-            final_family_name = result_handler.read_family_name()
-            result_handler.close()
-
-            if long:
-                print(f"{final_path}:{final_family_name}")
-            else:
-                print(final_family_name)
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            sys.exit(1)
+        input_paths, params, output_path = self._positional(
+            input_paths, {"new_family": new_family}, output_path
+        )
+        self._rename(
+            "new",
+            input_paths,
+            params,
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
 
     def n(
         self,
-        input_path: str,
-        new_family: str,
+        *input_paths: str,
+        new_family: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Alias for new command."""
         return self.new(
-            input_path=input_path,
+            *input_paths,
             new_family=new_family,
             output_path=output_path,
             long=long,
+            jobs=jobs,
+            verify=verify,
+            face=face,
+            formats=formats,
+            cache=cache,
+            dry_run=dry_run,
+            profile=profile,
+            profile_json=profile_json,
+            durability=durability,
         )
 
     def replace(
         self,
-        input_path: str,
-        find: str,
-        replace: str,
+        *input_paths: str,
+        find: str | None = None,
+        replace: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Find and replace in font family name.
 
         Args:
-            input_path: Input font file
-            find: String to find
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
+            find: String to find (or the positional form below)
             replace: String to replace with
             output_path: Output mode (see 'new' command)
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
 
         Examples:
             fontnemo replace font.ttf --find="Old" --replace="New"
             fontnemo r font.ttf --find="Test" --replace="Production"
+            fontnemo replace font.ttf Old New
         """
-        try:
-            handler = FontNameHandler(input_path)
-
-            # Read current names
-            family_name = handler.read_family_name()
-            family_slug = handler.read_family_slug()
-
-            # Replace in family name
-            new_family_name = family_name.replace(find, replace)
-
-            # Replace in slug (convert find/replace to slugs first)
-            find_slug = make_slug(find)
-            replace_slug = make_slug(replace)
-            new_family_slug = family_slug.replace(find_slug, replace_slug)
-
-            logger.info(f"family_name: {family_name!r} → {new_family_name!r}")
-            logger.info(f"family_slug: {family_slug!r} → {new_family_slug!r}")
-
-            # Write changes
-            handler.write_family_name(new_family_name)
-            handler.write_family_slug(new_family_slug)
-
-            # Save
-            final_path = save_font_safely(handler, output_path)
-            handler.close()
-
-            # Print final result
-            result_handler = FontNameHandler(final_path)
-            final_family_name = result_handler.read_family_name()
-            result_handler.close()
-
-            if long:
-                print(f"{final_path}:{final_family_name}")
-            else:
-                print(final_family_name)
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            sys.exit(1)
+        input_paths, params, output_path = self._positional(
+            input_paths, {"find": find, "replace": replace}, output_path
+        )
+        self._rename(
+            "replace",
+            input_paths,
+            params,
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
 
     def r(
         self,
-        input_path: str,
-        find: str,
-        replace: str,
+        *input_paths: str,
+        find: str | None = None,
+        replace: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Alias for replace command."""
         return self.replace(
-            input_path=input_path,
+            *input_paths,
             find=find,
             replace=replace,
             output_path=output_path,
             long=long,
+            jobs=jobs,
+            verify=verify,
+            face=face,
+            formats=formats,
+            cache=cache,
+            dry_run=dry_run,
+            profile=profile,
+            profile_json=profile_json,
+            durability=durability,
         )
 
     def suffix(
         self,
-        input_path: str,
-        suffix: str,
+        *input_paths: str,
+        suffix: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Append suffix to font family name.
 
         Args:
-            input_path: Input font file
-            suffix: Suffix to append
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
+            suffix: Suffix to append (or the positional form below)
             output_path: Output mode (see 'new' command)
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
 
         Examples:
             fontnemo suffix font.ttf --suffix=" Beta"
             fontnemo s font.ttf --suffix=" v2"
+            fontnemo suffix font.ttf " Beta"
         """
-        try:
-            handler = FontNameHandler(input_path)
-
-            # Read current names
-            family_name = handler.read_family_name()
-            family_slug = handler.read_family_slug()
-
-            # Append suffix
-            new_family_name = family_name + suffix
-            new_family_slug = family_slug + make_slug(suffix)
-
-            logger.info(f"family_name: {family_name!r} → {new_family_name!r}")
-            logger.info(f"family_slug: {family_slug!r} → {new_family_slug!r}")
-
-            # Write changes
-            handler.write_family_name(new_family_name)
-            handler.write_family_slug(new_family_slug)
-
-            # Save
-            final_path = save_font_safely(handler, output_path)
-            handler.close()
-
-            # Print final result
-            result_handler = FontNameHandler(final_path)
-            final_family_name = result_handler.read_family_name()
-            result_handler.close()
-
-            if long:
-                print(f"{final_path}:{final_family_name}")
-            else:
-                print(final_family_name)
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            sys.exit(1)
+        input_paths, params, output_path = self._positional(
+            input_paths, {"suffix": suffix}, output_path
+        )
+        self._rename(
+            "suffix",
+            input_paths,
+            params,
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
 
     def s(
         self,
-        input_path: str,
-        suffix: str,
+        *input_paths: str,
+        suffix: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Alias for suffix command."""
         return self.suffix(
-            input_path=input_path,
+            *input_paths,
             suffix=suffix,
             output_path=output_path,
             long=long,
+            jobs=jobs,
+            verify=verify,
+            face=face,
+            formats=formats,
+            cache=cache,
+            dry_run=dry_run,
+            profile=profile,
+            profile_json=profile_json,
+            durability=durability,
         )
 
     def prefix(
         self,
-        input_path: str,
-        prefix: str,
+        *input_paths: str,
+        prefix: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Prepend prefix to font family name.
 
         Args:
-            input_path: Input font file
-            prefix: Prefix to prepend
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
+            prefix: Prefix to prepend (or the positional form below)
             output_path: Output mode (see 'new' command)
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
 
         Examples:
             fontnemo prefix font.ttf --prefix="Beta "
             fontnemo p font.ttf --prefix="Draft "
+            fontnemo prefix font.ttf "Beta "
         """
-        try:
-            handler = FontNameHandler(input_path)
-
-            # Read current names
-            family_name = handler.read_family_name()
-            family_slug = handler.read_family_slug()
-
-            # Prepend prefix
-            new_family_name = prefix + family_name
-            new_family_slug = make_slug(prefix) + family_slug
-
-            logger.info(f"family_name: {family_name!r} → {new_family_name!r}")
-            logger.info(f"family_slug: {family_slug!r} → {new_family_slug!r}")
-
-            # Write changes
-            handler.write_family_name(new_family_name)
-            handler.write_family_slug(new_family_slug)
-
-            # Save
-            final_path = save_font_safely(handler, output_path)
-            handler.close()
-
-            # Print final result
-            result_handler = FontNameHandler(final_path)
-            final_family_name = result_handler.read_family_name()
-            result_handler.close()
-
-            if long:
-                print(f"{final_path}:{final_family_name}")
-            else:
-                print(final_family_name)
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            sys.exit(1)
+        input_paths, params, output_path = self._positional(
+            input_paths, {"prefix": prefix}, output_path
+        )
+        self._rename(
+            "prefix",
+            input_paths,
+            params,
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
 
     def p(
         self,
-        input_path: str,
-        prefix: str,
+        *input_paths: str,
+        prefix: str | None = None,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Alias for prefix command."""
         return self.prefix(
-            input_path=input_path,
+            *input_paths,
             prefix=prefix,
             output_path=output_path,
             long=long,
+            jobs=jobs,
+            verify=verify,
+            face=face,
+            formats=formats,
+            cache=cache,
+            dry_run=dry_run,
+            profile=profile,
+            profile_json=profile_json,
+            durability=durability,
         )
 
     def timestamp(
         self,
-        input_path: str,
-        separator: str = " tX",
+        *input_paths: str,
+        separator: str = TIMESTAMP_SEPARATOR,
         replace_timestamp: bool = True,
         output_path: str = "0",
         long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
         """Append timestamp suffix to font family name.
 
+        All fonts in one run receive the same timestamp.
+
         Args:
-            input_path: Input font file
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
             separator: Separator before timestamp (default: " tX")
             replace_timestamp: Remove old timestamp before adding new (default: True)
             output_path: Output mode (see 'new' command)
             long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
 
         Examples:
             fontnemo timestamp font.ttf
             fontnemo t font.ttf --separator="-"
             fontnemo t font.ttf --replace_timestamp=False
         """
+        self._rename(
+            "timestamp",
+            input_paths,
+            {"separator": separator, "replace_timestamp": replace_timestamp},
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
+
+    def t(
+        self,
+        *input_paths: str,
+        separator: str = TIMESTAMP_SEPARATOR,
+        replace_timestamp: bool = True,
+        output_path: str = "0",
+        long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
+        """Alias for timestamp command."""
+        return self.timestamp(
+            *input_paths,
+            separator=separator,
+            replace_timestamp=replace_timestamp,
+            output_path=output_path,
+            long=long,
+            jobs=jobs,
+            verify=verify,
+            face=face,
+            formats=formats,
+            cache=cache,
+            dry_run=dry_run,
+            profile=profile,
+            profile_json=profile_json,
+            durability=durability,
+        )
+
+    def chain(
+        self,
+        *input_paths: str,
+        steps: str,
+        output_path: str = "0",
+        long: bool = False,
+        jobs: int = 1,
+        verify: bool = False,
+        face: str = "",
+        formats: str = "",
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        profile_json: str = "",
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
+        """Apply several operations in order, with one load and one save.
+
+        Each step transforms the family name and slug left by the previous
+        one, with the same rules as the individual commands.
+
+        Args:
+            input_paths: Input font files, globs or directories ("-" reads
+                one font from stdin)
+            steps: Steps separated by ";", each "operation:argument", e.g.
+                "prefix:Beta ;replace:Old=New;timestamp" (replace takes
+                find=replacement; timestamp takes an optional separator), or
+                a JSON array of [operation, {arguments}] pairs
+            output_path: Output mode (see 'new' command)
+            long: If True, show path prefix in output
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            face: Collection faces to process, e.g. "0" or "0,2" (default: all)
+            formats: Output formats written from one rename, e.g.
+                "sfnt,woff,woff2" (default: the input's format)
+            cache: Skip fonts whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Print the planned changes as JSON lines, write nothing
+            profile: Print per-phase time, bytes read/written and peak memory
+                (summed over all fonts) to stderr
+            profile_json: File receiving one JSON profile per font and a
+                final total (see fontnemo.instrument)
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once)
+
+        Examples:
+            fontnemo chain font.ttf --steps="prefix:Beta ;replace:Old=New;timestamp"
+            fontnemo chain fonts/ --steps="new:Release;suffix: Pro" --jobs=0
+        """
+        self._rename(
+            "chain",
+            input_paths,
+            {"steps": steps},
+            output_path,
+            long,
+            jobs,
+            verify,
+            face,
+            formats,
+            cache,
+            dry_run,
+            profile,
+            profile_json,
+            durability,
+        )
+
+    def apply_manifest(
+        self,
+        manifest: str,
+        results: str = "",
+        jobs: int = 0,
+        verify: bool = False,
+        cache: bool = False,
+        dry_run: bool = False,
+        profile: bool = False,
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
+        """Run the renames listed in a CSV or JSONL manifest.
+
+        Each row names a font ``path``, an ``operation`` (new, replace,
+        suffix, prefix, timestamp), optional ``output_path``, ``face`` and
+        ``formats``, and the operation's arguments: either one column per
+        argument (``new_family``, ``find``, ``replace``, ``suffix``, ...)
+        or an ``args`` JSON object. Rows run in parallel; one JSON result
+        per row (old/new family_name and family_slug, output_path, seconds,
+        ok, error) is written in manifest order.
+
+        Args:
+            manifest: Manifest file (.csv, .jsonl), or "-" for stdin
+            results: File for the JSONL results (default: stdout)
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            cache: Skip rows whose output, recorded by an earlier run with
+                the same arguments, is still up to date (see fontnemo.cache)
+            dry_run: Add each row's planned name record changes to its result
+                and write nothing
+            profile: Add each row's per-phase time, bytes and peak memory to
+                its result as ``profile``, and print the total to stderr
+            durability: "none" (default), "file" (fsync each written font) or
+                "full" (also fsync each output directory once, at the end)
+
+        Examples:
+            fontnemo apply-manifest plan.csv > results.jsonl
+            fontnemo apply-manifest plan.jsonl --results=results.jsonl --jobs=8
+        """
+        from fontnemo.cache import RenameCache
+        from fontnemo.manifest import apply_manifest, read_manifest
+
+        profiles: list[dict[str, Any]] | None = [] if profile else None
+
+        try:
+            level = parse_durability(durability)
+            entries = read_manifest(manifest)
+            rename_cache = RenameCache() if cache else None
+            out = open(results, "w", encoding="utf-8") if results else sys.stdout
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
+
         try:
-            handler = FontNameHandler(input_path)
+            failed = apply_manifest(
+                entries,
+                out,
+                jobs=jobs,
+                verify=verify,
+                initializer=configure_logging,
+                initargs=(self.verbose,),
+                cache=rename_cache,
+                dry_run=dry_run,
+                profiles=profiles,
+                durability=level,
+            )
+        except OSError as e:
+            logger.error(f"Error: sync: {e}")
+            sys.exit(1)
+        finally:
+            if rename_cache is not None:
+                rename_cache.close()
+            if out is not sys.stdout:
+                out.close()
+        if profiles:
+            from fontnemo.instrument import aggregate, format_summary
+
+            print(format_summary(aggregate(profiles)), file=sys.stderr)
+        if failed:
+            logger.error(f"{failed} of {len(entries)} manifest row(s) failed")
+            sys.exit(1)
 
-            # Read current names
-            family_name = handler.read_family_name()
-            family_slug = handler.read_family_slug()
+    def catalog(
+        self,
+        action: str,
+        *input_paths: str,
+        family: str = "",
+        slug: str = "",
+        db: str = "",
+        jobs: int = 1,
+        jsonl: bool = False,
+    ) -> None:
+        """Index family names in a SQLite catalog, or query it.
 
-            # Remove old timestamp if requested and using default separator
-            if replace_timestamp and separator == " tX":
-                # Remove " tX" and everything after from family name
-                if " tX" in family_name:
-                    family_name = family_name.split(" tX")[0]
+        ``scan`` records each font's path, size, mtime, SHA-256, family name
+        and slug, and nameIDs 1, 4, 6, 16, 20, 21 and 25; re-scans only
+        re-read files whose size or mtime changed, and drop files removed
+        from scanned directories. ``query`` prints ``path:family_name``
+        (``path#face:...`` for collections) of every matching face, without
+        opening any font, and exits with status 1 if nothing matches.
 
-                # Remove "tX" and everything after from family slug
-                if "tX" in family_slug:
-                    family_slug = family_slug.split("tX")[0]
+        Args:
+            action: "scan" or "query"
+            input_paths: Fonts, globs or directories to scan
+            family: Family name to query (case-insensitive, * and ? wildcards)
+            slug: Family slug to query (likewise)
+            db: Catalog database (default: $FONTNEMO_CATALOG, else
+                catalog.sqlite in the cache directory)
+            jobs: Number of parallel worker processes for scans (0 = all cores)
+            jsonl: Print query results as JSON lines with all catalogued fields
 
-            # Generate new timestamp
-            timestamp = make_timestamp()
-            suffix_str = separator + timestamp
+        Examples:
+            fontnemo catalog scan ~/fonts --jobs=0
+            fontnemo catalog query --family="Roboto"
+            fontnemo catalog query --slug="Inter*" --jsonl
+        """
+        from fontnemo.catalog import FontCatalog
 
-            # Add timestamp suffix
-            new_family_name = family_name + suffix_str
-            new_family_slug = family_slug + make_slug(suffix_str)
+        try:
+            if action not in ("scan", "query"):
+                raise ValueError(
+                    f"Unknown catalog action {action!r}: use scan or query"
+                )
+            paths = self._expand(input_paths, jobs) if action == "scan" else []
+            font_catalog = FontCatalog(db or None)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
 
-            logger.info(f"family_name: {family_name!r} → {new_family_name!r}")
-            logger.info(f"family_slug: {family_slug!r} → {new_family_slug!r}")
+        with font_catalog:
+            if action == "scan":
+                roots = [path for path in input_paths if Path(path).is_dir()]
+                stats = font_catalog.scan(paths, roots, jobs)
+                print(
+                    f"{stats.files} file(s): {stats.scanned} read,"
+                    f" {stats.unchanged} unchanged, {stats.removed} removed,"
+                    f" {stats.failed} failed"
+                )
+                return
+
+            import json
+
+            found = 0
+            for record in font_catalog.query(family or None, slug or None):
+                found += 1
+                if jsonl:
+                    print(json.dumps(record, ensure_ascii=False))
+                elif record["collection"]:
+                    print(f"{record['path']}#{record['face']}:{record['family_name']}")
+                else:
+                    print(f"{record['path']}:{record['family_name']}")
+        if not found:
+            sys.exit(1)
 
-            # Write changes
-            handler.write_family_name(new_family_name)
-            handler.write_family_slug(new_family_slug)
+    def audit(
+        self,
+        *input_paths: str,
+        rename: str = "",
+        manifest: str = "",
+        jobs: int = 1,
+        jsonl: bool = False,
+    ) -> None:
+        """Find family slug and style collisions across a font library.
 
-            # Save
-            final_path = save_font_safely(handler, output_path)
-            handler.close()
+        Reports one slug used by several family names, one family and
+        subfamily claimed by several faces, and slugs that differ only in
+        case or punctuation (near-collisions). With --rename or --manifest,
+        the planned names are audited against the library instead, and only
+        the collisions the renames would cause are reported; nothing is
+        written. Exits with status 1 if any issue is found.
 
-            # Print final result
-            result_handler = FontNameHandler(final_path)
-            final_family_name = result_handler.read_family_name()
-            result_handler.close()
+        Args:
+            input_paths: Font files, globs or directories (the library)
+            rename: Rename planned for every input font, as chain steps,
+                e.g. "suffix: Beta" or "new:My Family" (see 'chain')
+            manifest: CSV or JSONL manifest of planned renames (see
+                'apply-manifest'); its fonts are audited with the library
+            jobs: Number of parallel worker processes (0 = all cores)
+            jsonl: Print each issue as a JSON line
 
-            if long:
-                print(f"{final_path}:{final_family_name}")
-            else:
-                print(final_family_name)
+        Examples:
+            fontnemo audit ~/fonts --jobs=0
+            fontnemo audit fonts/ --rename="suffix: Beta"
+            fontnemo audit ~/fonts --manifest=plan.csv --jsonl
+        """
+        from fontnemo.audit import (
+            AuditTarget,
+            FamilyAudit,
+            audit_targets,
+            format_issue,
+            plan_targets,
+        )
+        from fontnemo.cache import IN_PLACE_MODES
 
+        try:
+            paths = (
+                self._expand(input_paths, jobs) if input_paths or not manifest else []
+            )
+            planned: list[tuple[AuditTarget, bool]] = []
+            if rename:
+                params = resolve_params("chain", {"steps": rename})
+                planned += [
+                    (AuditTarget(str(path), "chain", params), True) for path in paths
+                ]
+            if manifest:
+                from fontnemo.manifest import read_manifest
+
+                for entry in read_manifest(manifest):
+                    if entry.error is not None:
+                        raise ValueError(f"{manifest}:{entry.line}: {entry.error}")
+                    target = AuditTarget(
+                        entry.path, entry.operation, entry.params, entry.faces
+                    )
+                    planned.append((target, entry.output_path in IN_PLACE_MODES))
         except Exception as e:
             logger.error(f"Error: {e}")
             sys.exit(1)
 
-    def t(
+        import json
+
+        family_audit = FamilyAudit()
+        targets = plan_targets(paths, planned)
+        failed = audit_targets(targets, family_audit, jobs)
+        for audited in failed:
+            logger.error(f"Error: {audited.path}: {audited.error}")
+        issues = family_audit.issues(planned_only=bool(planned))
+        for issue in issues:
+            if jsonl:
+                print(json.dumps(issue.as_dict(), ensure_ascii=False))
+            else:
+                print(format_issue(issue))
+        print(
+            f"{len(issues)} issue(s) in {family_audit.faces} face(s)",
+            file=sys.stderr,
+        )
+        if issues or failed:
+            sys.exit(1)
+
+    def watch(
         self,
-        input_path: str,
-        separator: str = " tX",
-        replace_timestamp: bool = True,
+        *directories: str,
+        operation: str = "timestamp",
         output_path: str = "0",
-        long: bool = False,
+        debounce: float = 0.5,
+        polling: bool = False,
+        interval: float = 1.0,
+        jobs: int = 1,
+        verify: bool = False,
+        durability: str = DEFAULT_DURABILITY,
     ) -> None:
-        """Alias for timestamp command."""
-        return self.timestamp(
-            input_path=input_path,
-            separator=separator,
-            replace_timestamp=replace_timestamp,
-            output_path=output_path,
-            long=long,
-        )
+        """Rename fonts as they are written to directories, until interrupted.
+
+        Uses inotify on Linux and polling elsewhere. A font is renamed once
+        it has not changed for --debounce seconds; fonts present when the
+        watch starts are left alone. The watcher ignores its own temp files,
+        backups and outputs, so it never renames a font twice for one write.
+        Prints path:name for every renamed font.
+
+        Args:
+            directories: Directories to watch recursively (with the global
+                --include and --exclude patterns)
+            operation: Rename applied to landed fonts, as chain steps, e.g.
+                "timestamp" (default), "suffix: Beta" or
+                "new:Nightly;timestamp" (see 'chain')
+            output_path: Output mode (see 'new' command)
+            debounce: Seconds a file must be quiet before it is renamed
+            polling: Poll for changes even where inotify is available
+            interval: Seconds between polls
+            jobs: Number of parallel worker processes (0 = all cores)
+            verify: Re-check checksums and names of each written file
+            durability: "none" (default), "file" or "full" (see 'new')
+
+        Examples:
+            fontnemo watch build/fonts
+            fontnemo watch dist/ --operation="suffix: Nightly" --jobs=4
+        """
+        from fontnemo.operations import parse_steps
+        from fontnemo.watch import FontWatcher
+
+        def report(result: RenameResult) -> None:
+            if not result.ok:
+                logger.error(f"Error: {result.input_path}: {result.error}")
+                return
+            self._print_results([result], long=True)
+            sys.stdout.flush()
+
+        try:
+            if not directories:
+                raise ValueError("No directories given")
+            output_path = str(output_path)
+            if output_path not in ("0", "1", "2") and not Path(output_path).is_dir():
+                raise ValueError("output_path must be 0, 1, 2 or an existing directory")
+            steps = parse_steps(str(operation))
+            op, params = ("chain", {"steps": operation}) if len(steps) > 1 else steps[0]
+            watcher = FontWatcher(
+                directories,
+                op,
+                params,
+                output_path,
+                verify,
+                parse_durability(durability),
+                self.include,
+                self.exclude,
+                float(debounce),
+                polling,
+                float(interval),
+                resolve_jobs(jobs),
+                configure_logging,
+                (self.verbose,),
+                report,
+            )
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
+
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+
+    def serve(self, socket_path: str = "", jobs: int = 0) -> None:
+        """Run a warm daemon that executes commands sent by fontnemo-client.
+
+        Keeps fontTools and fontnemo imported and listens on a Unix socket;
+        each forwarded command runs in a forked worker that writes to the
+        client's stdout/stderr, so calls skip interpreter and import startup.
+        Runs in the foreground until interrupted.
+
+        Args:
+            socket_path: Unix socket to listen on (default: $FONTNEMO_SOCKET,
+                else fontnemo.sock in $XDG_RUNTIME_DIR or in a private directory
+                in the temp directory)
+            jobs: Maximum number of commands run at once (0 = all cores)
+
+        Examples:
+            fontnemo serve &
+            fontnemo-client suffix font.ttf --suffix=" Beta"
+        """
+        from fontnemo.client import default_socket_path
+        from fontnemo.server import serve
+
+        try:
+            serve(socket_path or default_socket_path(), resolve_jobs(jobs))
+        except OSError as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
 
 
-def main() -> None:
-    """Main entry point for CLI."""
-    fire.Fire(FontNemoCLI)
+# Commands (including aliases) handled without fire
+COMMANDS: Final[frozenset[str]] = frozenset(
+    {
+        "view",
+        "v",
+        "new",
+        "n",
+        "replace",
+        "r",
+        "suffix",
+        "s",
+        "prefix",
+        "p",
+        "timestamp",
+        "t",
+        "chain",
+        "apply_manifest",
+        "audit",
+        "catalog",
+        "serve",
+        "watch",
+    }
+)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for CLI.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    from fontnemo.dispatch import parse_command_line
+
+    parsed = parse_command_line(FontNemoCLI, COMMANDS, argv)
+    if parsed is not None:
+        cli = FontNemoCLI(**parsed.init_kwargs)
+        getattr(cli, parsed.method)(*parsed.args, **parsed.kwargs)
+        return
+
+    import fire
+
+    fire.Fire(FontNemoCLI, command=argv, name="fontnemo")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/aio.py
+"""asyncio API: read and rename fonts without blocking the event loop.
+
+AsyncRenamer runs the blocking work of fontnemo in executors:
+
+- file reads, renames that patch or rewrite only the ``name`` table, and
+  writes run in a thread pool, so the I/O of many fonts overlaps
+- CPU-heavy steps run in a process pool: in-memory renames
+  (rename_font_data) and renames that decode or encode WOFF/WOFF2 or write
+  extra ``formats``
+
+A semaphore caps the number of fonts in flight, and a memory budget caps
+their estimated memory (MEMORY_FACTOR times the font's size): a font waits
+until both allow it, so a burst of requests queues instead of exhausting
+memory. A font larger than the whole budget runs alone.
+
+Example::
+
+    async with AsyncRenamer(max_in_flight=16) as renamer:
+        result = await renamer.rename_font(path, "suffix", {"suffix": " Beta"})
+        renamed = await renamer.rename_font_data(data, "new", {"new_family": "X"})
+
+Cancelling a call releases its place at once, but a font already handed to
+a worker is still completed by that worker.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, Self
+
+from fontnemo.core import FontData, read_font_data
+from fontnemo.fileops import DEFAULT_DURABILITY
+from fontnemo.operations import (
+    RenameResult,
+    operation_name,
+    read_font_names,
+    rename_font,
+    rename_font_data,
+    resolve_params,
+)
+
+DEFAULT_IN_FLIGHT: Final[int] = 32
+DEFAULT_MEMORY_BUDGET: Final[int] = 512 * 2**20
+
+# Estimated peak memory of a rename, in multiples of the font's size (input,
+# decoded tables and output)
+MEMORY_FACTOR: Final[int] = 3
+
+# Input extensions whose renames decompress and recompress table data
+CPU_BOUND_EXTENSIONS: Final[frozenset[str]] = frozenset({".woff", ".woff2"})
+
+
+class MemoryBudget:
+    """Asynchronous limit on the total estimated memory of fonts in flight."""
+
+    def __init__(self, limit: int) -> None:
+        """Create an empty budget.
+
+        Args:
+            limit: Bytes that may be reserved at the same time
+        """
+        if limit <= 0:
+            raise ValueError(f"Memory budget must be positive, got {limit}")
+        self.limit = limit
+        self.used = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Wait until size bytes are free and hold them inside the block.
+
+        A reservation larger than the limit waits for an empty budget and
+        then takes all of it.
+        """
+        size = max(0, min(size, self.limit))
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.used + size <= self.limit)
+            self.used += size
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.used -= size
+                self._condition.notify_all()
+
+
+class AsyncRenamer:
+    """Reads and renames fonts in executors, for use from asyncio code.
+
+    The executors are started on first use and shut down by close() (or by
+    leaving ``async with``). Operations and parameters are those of the CLI
+    commands; they are resolved once per call (see
+    operations.resolve_params), so a ``timestamp`` batch shares one value.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_IN_FLIGHT,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        io_workers: int | None = None,
+        cpu_workers: int | None = None,
+    ) -> None:
+        """Configure the renamer (no executor is started yet).
+
+        Args:
+            max_in_flight: Fonts read or renamed at the same time
+            memory_budget: Bytes of estimated memory for fonts in flight
+            io_workers: Threads for file I/O (default: as ThreadPoolExecutor)
+            cpu_workers: Processes for CPU-heavy steps (None: one per core;
+                0: run them in the I/O threads instead of processes)
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self.io_workers = io_workers
+        if cpu_workers is None:
+            cpu_workers = os.cpu_count() or 1
+        self.cpu_workers = cpu_workers
+        self.budget = MemoryBudget(memory_budget)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._io_pool: ThreadPoolExecutor | None = None
+        self._cpu_pool: ProcessPoolExecutor | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Wait for running work and shut the executors down."""
+        pools = [pool for pool in (self._io_pool, self._cpu_pool) if pool is not None]
+        self._io_pool = self._cpu_pool = None
+        for pool in pools:
+            await asyncio.to_thread(pool.shutdown)
+
+    def _executor(self, cpu: bool) -> Executor:
+        """Return the process pool for CPU-heavy work, else the thread pool."""
+        if cpu and self.cpu_workers > 0:
+            if self._cpu_pool is None:
+                self._cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+            return self._cpu_pool
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="fontnemo-io"
+            )
+        return self._io_pool
+
+    async def _run[T](self, cpu: bool, func: Callable[..., T], *args: Any) -> T:
+        """Run func(*args) in an executor and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(cpu), func, *args)
+
+    @asynccontextmanager
+    async def _admit(self, size: int) -> AsyncIterator[None]:
+        """Hold a slot and the estimated memory of a font of size bytes."""
+        async with self._slots, self.budget.reserve(size * MEMORY_FACTOR):
+            yield
+
+    async def _file_size(self, path: str | Path) -> int:
+        """Return a file's size (0 if it cannot be read, the worker reports)."""
+        try:
+            stat = await self._run(False, os.stat, path)
+        except OSError:
+            return 0
+        return int(stat.st_size)
+
+    async def read_font_names(
+        self, input_path: str | Path, faces: list[int] | None = None
+    ) -> RenameResult:
+        """Read a font's family name (see operations.read_font_names)."""
+        async with self._slots:
+            return await self._run(False, read_font_names, input_path, faces)
+
+    async def rename_font(
+        self,
+        input_path: str | Path,
+        operation: str,
+        params: dict[str, Any],
+        output_path: str | Path = "0",
+        verify: bool = False,
+        faces: list[int] | None = None,
+        formats: list[str] | None = None,
+        durability: str = DEFAULT_DURABILITY,
+    ) -> RenameResult:
+        """Rename a font file (see operations.rename_font).
+
+        Errors of the rename itself are captured in the result.
+
+        Raises:
+            ValueError: If the operation or its parameters are invalid
+        """
+        operation = operation_name(operation)
+        params = resolve_params(operation, params)
+        return await self._rename_resolved(
+            input_path,
+            operation,
+            params,
+            output_path,
+            verify,
+            faces,
+            formats,
+            durability,
+        )
+
+    async def rename_fonts(
+        self,
+        input_paths: Iterable[str | Path],
+        operation: str,
+        params: dict[str, Any],
+        output_path: str | Path = "0",
+        verify: bool = False,
+        faces: list[int] | None = None,
+        formats: list[str] | None = None,
+        durability: str = DEFAULT_DURABILITY,
+    ) -> list[RenameResult]:
+        """Rename many font files concurrently, within the renamer's limits.
+
+        Returns:
+            One RenameResult per input path, in input order
+
+        Raises:
+            ValueError: If the operation or its parameters are invalid
+        """
+        operation = operation_name(operation)
+        params = resolve_params(operation, params)
+        renames = [
+            self._rename_resolved(
+                path, operation, params, output_path, verify, faces, formats, durability
+            )
+            for path in input_paths
+        ]
+        return list(await asyncio.gather(*renames))
+
+    async def _rename_resolved(
+        self,
+        input_path: str | Path,
+        operation: str,
+        params: dict[str, Any],
+        output_path: str | Path,
+        verify: bool,
+        faces: list[int] | None,
+        formats: list[str] | None,
+        durability: str,
+    ) -> RenameResult:
+        """Rename one font with already resolved parameters."""
+        cpu = bool(formats) or Path(input_path).suffix.lower() in CPU_BOUND_EXTENSIONS
+        async with self._admit(await self._file_size(input_path)):
+            return await self._run(
+                cpu,
+                rename_font,
+                input_path,
+                operation,
+                params,
+                output_path,
+                verify,
+                faces,
+                formats,
+                False,
+                durability,
+            )
+
+    async def rename_font_data(
+        self,
+        data: FontData,
+        operation: str,
+        params: dict[str, Any],
+        faces: list[int] | None = None,
+        output_format: str | None = None,
+    ) -> bytes:
+        """Rename a font held in memory (see operations.rename_font_data).
+
+        A file object is read in the I/O threads; the rename itself runs in
+        the process pool.
+
+        Raises:
+            ValueError: If the operation, format or font data is invalid
+        """
+        operation = operation_name(operation)
+        params = resolve_params(operation, params)
+        if not isinstance(data, bytes | bytearray | memoryview):
+            data = await self._run(False, read_font_data, data)
+        data = read_font_data(data)
+        async with self._admit(len(data)):
+            return await self._run(
+                True, rename_font_data, data, operation, params, faces, output_format
+            )
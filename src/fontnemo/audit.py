@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/audit.py
+"""Family name and slug collision audit (``fontnemo audit``).
+
+make_slug is lossy (it drops spaces, brackets and non-ASCII characters), so
+different families can end up with the same PostScript slug, and renames
+can give two fonts the same family and style; installers then pick the
+wrong font. The audit reads every face's family name, slug and subfamily
+(nameID 17, else 2) through the lightweight name reader and groups them in
+one pass (FamilyAudit). It reports these issues (ISSUE_KINDS):
+
+- ``slug``: one family slug used by several family names
+- ``style``: one family and subfamily (case-insensitive) claimed by several
+  faces
+- ``near``: slugs that differ only in case or punctuation, e.g. ``MyFont``,
+  ``Myfont`` and ``My-Font``
+
+For a planned rename batch (AuditTarget with an operation), the audit uses
+the names the rename would write, computed as in a dry run, and reports
+only the issues that involve a planned face: the renames that would
+collide, before anything is written.
+"""
+
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.core import FontCollectionHandler, FontNameHandler, open_font_handler
+from fontnemo.operations import compute_names, face_handlers, optional_name
+
+ISSUE_KINDS: Final[tuple[str, ...]] = ("slug", "style", "near")
+
+# Removed from slugs to compare them for near-collisions
+_NEAR_IGNORED: Final[re.Pattern[str]] = re.compile(r"[\W_]+")
+
+
+@dataclass
+class AuditTarget:
+    """A font to audit, optionally with the rename planned for it."""
+
+    path: str
+    operation: str | None = None
+    params: dict[str, Any] | None = None
+    faces: list[int] | None = None
+
+
+@dataclass
+class AuditFace:
+    """Names of one face as audited (planned names for a planned rename)."""
+
+    path: str
+    face: int
+    family_name: str | None
+    family_slug: str | None
+    subfamily: str | None
+    collection: bool = False
+    planned: bool = False
+
+    def label(self) -> str:
+        """Return ``path`` (``path#face`` for collection faces)."""
+        return f"{self.path}#{self.face}" if self.collection else self.path
+
+
+@dataclass
+class AuditEntry:
+    """Faces read from one target, or the error that prevented it."""
+
+    path: str
+    faces: list[AuditFace] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class AuditIssue:
+    """A group of faces that collide."""
+
+    kind: str
+    key: str
+    faces: list[AuditFace]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the issue as a JSON-serializable record."""
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "fonts": [
+                {
+                    "path": face.path,
+                    "face": face.face,
+                    "family_name": face.family_name,
+                    "family_slug": face.family_slug,
+                    "subfamily": face.subfamily,
+                    "planned": face.planned,
+                }
+                for face in self.faces
+            ],
+        }
+
+
+def _subfamily(handler: FontNameHandler) -> str | None:
+    return handler.read_name(17) or handler.read_name(2)
+
+
+def read_audit_entry(target: AuditTarget) -> AuditEntry:
+    """Collect the family name, slug and subfamily of a target's faces.
+
+    Without an operation the current names are read (None where a face has
+    none); with one, the names the rename would write are computed instead
+    and the faces are marked as planned. Nothing is written. An unreadable
+    font or invalid operation is reported in ``error``, not raised.
+    """
+    entry = AuditEntry(path=target.path)
+    try:
+        handler = open_font_handler(target.path, target.faces)
+        try:
+            for face_handler in face_handlers(handler):
+                if target.operation is None:
+                    name = optional_name(face_handler.read_family_name)
+                    slug = optional_name(face_handler.read_family_slug)
+                else:
+                    _, _, name, slug = compute_names(
+                        face_handler, target.operation, target.params or {}
+                    )
+                entry.faces.append(
+                    AuditFace(
+                        path=target.path,
+                        face=face_handler.face,
+                        family_name=name,
+                        family_slug=slug,
+                        subfamily=_subfamily(face_handler),
+                        collection=isinstance(handler, FontCollectionHandler),
+                        planned=target.operation is not None,
+                    )
+                )
+        finally:
+            handler.close()
+    except Exception as e:
+        entry.error = str(e)
+    return entry
+
+
+def near_key(slug: str) -> str:
+    """Return the slug with case and punctuation removed."""
+    return _NEAR_IGNORED.sub("", slug).casefold()
+
+
+class FamilyAudit:
+    """Groups faces by slug, style and near-slug as they are added."""
+
+    def __init__(self) -> None:
+        """Start an empty audit."""
+        self.faces = 0
+        self._by_slug: dict[str, list[AuditFace]] = {}
+        self._by_style: dict[tuple[str, str], list[AuditFace]] = {}
+        self._by_near: dict[str, list[AuditFace]] = {}
+
+    def add(self, faces: Iterable[AuditFace]) -> None:
+        """Add faces to the groups."""
+        for face in faces:
+            self.faces += 1
+            if face.family_slug:
+                self._by_slug.setdefault(face.family_slug, []).append(face)
+                self._by_near.setdefault(near_key(face.family_slug), []).append(face)
+            if face.family_name:
+                style = (face.family_name.casefold(), (face.subfamily or "").casefold())
+                self._by_style.setdefault(style, []).append(face)
+
+    def issues(self, planned_only: bool = False) -> list[AuditIssue]:
+        """Return the collisions found, by kind and key.
+
+        Args:
+            planned_only: Only report issues involving a planned face
+        """
+        found = []
+        for slug, faces in self._by_slug.items():
+            if len({face.family_name for face in faces}) > 1:
+                found.append(AuditIssue("slug", slug, faces))
+        for faces in self._by_style.values():
+            if len(faces) > 1:
+                key = f"{faces[0].family_name} {faces[0].subfamily or ''}".strip()
+                found.append(AuditIssue("style", key, faces))
+        for key, faces in self._by_near.items():
+            if len({face.family_slug for face in faces}) > 1:
+                found.append(AuditIssue("near", key, faces))
+
+        order = {kind: i for i, kind in enumerate(ISSUE_KINDS)}
+        issues = [
+            AuditIssue(
+                issue.kind,
+                issue.key,
+                sorted(issue.faces, key=lambda face: (face.path, face.face)),
+            )
+            for issue in found
+            if not planned_only or any(face.planned for face in issue.faces)
+        ]
+        return sorted(issues, key=lambda issue: (order[issue.kind], issue.key))
+
+
+def format_issue(issue: AuditIssue) -> str:
+    """Format an issue for the terminal, one line per face."""
+    titles = {
+        "slug": "slug collision",
+        "style": "duplicate style",
+        "near": "near collision",
+    }
+    lines = [f"{titles[issue.kind]}: {issue.key}"]
+    for face in issue.faces:
+        style = f" ({face.subfamily})" if face.subfamily else ""
+        planned = " [planned]" if face.planned else ""
+        lines.append(
+            f"  {face.label()}: {face.family_name}{style} / {face.family_slug}{planned}"
+        )
+    return "\n".join(lines)
+
+
+def audit_targets(
+    targets: list[AuditTarget], audit: FamilyAudit, jobs: int = 1
+) -> list[AuditEntry]:
+    """Read targets (in a process pool if jobs > 1) into the audit.
+
+    Returns:
+        The entries that could not be read
+    """
+    from fontnemo.batch import run_batch
+
+    failed = []
+    for entry in run_batch(read_audit_entry, targets, jobs=jobs):
+        if entry.error is not None:
+            failed.append(entry)
+        audit.add(entry.faces)
+    return failed
+
+
+def plan_targets(
+    paths: Iterable[str | Path],
+    planned: Iterable[tuple[AuditTarget, bool]] = (),
+) -> list[AuditTarget]:
+    """Combine library fonts and planned renames into audit targets.
+
+    Args:
+        paths: Fonts of the library, audited with their current names
+        planned: (target with an operation, replaces input) pairs; a rename
+            that replaces its input hides the library font's current names
+
+    Returns:
+        Targets in input order, planned renames last
+    """
+    planned = list(planned)
+    replaced = {
+        os.path.abspath(target.path) for target, replaces in planned if replaces
+    }
+    targets = [AuditTarget(str(p)) for p in paths if os.path.abspath(p) not in replaced]
+    seen = {os.path.abspath(target.path) for target in targets}
+    for target, replaces in planned:
+        key = os.path.abspath(target.path)
+        if not replaces and key not in seen:
+            # The input stays next to the renamed copy
+            targets.append(AuditTarget(target.path, faces=target.faces))
+            seen.add(key)
+        targets.append(target)
+    return targets
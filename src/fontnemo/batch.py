@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/batch.py
+"""Batch processing: input expansion and parallel execution over many fonts."""
+
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.discover import DEFAULT_SYMLINKS, discover_fonts
+from fontnemo.log import logger
+
+# Characters that make an input a glob pattern
+GLOB_CHARS: Final[str] = "*?["
+
+
+def expand_input_paths(
+    inputs: Iterable[str | Path],
+    include: str | Iterable[str] | None = None,
+    exclude: str | Iterable[str] | None = None,
+    symlinks: str = DEFAULT_SYMLINKS,
+    jobs: int = 1,
+) -> list[Path]:
+    """Expand input arguments into a list of font files.
+
+    Each input may be:
+    - a font file path
+    - a glob pattern (``*``, ``?``, ``[...]``, ``**`` recursive)
+    - a directory, searched recursively for files with a font signature
+      (see fontnemo.discover)
+
+    Duplicates are removed while preserving first-seen order. Paths and
+    glob matches are taken as given; include/exclude patterns and the
+    symlink policy apply to directory walks.
+
+    Args:
+        inputs: Paths, globs or directories
+        include: Patterns files in directories must match
+        exclude: Patterns of files and directories to skip in directories
+        symlinks: Symlink policy for directory walks (see discover_fonts)
+        jobs: Threads walking each directory (0 = one per CPU core)
+
+    Returns:
+        Ordered list of unique file paths
+
+    Raises:
+        FileNotFoundError: If an input matches nothing
+        ValueError: If the symlink policy is unknown
+    """
+    seen: set[Path] = set()
+    paths: list[Path] = []
+
+    def add(path: Path) -> None:
+        if path not in seen:
+            seen.add(path)
+            paths.append(path)
+
+    for item in inputs:
+        text = str(item)
+        path = Path(text)
+
+        if path.is_dir():
+            for p in discover_fonts(path, include, exclude, symlinks, jobs):
+                add(p)
+        elif any(char in text for char in GLOB_CHARS):
+            import glob
+
+            matches = sorted(glob.glob(text, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match pattern: {text}")
+            for match in matches:
+                if Path(match).is_file():
+                    add(Path(match))
+        else:
+            # Plain path: let the worker report a missing file per font
+            add(path)
+
+    return paths
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Return worker count: ``0``/``None`` means one worker per CPU core."""
+    if not jobs or jobs < 0:
+        return os.cpu_count() or 1
+    return int(jobs)
+
+
+def run_batch[T](
+    worker: Callable[..., T],
+    paths: Sequence[Any],
+    *args: Any,
+    jobs: int | None = 1,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple[Any, ...] = (),
+) -> Iterator[T]:
+    """Run ``worker(path, *args)`` for every path, in parallel if jobs > 1.
+
+    Results are yielded in input order as they become available. The worker
+    must be a picklable module-level function that captures its own errors
+    (see ``operations.rename_font``), so one bad font does not stop the batch.
+
+    Args:
+        worker: Function called as ``worker(path, *args)``
+        paths: Font files (or other picklable work items) to process
+        *args: Extra positional arguments passed to every call
+        jobs: Number of worker processes (0 = all cores, 1 = in-process)
+        initializer: Optional per-process setup (e.g. logging)
+        initargs: Arguments for initializer
+
+    Yields:
+        Worker results in the order of ``paths``
+    """
+    workers = min(resolve_jobs(jobs), max(len(paths), 1))
+
+    if workers <= 1:
+        for path in paths:
+            yield worker(path, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    logger.debug(f"Processing {len(paths)} font(s) with {workers} workers")
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as pool:
+        # Small chunks keep results streaming while amortizing IPC overhead
+        chunksize = max(1, min(32, len(paths) // (workers * 4)))
+        yield from pool.map(
+            worker, paths, *([arg] * len(paths) for arg in args), chunksize=chunksize
+        )
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/cache.py
+"""Content-addressed cache of completed renames (``--cache``).
+
+A rename is keyed by the SHA-256 of the input file, the operation and its
+resolved arguments, the output mode (see core.save_font_safely), faces,
+formats and the fontnemo version. The cache records the files the rename
+wrote, with their size, mtime and inode. On a later run with the same key,
+the rename is skipped if every recorded output still exists unchanged.
+
+In-place modes ("0", "1") change the input itself. When re-applying the
+operation to the renamed font would not change its names (``new``, most
+``replace`` runs), the renamed content is recorded under its own key too, so
+re-running the same command on an already renamed library is a no-op.
+
+Input digests are memoized by path, size, mtime and inode, so unchanged
+files are not re-read. Everything lives in one SQLite database; entries not
+used for the longest time are evicted beyond ``max_entries``. The cache is
+only read and written by the coordinating process, never by batch workers.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.core import open_font_handler
+from fontnemo.log import logger
+from fontnemo.operations import OPERATIONS, RenameResult, face_handlers
+
+# Environment variable overriding the cache directory
+CACHE_DIR_ENV: Final[str] = "FONTNEMO_CACHE_DIR"
+
+# Database file inside the cache directory
+CACHE_FILE: Final[str] = "renames.sqlite"
+
+# Bumped when the key or the stored records change meaning
+CACHE_FORMAT: Final[int] = 1
+
+# Default number of rename entries (and memoized digests) kept
+DEFAULT_MAX_ENTRIES: Final[int] = 100_000
+
+# Output modes that write the renamed font over the input file
+IN_PLACE_MODES: Final[frozenset[str]] = frozenset({"0", "1"})
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    outputs TEXT NOT NULL,
+    result TEXT NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_used ON files (used);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+
+# (path, size, mtime_ns, inode) of one written file
+FileStamp = tuple[str, int, int, int]
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory.
+
+    ``$FONTNEMO_CACHE_DIR`` if set, else ``fontnemo`` in ``$XDG_CACHE_HOME``
+    (default ``~/.cache``).
+    """
+    if path := os.environ.get(CACHE_DIR_ENV):
+        return Path(path)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "fontnemo"
+
+
+def _stamp(path: Path) -> FileStamp:
+    # Absolute paths: the cache is shared by runs from any directory
+    st = path.stat()
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _version() -> str:
+    from fontnemo import __version__
+
+    return str(__version__)  # Generated at build time, so untyped
+
+
+def reapply_unchanged(
+    path: Path,
+    operation: str,
+    params: dict[str, Any],
+    faces: list[int] | None = None,
+) -> bool:
+    """Return True if applying the operation to the font's names changes nothing.
+
+    Uses the lightweight name reader; fontTools is not loaded.
+    """
+    transform = OPERATIONS[operation]
+    handler = open_font_handler(path, faces)
+    try:
+        for face_handler in face_handlers(handler):
+            names = (face_handler.read_family_name(), face_handler.read_family_slug())
+            if transform(*names, **params) != names:
+                return False
+        return True
+    finally:
+        handler.close()
+
+
+class RenameCache:
+    """SQLite-backed record of renames whose outputs are up to date."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """Open (creating if needed) the cache; use as a context manager.
+
+        Args:
+            cache_dir: Directory holding the database (default:
+                default_cache_dir())
+            max_entries: Entries kept when the cache is closed; least
+                recently used entries are evicted first
+
+        Raises:
+            OSError: If the cache directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_entries = max(1, max_entries)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.cache_dir / CACHE_FILE, timeout=30)
+        # Records are only an optimization: trade durability for speed
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._open = True
+        self._now = time.time()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "RenameCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Evict old entries, commit and close the database."""
+        if not self._open:
+            return
+        self._evict("entries")
+        self._evict("files")
+        self._db.commit()
+        self._db.close()
+        self._open = False
+        logger.debug(f"Cache: {self.hits} hit(s), {self.misses} miss(es)")
+
+    def _evict(self, table: str) -> None:
+        (count,) = self._db.execute(f"SELECT count(*) FROM {table}").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} ORDER BY used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            logger.debug(f"Cache: evicted {count - self.max_entries} {table}")
+
+    def _memoized(self, stamp: FileStamp) -> str | None:
+        """Return the memoized digest of a file if its stamp still matches."""
+        path_str, *current = stamp
+        row = self._db.execute(
+            "SELECT size, mtime_ns, ino, digest FROM files WHERE path = ?",
+            (path_str,),
+        ).fetchone()
+        if row is not None and list(row[:3]) == current:
+            return str(row[3])
+        return None
+
+    def digest(self, path: Path) -> str:
+        """Return the SHA-256 of a file, memoized by size, mtime and inode.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        stamp = _stamp(path)
+        digest = self._memoized(stamp)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+        self._db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (*stamp, digest, self._now),
+        )
+        return digest
+
+    def key(
+        self,
+        digest: str,
+        input_path: Path,
+        operation: str,
+        params: dict[str, Any],
+        output_path: str,
+        faces: list[int] | None,
+        formats: list[str] | None,
+    ) -> str:
+        """Return the cache key of one rename of a file with the given digest."""
+        target = output_path
+        if output_path not in IN_PLACE_MODES | {"2"}:
+            target = str(Path(output_path).resolve())
+        description = {
+            "format": CACHE_FORMAT,
+            "version": _version(),
+            "digest": digest,
+            # Outputs of modes 0/1/2 and of directories depend on the path
+            "input": str(input_path.resolve()),
+            "operation": operation,
+            "params": params,
+            "output": target,
+            "faces": faces,
+            "formats": formats,
+        }
+        text = json.dumps(description, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def lookup(
+        self,
+        input_path: str | Path,
+        operation: str,
+        params: dict[str, Any],
+        output_path: str = "0",
+        faces: list[int] | None = None,
+        formats: list[str] | None = None,
+    ) -> RenameResult | None:
+        """Return the recorded result if the rename's outputs are up to date.
+
+        Args:
+            input_path: Input font file
+            operation: One of the keys of OPERATIONS
+            params: Resolved operation arguments
+            output_path: Output mode or path
+            faces: Face indices for collections
+            formats: Output formats
+
+        Returns:
+            RenameResult with ``cached`` set, or None if the rename must run
+        """
+        path = Path(input_path)
+        output_path = str(output_path)
+        try:
+            if output_path in IN_PLACE_MODES:
+                # Only renamed content stored by record() can hit, and its
+                # digest was memoized then: without a memo, skip hashing
+                digest = self._memoized(_stamp(path))
+            else:
+                digest = self.digest(path)
+        except OSError:
+            digest = None  # Let the rename report the error
+        if digest is None:
+            self.misses += 1
+            return None
+        key = self.key(digest, path, operation, params, output_path, faces, formats)
+
+        row = self._db.execute(
+            "SELECT outputs, result FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or not self._unchanged(json.loads(row[0])):
+            self.misses += 1
+            return None
+
+        self._db.execute("UPDATE entries SET used = ? WHERE key = ?", (self._now, key))
+        self.hits += 1
+        logger.info(f"Up to date (cached): {path}")
+        return _decode_result(path, json.loads(row[1]))
+
+    @staticmethod
+    def _unchanged(outputs: list[list[Any]]) -> bool:
+        for path_str, *stamp in outputs:
+            try:
+                if list(_stamp(Path(path_str))[1:]) != stamp:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def record(
+        self,
+        result: RenameResult,
+        operation: str,
+        params: dict[str, Any],
+        output_path: str = "0",
+        faces: list[int] | None = None,
+        formats: list[str] | None = None,
+    ) -> None:
+        """Record a successful rename and the files it wrote.
+
+        If the rename overwrote its input, the recorded key is that of the
+        renamed content, and only if renaming it again is a no-op; the
+        original content is gone, so its key could never match again.
+
+        Args:
+            result: Result returned by operations.rename_font
+            operation: One of the keys of OPERATIONS
+            params: Resolved operation arguments
+            output_path: Output mode or path
+            faces: Face indices for collections
+            formats: Output formats
+        """
+        if not result.ok or result.output_path is None:
+            return
+        input_path = result.input_path
+        written = result.output_paths or [result.output_path]
+        try:
+            outputs = [_stamp(Path(p)) for p in written]
+            overwritten = _stamp(input_path)[0] in {stamp[0] for stamp in outputs}
+            if overwritten and not reapply_unchanged(
+                input_path, operation, params, faces
+            ):
+                return
+            digest = self.digest(input_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cache: not recording {input_path}: {e}")
+            return
+
+        key = self.key(
+            digest, input_path, operation, params, str(output_path), faces, formats
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            (
+                key,
+                json.dumps([list(stamp) for stamp in outputs]),
+                json.dumps(_encode_result(result), ensure_ascii=False),
+                self._now,
+            ),
+        )
+
+
+def _encode_result(result: RenameResult) -> dict[str, Any]:
+    return {
+        "output_path": str(result.output_path),
+        "family_name": result.family_name,
+        "family_slug": result.family_slug,
+        "new_family_name": result.new_family_name,
+        "new_family_slug": result.new_family_slug,
+        "faces": result.faces,
+        "output_paths": [str(p) for p in result.output_paths or []] or None,
+    }
+
+
+def _decode_result(input_path: Path, stored: dict[str, Any]) -> RenameResult:
+    output_paths = stored.get("output_paths")
+    faces = stored.get("faces")
+    return RenameResult(
+        input_path=input_path,
+        output_path=Path(stored["output_path"]),
+        family_name=stored.get("family_name"),
+        family_slug=stored.get("family_slug"),
+        new_family_name=stored.get("new_family_name"),
+        new_family_slug=stored.get("new_family_slug"),
+        faces=[(face, name) for face, name in faces] if faces else None,
+        output_paths=[Path(p) for p in output_paths] if output_paths else None,
+        cached=True,
+    )
+
+
+def run_with_cache[T, R](
+    cache: RenameCache | None,
+    items: Sequence[T],
+    lookup: Callable[[T], R | None],
+    run: Callable[[list[T]], Iterable[R]],
+    record: Callable[[T, R], None],
+) -> Iterator[R]:
+    """Yield results for items in order, running only the cache misses.
+
+    Args:
+        cache: Open cache, or None to run every item
+        items: Work items
+        lookup: Returns the cached result of an item, or None
+        run: Runs a list of items (e.g. via batch.run_batch), yielding results
+            in order
+        record: Stores the result of an item that was run
+
+    Yields:
+        One result per item, in the order of items
+    """
+    if cache is None:
+        yield from run(list(items))
+        return
+
+    cached = [lookup(item) for item in items]
+    misses = [item for item, hit in zip(items, cached, strict=True) if hit is None]
+    results = iter(run(misses))
+    for item, hit in zip(items, cached, strict=True):
+        if hit is not None:
+            yield hit
+            continue
+        result = next(results)
+        record(item, result)
+        yield result
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/catalog.py
+"""Persistent SQLite catalog of font family names (``fontnemo catalog``).
+
+``scan`` records, for every font file, its absolute path, size, mtime and
+SHA-256, and for every face its family name and slug (as fontnemo reads
+them) and the raw values of CATALOG_NAME_IDS. A re-scan only re-reads files
+whose size or mtime changed; catalogued files that disappeared from a
+scanned directory are dropped. Files that could not be read are recorded
+with their error, so they are not re-read until they change either.
+
+``query`` answers "which fonts have family X / slug Y" from indexes on the
+family name and slug, without opening any font. Matching is
+case-insensitive; ``*`` and ``?`` are wildcards.
+
+The database is ``catalog.sqlite`` in the cache directory (see
+cache.default_cache_dir), or the file named by ``$FONTNEMO_CATALOG``.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.batch import run_batch
+from fontnemo.cache import default_cache_dir
+from fontnemo.core import FontNameHandler, open_font_handler
+from fontnemo.log import logger
+from fontnemo.operations import face_handlers, optional_name
+
+# Environment variable naming the catalog database file
+CATALOG_ENV: Final[str] = "FONTNEMO_CATALOG"
+
+# Database file inside the cache directory
+CATALOG_FILE: Final[str] = "catalog.sqlite"
+
+# nameIDs stored verbatim: family, full name, PostScript name, typographic
+# family, PostScript CID findfont name, WWS family, variations PS prefix
+CATALOG_NAME_IDS: Final[tuple[int, ...]] = (1, 4, 6, 16, 20, 21, 25)
+
+# Rows written per transaction during a scan
+COMMIT_EVERY: Final[int] = 1000
+
+_NAME_COLUMNS: Final[str] = ", ".join(f"name{i}" for i in CATALOG_NAME_IDS)
+
+_SCHEMA: Final[str] = f"""
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT,
+    faces INTEGER NOT NULL,
+    error TEXT,
+    scanned REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS faces (
+    path TEXT NOT NULL,
+    face INTEGER NOT NULL,
+    family_name TEXT,
+    family_slug TEXT,
+    {", ".join(f"name{i} TEXT" for i in CATALOG_NAME_IDS)},
+    PRIMARY KEY (path, face)
+);
+CREATE INDEX IF NOT EXISTS faces_family ON faces (family_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS faces_slug ON faces (family_slug COLLATE NOCASE);
+"""
+
+
+def default_catalog_path() -> Path:
+    """Return ``$FONTNEMO_CATALOG``, else catalog.sqlite in the cache dir."""
+    if path := os.environ.get(CATALOG_ENV):
+        return Path(path)
+    return default_cache_dir() / CATALOG_FILE
+
+
+@dataclass
+class FaceNames:
+    """Names of one face, as stored in the catalog."""
+
+    face: int
+    family_name: str | None
+    family_slug: str | None
+    names: dict[int, str | None]
+
+
+@dataclass
+class CatalogEntry:
+    """What a scan read from one file (``size`` is None if it vanished)."""
+
+    path: str
+    size: int | None = None
+    mtime_ns: int | None = None
+    digest: str | None = None
+    faces: list[FaceNames] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class ScanStats:
+    """Counts of one catalog scan."""
+
+    files: int = 0
+    scanned: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+
+
+def face_names(handler: FontNameHandler) -> FaceNames:
+    """Read the catalogued names of one face (lightweight reader)."""
+    return FaceNames(
+        face=handler.face,
+        family_name=optional_name(handler.read_family_name),
+        family_slug=optional_name(handler.read_family_slug),
+        names={name_id: handler.read_name(name_id) for name_id in CATALOG_NAME_IDS},
+    )
+
+
+def read_catalog_entry(path: str | Path) -> CatalogEntry:
+    """Stat, hash and read the names of one file, capturing errors."""
+    entry = CatalogEntry(path=os.path.abspath(path))
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        entry.error = str(e)
+        return entry
+    entry.size, entry.mtime_ns = st.st_size, st.st_mtime_ns
+    try:
+        with open(path, "rb") as f:
+            entry.digest = hashlib.file_digest(f, "sha256").hexdigest()
+        handler = open_font_handler(path)
+        try:
+            entry.faces = [face_names(h) for h in face_handlers(handler)]
+        finally:
+            handler.close()
+    except Exception as e:
+        entry.error = str(e)
+    return entry
+
+
+def _wildcards(value: str) -> tuple[str, str]:
+    """Return an SQL comparison and argument for a query value."""
+    if not any(char in value for char in "*?"):
+        return "= ? COLLATE NOCASE", value
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = escaped.replace("*", "%").replace("?", "_")
+    return "LIKE ? ESCAPE '\\'", pattern
+
+
+class FontCatalog:
+    """SQLite index of font files and their names; use as a context manager."""
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        """Open (creating if needed) the catalog.
+
+        Args:
+            db_path: Database file (default: default_catalog_path())
+
+        Raises:
+            OSError: If the database directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.db_path = Path(db_path) if db_path else default_catalog_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "FontCatalog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    def _stamps(self) -> dict[str, tuple[int, int]]:
+        """Return the recorded (size, mtime_ns) of every catalogued file."""
+        rows = self._db.execute("SELECT path, size, mtime_ns FROM files")
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def scan(
+        self,
+        paths: Iterable[str | Path],
+        roots: Iterable[str | Path] = (),
+        jobs: int = 1,
+    ) -> ScanStats:
+        """Catalog font files, re-reading only those whose size/mtime changed.
+
+        Args:
+            paths: Font files to catalog
+            roots: Directories the paths were found in; catalogued files
+                below them that are not in paths are removed
+            jobs: Worker processes reading changed files (0 = all cores)
+
+        Returns:
+            Counts of files scanned, unchanged, removed and failed
+        """
+        stats = ScanStats()
+        stamps = self._stamps()
+        current: set[str] = set()
+        todo: list[str] = []
+        for path in paths:
+            path_str = os.path.abspath(path)
+            if path_str in current:
+                continue
+            current.add(path_str)
+            try:
+                st = os.stat(path_str)
+            except OSError:
+                todo.append(path_str)  # Recorded as an error by the worker
+                continue
+            if stamps.get(path_str) == (st.st_size, st.st_mtime_ns):
+                stats.unchanged += 1
+            else:
+                todo.append(path_str)
+        stats.files = len(current)
+
+        logger.debug(f"Catalog: {len(todo)} of {stats.files} file(s) to read")
+        now = time.time()
+        for i, entry in enumerate(run_batch(read_catalog_entry, todo, jobs=jobs)):
+            self._store(entry, now)
+            stats.scanned += 1
+            stats.failed += entry.error is not None
+            if i % COMMIT_EVERY == COMMIT_EVERY - 1:
+                self._db.commit()
+
+        for root in roots:
+            prefix = os.path.join(os.path.abspath(root), "")
+            gone = [p for p in stamps if p.startswith(prefix) and p not in current]
+            for path_str in gone:
+                self._delete(path_str)
+            stats.removed += len(gone)
+        self._db.commit()
+        return stats
+
+    def _delete(self, path: str) -> None:
+        self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+        self._db.execute("DELETE FROM faces WHERE path = ?", (path,))
+
+    def _store(self, entry: CatalogEntry, now: float) -> None:
+        """Replace the records of one file."""
+        self._delete(entry.path)
+        if entry.size is None:
+            logger.debug(f"Catalog: {entry.path}: {entry.error}")
+            return
+        if entry.error is not None:
+            logger.debug(f"Catalog: {entry.path}: {entry.error}")
+        self._db.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.path,
+                entry.size,
+                entry.mtime_ns,
+                entry.digest,
+                len(entry.faces),
+                entry.error,
+                now,
+            ),
+        )
+        placeholders = ", ".join("?" * (4 + len(CATALOG_NAME_IDS)))
+        self._db.executemany(
+            f"INSERT INTO faces VALUES ({placeholders})",
+            [
+                (
+                    entry.path,
+                    face.face,
+                    face.family_name,
+                    face.family_slug,
+                    *(face.names.get(name_id) for name_id in CATALOG_NAME_IDS),
+                )
+                for face in entry.faces
+            ],
+        )
+
+    def query(
+        self, family: str | None = None, slug: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield catalogued faces by family name and/or slug.
+
+        Args:
+            family: Family name (case-insensitive; ``*``/``?`` wildcards)
+            slug: Family slug (likewise); with neither, every face matches
+
+        Yields:
+            One record per face: path, face, collection, size, mtime_ns,
+            digest, family_name, family_slug and names (nameID → value),
+            ordered by path and face
+        """
+        conditions, args = [], []
+        for column, value in (("family_name", family), ("family_slug", slug)):
+            if value:
+                comparison, arg = _wildcards(value)
+                conditions.append(f"faces.{column} {comparison}")
+                args.append(arg)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._db.execute(
+            "SELECT faces.path, face, files.faces, size, mtime_ns, digest,"
+            f" family_name, family_slug, {_NAME_COLUMNS}"
+            " FROM faces JOIN files ON files.path = faces.path"
+            f" {where} ORDER BY faces.path, face",
+            args,
+        )
+        for row in rows:
+            path, face, faces, size, mtime_ns, digest, name, slug_value = row[:8]
+            yield {
+                "path": path,
+                "face": face,
+                "collection": faces > 1,
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "digest": digest,
+                "family_name": name,
+                "family_slug": slug_value,
+                "names": dict(zip(CATALOG_NAME_IDS, row[8:], strict=True)),
+            }
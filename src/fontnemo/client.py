@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/client.py
+"""Thin client forwarding fontnemo commands to a warm ``fontnemo serve``.
+
+Only the standard library's socket support is imported here, so a forwarded
+call costs a bare interpreter start plus the rename itself. The client passes
+its stdin, stdout and stderr file descriptors to the daemon, which runs the
+command in a forked worker writing straight to them; the worker's exit status
+is sent back and becomes the client's exit status.
+
+If no daemon is listening, the command runs locally instead. Since the
+daemon receives the client's descriptors, the client only talks to a daemon
+run by the same user: the default socket lives in a private (0700)
+directory, and where the platform reports it (SO_PEERCRED), the daemon's
+uid is checked before anything is sent.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Final
+
+# Environment variable naming the daemon socket
+SOCKET_ENV: Final[str] = "FONTNEMO_SOCKET"
+
+# Bumped when the request or reply format changes
+PROTOCOL_VERSION: Final[int] = 1
+
+# File descriptors handed to the daemon: stdin, stdout, stderr
+FORWARDED_FDS: Final[tuple[int, int, int]] = (0, 1, 2)
+
+
+def fallback_socket_dir() -> Path:
+    """Return the per-user socket directory used without $XDG_RUNTIME_DIR."""
+    return Path(tempfile.gettempdir()) / f"fontnemo-{os.getuid()}"
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket path.
+
+    ``$FONTNEMO_SOCKET`` if set, else ``fontnemo.sock`` in
+    ``$XDG_RUNTIME_DIR``, else ``fontnemo.sock`` in fallback_socket_dir().
+    """
+    if path := os.environ.get(SOCKET_ENV):
+        return Path(path)
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(runtime_dir) / "fontnemo.sock"
+    return fallback_socket_dir() / "fontnemo.sock"
+
+
+def check_private_dir(directory: str | Path, create: bool = False) -> None:
+    """Check that a directory is owned by this user and closed to others.
+
+    Args:
+        directory: Directory to check
+        create: Create it with mode 0700 if missing
+
+    Raises:
+        OSError: If it is missing (and not created), a symlink, not owned by
+            this user or accessible to other users
+    """
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"{directory} must be a directory owned by you with mode 0700"
+        )
+
+
+def peer_uid(sock: socket.socket) -> int | None:
+    """Return the uid of the process on the other end of a Unix socket.
+
+    Returns:
+        The uid, or None where the platform does not provide SO_PEERCRED
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    size = struct.calcsize("3i")
+    _, uid, _ = struct.unpack(
+        "3i", sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, size)
+    )
+    return int(uid)
+
+
+def connect(socket_path: str | Path | None = None) -> socket.socket:
+    """Connect to a running daemon of the same user.
+
+    Args:
+        socket_path: Daemon socket (default: default_socket_path())
+
+    Returns:
+        Connected Unix stream socket
+
+    Raises:
+        PermissionError: If the socket directory is not private or the
+            daemon runs as another user
+        OSError: If no daemon is listening on the socket
+    """
+    path = Path(socket_path or default_socket_path())
+    if path.parent == fallback_socket_dir():
+        check_private_dir(path.parent)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        uid = peer_uid(sock)
+        if uid is not None and uid != os.getuid():
+            raise PermissionError(f"fontnemo daemon on {path} runs as uid {uid}")
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def encode_request(argv: list[str], cwd: str) -> bytes:
+    """Encode one request as a newline-terminated JSON line."""
+    request = {"version": PROTOCOL_VERSION, "argv": argv, "cwd": cwd}
+    return json.dumps(request).encode("utf-8") + b"\n"
+
+
+def forward(sock: socket.socket, argv: list[str], cwd: str | None = None) -> int:
+    """Run one command on the daemon and wait for its exit status.
+
+    The command's output goes directly to this process's stdout and stderr.
+
+    Args:
+        sock: Socket returned by connect() (closed on return)
+        argv: Command-line arguments, as for fontnemo.__main__.main
+        cwd: Working directory for relative paths (default: os.getcwd())
+
+    Returns:
+        Exit status of the command
+
+    Raises:
+        ConnectionError: If the daemon closes the connection without a status
+    """
+    with sock:
+        # Flush so earlier output cannot appear after the worker's
+        sys.stdout.flush()
+        sys.stderr.flush()
+        socket.send_fds(sock, [encode_request(argv, cwd or os.getcwd())], FORWARDED_FDS)
+
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("fontnemo daemon closed the connection")
+            reply += chunk
+    response = json.loads(reply)
+    if error := response.get("error"):
+        print(f"fontnemo daemon: {error}", file=sys.stderr)
+    return int(response["exit"])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for ``fontnemo-client``: forward argv or run locally.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        sock = connect()
+    except OSError as e:
+        if isinstance(e, PermissionError):
+            print(f"fontnemo-client: {e}; running locally", file=sys.stderr)
+        # No daemon: run in this process (the command has not started yet)
+        from fontnemo.__main__ import main as local_main
+
+        local_main(argv)
+        return
+
+    sys.exit(forward(sock, argv))
+
+
+if __name__ == "__main__":
+    main()
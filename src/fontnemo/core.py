@@ -2,14 +2,42 @@
 # this_file: src/fontnemo/core.py
 """Core font name table reading and writing operations."""
 
-import tempfile
+import io
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
-
-from fontTools.ttLib import TTFont
-from loguru import logger
+from typing import TYPE_CHECKING, Any, BinaryIO, Final
 
+from fontnemo.fileops import (
+    DEFAULT_DURABILITY,
+    TempFile,
+    backup_file,
+    sync_directory,
+)
+from fontnemo.instrument import count_read, count_written, phase
+from fontnemo.log import logger
+from fontnemo.sfnt import (
+    SFNT_VERSIONS,
+    WOFF2_TAG,
+    WOFF_TAG,
+    NameKey,
+    decode_name_string,
+    is_collection,
+    load_name_records,
+    open_font_buffer,
+    patch_table_in_place,
+    read_face_offsets,
+    read_name_records,
+    verify_name_buffer,
+    verify_name_table,
+    write_collection,
+    write_sfnt,
+)
 from fontnemo.utils import make_timestamp
+from fontnemo.woff import encode_woff, encode_woff2, write_woff, write_woff2
+
+if TYPE_CHECKING:
+    from fontTools.ttLib import TTFont
 
 # Platform/Encoding IDs for name table records
 # Priority: Windows English first, then Mac Roman as fallback
@@ -41,19 +69,194 @@ SLUG_READ_PRIORITY: Final[tuple[int, ...]] = (
     6,
 )  # Variations PS Name Prefix → PS Name
 
+# TTFont.flavor values supported by the name-only writers
+NAME_ONLY_FLAVORS: Final[tuple[str | None, ...]] = (None, "woff", "woff2")
+
+# Output container formats; "sfnt" is a plain TTF/OTF (or TTC/OTC) file
+OUTPUT_FORMATS: Final[tuple[str, ...]] = ("sfnt", "woff", "woff2")
+FORMAT_ALIASES: Final[dict[str, str]] = {"ttf": "sfnt", "otf": "sfnt"}
+
+# Encoders from uncompressed sfnt data to each output format
+FORMAT_ENCODERS: Final[dict[str, Callable[[bytes], bytes]]] = {
+    "sfnt": bytes,
+    "woff": encode_woff,
+    "woff2": encode_woff2,
+}
+
+# In-memory font sources accepted by the handlers
+FontData = bytes | bytearray | memoryview | BinaryIO
+
+
+@dataclass(frozen=True)
+class NameChange:
+    """One name record a rename would rewrite, with its old and new value."""
+
+    face: int
+    name_id: int
+    platform_id: int
+    plat_enc_id: int
+    lang_id: int
+    old: str
+    new: str
+
+
+def read_font_data(source: FontData) -> bytes:
+    """Return the contents of an in-memory font: bytes-like or file-like."""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, bytearray | memoryview):
+        return bytes(source)
+    return source.read()
+
 
 class FontNameHandler:
-    """Handles reading and writing font name table records."""
+    """Handles reading and writing font name table records.
+
+    Reads go through a lightweight memory-mapped name table reader that does
+    not import fontTools. The TTFont is only loaded when ``font`` or
+    ``name_table`` is accessed, e.g. by the write methods.
+
+    For a collection (.ttc/.otc) the handler works on one face; saving it
+    writes that face as a standalone font. Use FontCollectionHandler to
+    rename faces inside the collection.
+
+    Instead of a file, the font may be given as ``data`` (font file bytes or
+    a binary file object) or as an already loaded ``font``. A loaded TTFont
+    is modified in place and always written by fontTools, since its other
+    tables may have been changed too.
+    """
 
-    def __init__(self, font_path: str | Path) -> None:
-        """Initialize handler with font file.
+    def __init__(
+        self,
+        font_path: str | Path | None = None,
+        face: int = 0,
+        *,
+        data: FontData | None = None,
+        font: "TTFont | None" = None,
+    ) -> None:
+        """Initialize handler with a font file, font data or a TTFont.
 
         Args:
-            font_path: Path to font file (.ttf, .otf)
+            font_path: Path to font file (.ttf, .otf, .ttc, .otc, .woff, .woff2)
+            face: Face index within a collection
+            data: Font file contents, instead of font_path
+            font: Loaded TTFont, instead of font_path (not closed by close())
+
+        Raises:
+            ValueError: If not exactly one of font_path, data, font is given
+        """
+        if sum(source is not None for source in (font_path, data, font)) != 1:
+            raise ValueError("Give exactly one of font_path, data or font")
+        self.font_path = Path(font_path) if font_path is not None else None
+        self.face = face
+        self._data = read_font_data(data) if data is not None else None
+        self._font: TTFont | None = font
+        self._owns_font = font is None
+        self._raw_names: dict[NameKey, bytes] | None = None
+        # Index of the fontTools name records, see _name_index()
+        self._index: dict[NameKey, Any] | None = None
+        self._index_by_id: dict[int, list[Any]] = {}
+        self._indexed_names: tuple[int, int] | None = None
+        if font is not None:
+            return
+        try:
+            if self._data is not None:
+                self._raw_names = read_name_records(self._data, face)
+            else:
+                assert self.font_path is not None  # One source is always given
+                self._raw_names = load_name_records(self.font_path, face)
+        except ValueError:
+            # Not a plain sfnt font: let fontTools parse (or reject) it
+            self.name_table
+
+    @property
+    def font(self) -> "TTFont":
+        """Full TTFont object, loaded on first access."""
+        if self._font is None:
+            from fontTools.ttLib import TTFont
+
+            with phase("parse"):
+                if self._data is not None:
+                    self._font = TTFont(io.BytesIO(self._data), fontNumber=self.face)
+                else:
+                    self._font = TTFont(str(self.font_path), fontNumber=self.face)
+        return self._font
+
+    def _open_source(self) -> Any:
+        """Return the source font's bytes: the data, or the mapped file.
+
+        Raises:
+            ValueError: If the font was given as a loaded TTFont
+        """
+        if self._data is not None:
+            return self._data
+        if self.font_path is None:
+            raise ValueError("A loaded TTFont has no source file or data")
+        return open_font_buffer(self.font_path)
+
+    @property
+    def name_table(self) -> Any:
+        """fontTools name table (loads the TTFont)."""
+        font = self.font
+        if "name" in font.tables:
+            return font["name"]
+        with phase("decode"):
+            return font["name"]
+
+    def _name_index(self) -> dict[NameKey, Any]:
+        """Index fontTools name records by (nameID, platformID, platEncID, langID).
+
+        Built once, instead of scanning all records for every lookup. The
+        first record of duplicate keys wins, as with ``getName``. The index
+        also groups records by nameID for the write methods; it is rebuilt
+        if records were added or removed since it was built.
+        """
+        names = self.name_table.names
+        state = (id(names), len(names))
+        if self._index is None or self._indexed_names != state:
+            index: dict[NameKey, Any] = {}
+            by_id: dict[int, list[Any]] = {}
+            for rec in names:
+                key = (rec.nameID, rec.platformID, rec.platEncID, rec.langID)
+                index.setdefault(key, rec)
+                by_id.setdefault(rec.nameID, []).append(rec)
+            self._index, self._index_by_id = index, by_id
+            self._indexed_names = state
+        return self._index
+
+    def _records(self, name_ids: Iterable[int]) -> list[Any]:
+        """Return all name records with the given nameIDs, via the index."""
+        self._name_index()
+        return [
+            rec for name_id in name_ids for rec in self._index_by_id.get(name_id, ())
+        ]
+
+    def _get_name(
+        self, name_id: int, plat_id: int, enc_id: int, lang_id: int
+    ) -> str | None:
+        """Look up one decoded name record, or None if missing.
+
+        Uses the lightweight reader until the fontTools name table has been
+        loaded, after which that table (with any modifications) is used.
         """
-        self.font_path = Path(font_path)
-        self.font = TTFont(str(self.font_path))
-        self.name_table = self.font["name"]
+        if self._raw_names is None or (
+            self._font is not None and "name" in self._font.tables
+        ):
+            rec = self._name_index().get((name_id, plat_id, enc_id, lang_id))
+            return rec.toUnicode() if rec else None
+
+        raw = self._raw_names.get((name_id, plat_id, enc_id, lang_id))
+        if raw is None:
+            return None
+        return decode_name_string(raw, plat_id, enc_id, lang_id)
+
+    def read_name(self, name_id: int) -> str | None:
+        """Read one nameID (Windows English, else Mac Roman), or None if missing."""
+        for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH, MAC_ROMAN):
+            value = self._get_name(name_id, plat_id, enc_id, lang_id)
+            if value is not None:
+                return value
+        return None
 
     def read_family_name(self) -> str:
         """Read family name with fallback priority: nameID 16 → 21 → 1.
@@ -67,17 +270,12 @@ class FontNameHandler:
         for name_id in FAMILY_READ_PRIORITY:
             # Try Windows English first
             for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH, MAC_ROMAN):
-                rec = self.name_table.getName(
-                    nameID=name_id,
-                    platformID=plat_id,
-                    platEncID=enc_id,
-                    langID=lang_id,
-                )
-                if rec:
-                    family_name = rec.toUnicode()
-                    logger.debug(
-                        f"Read family_name from nameID {name_id}: {family_name!r}"
-                    )
+                family_name = self._get_name(name_id, plat_id, enc_id, lang_id)
+                if family_name is not None:
+                    if logger.enabled("DEBUG"):
+                        logger.debug(
+                            f"Read family_name from nameID {name_id}: {family_name!r}"
+                        )
                     return family_name
 
         raise ValueError("No family name found in nameIDs 16, 21, or 1")
@@ -94,22 +292,18 @@ class FontNameHandler:
         for name_id in SLUG_READ_PRIORITY:
             # Try Windows English first
             for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH, MAC_ROMAN):
-                rec = self.name_table.getName(
-                    nameID=name_id,
-                    platformID=plat_id,
-                    platEncID=enc_id,
-                    langID=lang_id,
-                )
-                if rec:
-                    value = rec.toUnicode()
-
+                value = self._get_name(name_id, plat_id, enc_id, lang_id)
+                if value is not None:
                     # For nameID 6 (PostScript Name), take text before first hyphen
                     if name_id == 6 and "-" in value:
                         slug = value.split("-")[0]
                     else:
                         slug = value
 
-                    logger.debug(f"Read family_slug from nameID {name_id}: {slug!r}")
+                    if logger.enabled("DEBUG"):
+                        logger.debug(
+                            f"Read family_slug from nameID {name_id}: {slug!r}"
+                        )
                     return slug
 
         raise ValueError("No family slug found in nameIDs 25 or 6")
@@ -120,13 +314,18 @@ class FontNameHandler:
         Args:
             new_name: New family name to write
         """
-        logger.debug(f"Writing family_name {new_name!r} to nameIDs {FAMILY_NAME_IDS}")
+        debug = logger.enabled("DEBUG")
+        if debug:
+            logger.debug(
+                f"Writing family_name {new_name!r} to nameIDs {FAMILY_NAME_IDS}"
+            )
 
-        for rec in self.name_table.names:
-            if rec.nameID in FAMILY_NAME_IDS:
-                old_value = rec.toUnicode()
-                rec.string = new_name
-                logger.debug(f"  nameID {rec.nameID}: {old_value!r} → {new_name!r}")
+        for rec in self._records(FAMILY_NAME_IDS):
+            if debug:
+                logger.debug(
+                    f"  nameID {rec.nameID}: {rec.toUnicode()!r} → {new_name!r}"
+                )
+            rec.string = new_name
 
     def write_family_slug(self, new_slug: str) -> None:
         """Write family slug to nameIDs 6, 20, 25 (no spaces).
@@ -136,91 +335,521 @@ class FontNameHandler:
         """
         # PostScript names cannot have spaces
         slug_no_spaces = new_slug.replace(" ", "")
-        logger.debug(
-            f"Writing family_slug {slug_no_spaces!r} to nameIDs {FAMILY_SLUG_IDS}"
-        )
+        debug = logger.enabled("DEBUG")
+        if debug:
+            logger.debug(
+                f"Writing family_slug {slug_no_spaces!r} to nameIDs {FAMILY_SLUG_IDS}"
+            )
 
-        for rec in self.name_table.names:
-            if rec.nameID in FAMILY_SLUG_IDS:
-                old_value = rec.toUnicode()
-                rec.string = slug_no_spaces
+        for rec in self._records(FAMILY_SLUG_IDS):
+            if debug:
                 logger.debug(
-                    f"  nameID {rec.nameID}: {old_value!r} → {slug_no_spaces!r}"
+                    f"  nameID {rec.nameID}: {rec.toUnicode()!r} → {slug_no_spaces!r}"
                 )
+            rec.string = slug_no_spaces
+
+    def plan_family_names(self, new_name: str, new_slug: str) -> list[NameChange]:
+        """Return the records write_family_name/write_family_slug would change.
+
+        Nothing is modified. Until the TTFont has been loaded, the records
+        come from the lightweight reader, so fontTools is not imported.
+
+        Args:
+            new_name: Family name to be written to FAMILY_NAME_IDS
+            new_slug: Family slug to be written to FAMILY_SLUG_IDS
+
+        Returns:
+            Changed records (old value differs from new), in nameID order
+        """
+        targets = dict.fromkeys(FAMILY_NAME_IDS, new_name)
+        targets.update(dict.fromkeys(FAMILY_SLUG_IDS, new_slug.replace(" ", "")))
+
+        if self._raw_names is None or (
+            self._font is not None and "name" in self._font.tables
+        ):
+            records = [
+                (rec.nameID, rec.platformID, rec.platEncID, rec.langID, rec.toUnicode())
+                for rec in self._records(targets)
+            ]
+        else:
+            records = [
+                (*key, decode_name_string(raw, key[1], key[2], key[3]))
+                for key, raw in sorted(self._raw_names.items())
+                if key[0] in targets
+            ]
+
+        changes = []
+        for name_id, plat_id, enc_id, lang_id, old in sorted(records):
+            new = targets[name_id]
+            if old != new:
+                changes.append(
+                    NameChange(self.face, name_id, plat_id, enc_id, lang_id, old, new)
+                )
+        return changes
+
+    def can_write_name_only(self) -> bool:
+        """Check if saving may bypass the full TTFont compile.
+
+        Requires a single sfnt, WOFF or WOFF2 font read from a file or data,
+        in which no table other than ``name`` has been loaded (and thus
+        possibly modified).
+        """
+        if self.font_path is None and self._data is None:
+            return False
+        if self.font.sfntVersion.encode("latin-1") not in SFNT_VERSIONS:
+            return False
+        if self.font.flavor not in NAME_ONLY_FLAVORS:
+            return False
+        return set(self.font.tables) <= {"name"}
+
+    def compile_name_table(self) -> bytes:
+        """Compile the (modified) name table to binary data."""
+        name_table = self.name_table
+        with phase("compile"):
+            data: bytes = name_table.compile(self.font)
+        return data
+
+    def compile_sfnt(self) -> bytes:
+        """Return the modified font as an uncompressed sfnt font.
+
+        Uses the name-only writer for sfnt sources; WOFF/WOFF2 sources are
+        decoded by fontTools from the already loaded font. No further tables
+        are loaded, so a later name-only save stays possible.
+        """
+        if self.can_write_name_only() and self.font.flavor is None:
+            src = self._open_source()
+            try:
+                out = io.BytesIO()
+                write_sfnt(src, out, {"name": self.compile_name_table()}, self.face)
+            finally:
+                if hasattr(src, "close"):
+                    src.close()
+            return out.getvalue()
+
+        font = self.font
+        flavor, recalc_timestamp = font.flavor, font.recalcTimestamp
+        # recalcTimestamp would load (and so modify) the head table
+        font.flavor, font.recalcTimestamp = None, False
+        try:
+            out = io.BytesIO()
+            with phase("compile"):
+                font.save(out)
+        finally:
+            font.flavor, font.recalcTimestamp = flavor, recalc_timestamp
+        return out.getvalue()
+
+    def write(self, out: BinaryIO) -> None:
+        """Write the complete modified font to a binary file object.
+
+        Only the name table is compiled; all other tables are copied
+        byte-for-byte from the source (for WOFF2, from the decompressed
+        table stream, which is then compressed again). Falls back to a full
+        TTFont save when that is not possible.
+
+        Args:
+            out: Writable binary file object
+        """
+        if not self.can_write_name_only():
+            self.font.save(out)
+            return
+
+        name_data = self.compile_name_table()
+        src = self._open_source()
+        try:
+            if self.font.flavor == "woff":
+                write_woff(src, out, {"name": name_data})
+            elif self.font.flavor == "woff2":
+                write_woff2(src, out, {"name": name_data})
+            else:
+                write_sfnt(src, out, {"name": name_data}, face=self.face)
+        finally:
+            if hasattr(src, "close"):
+                src.close()
+        logger.debug(f"Wrote name table only ({len(name_data)} bytes)")
 
     def save(self, output_path: str | Path) -> None:
-        """Save font to output path.
+        """Save font to output path (see write()).
 
         Args:
             output_path: Destination file path
         """
-        self.font.save(str(output_path))
+        with open(output_path, "wb") as out:
+            self.write(out)
         logger.info(f"Saved font to: {output_path}")
 
+    def to_bytes(self) -> bytes:
+        """Return the complete modified font as bytes (see write())."""
+        out = io.BytesIO()
+        self.write(out)
+        return out.getvalue()
+
+    def save_in_place(self) -> bool:
+        """Patch the modified name table directly into the source file.
+
+        Succeeds only if the new name table fits in the existing table slot
+        (including alignment padding); otherwise nothing is written.
+
+        Returns:
+            True if the source file was patched
+        """
+        # Compressed (WOFF/WOFF2) tables are always rewritten
+        if self.font_path is None or self._data is not None:
+            return False
+        if not self.can_write_name_only() or self.font.flavor is not None:
+            return False
+        name_data = self.compile_name_table()
+        with phase("write"):
+            patched = patch_table_in_place(self.font_path, "name", name_data)
+        if patched:
+            count_written(len(name_data))
+            logger.info(f"Patched name table in place: {self.font_path}")
+        return patched
+
     def close(self) -> None:
-        """Close font file."""
-        self.font.close()
+        """Close font file (a TTFont passed in by the caller stays open)."""
+        if self._font is not None and self._owns_font:
+            self._font.close()
 
 
-def save_font_safely(
-    handler: FontNameHandler,
-    output_mode: str | Path,
-) -> Path:
-    """Save font with safe write pattern: temp → backup → move.
+class FontCollectionHandler:
+    """Handles name tables of selected faces of a TTC/OTC font collection.
+
+    Each selected face gets its own FontNameHandler in ``handlers``. Saving
+    writes the whole collection in one pass: only the compiled name tables
+    are new, every other (possibly shared) table is copied once, unchanged.
+    """
+
+    def __init__(
+        self,
+        font_path: str | Path | None = None,
+        faces: Iterable[int] | None = None,
+        *,
+        data: FontData | None = None,
+    ) -> None:
+        """Initialize handler with collection file or data.
+
+        Args:
+            font_path: Path to collection file (.ttc, .otc)
+            faces: Face indices to work on (default: all faces)
+            data: Collection file contents, instead of font_path
+
+        Raises:
+            ValueError: If a face index is out of range, or not exactly one
+                of font_path and data is given
+        """
+        if (font_path is None) == (data is None):
+            raise ValueError("Give exactly one of font_path or data")
+        self.font_path = Path(font_path) if font_path is not None else None
+        self._data = read_font_data(data) if data is not None else None
+        buf = self._open_source()
+        try:
+            self.face_count = len(read_face_offsets(buf))
+        finally:
+            if hasattr(buf, "close"):
+                buf.close()
+
+        selected = list(range(self.face_count)) if faces is None else list(faces)
+        for face in selected:
+            if not 0 <= face < self.face_count:
+                raise ValueError(
+                    f"Face index {face} out of range "
+                    f"(collection has {self.face_count} faces)"
+                )
+        if self._data is not None:
+            self.handlers = [
+                FontNameHandler(face=face, data=self._data) for face in selected
+            ]
+        else:
+            self.handlers = [FontNameHandler(self.font_path, face) for face in selected]
+
+    def _open_source(self) -> Any:
+        """Return the collection's bytes: the data, or the mapped file."""
+        if self._data is not None:
+            return self._data
+        assert self.font_path is not None  # One source is always given
+        return open_font_buffer(self.font_path)
+
+    def read_family_name(self) -> str:
+        """Read family name of the first selected face."""
+        return self.handlers[0].read_family_name()
+
+    def read_family_slug(self) -> str:
+        """Read family slug of the first selected face."""
+        return self.handlers[0].read_family_slug()
+
+    def write(self, out: BinaryIO) -> None:
+        """Write the collection with the selected faces' name tables replaced.
+
+        Args:
+            out: Writable binary file object
+        """
+        if all(handler.can_write_name_only() for handler in self.handlers):
+            replacements = {
+                handler.face: {"name": handler.compile_name_table()}
+                for handler in self.handlers
+            }
+            src = self._open_source()
+            try:
+                write_collection(src, out, replacements)
+            finally:
+                if hasattr(src, "close"):
+                    src.close()
+            logger.debug(f"Wrote name tables only for faces {list(replacements)}")
+            return
+
+        from fontTools.ttLib import TTCollection
+
+        source = (
+            io.BytesIO(self._data) if self._data is not None else str(self.font_path)
+        )
+        collection = TTCollection(source, shareTables=True)
+        for handler in self.handlers:
+            font = collection.fonts[handler.face]
+            for tag in handler.font.tables:
+                font[tag] = handler.font[tag]
+        collection.save(out)
+        collection.close()
+
+    def save(self, output_path: str | Path) -> None:
+        """Save the collection to output path (see write()).
+
+        Args:
+            output_path: Destination file path
+        """
+        with open(output_path, "wb") as out:
+            self.write(out)
+        logger.info(f"Saved font to: {output_path}")
+
+    def to_bytes(self) -> bytes:
+        """Return the complete modified collection as bytes."""
+        out = io.BytesIO()
+        self.write(out)
+        return out.getvalue()
+
+    def save_in_place(self) -> bool:
+        """Collections are always rewritten; in-place patching is not done."""
+        return False
+
+    def close(self) -> None:
+        """Close all face handlers."""
+        for handler in self.handlers:
+            handler.close()
+
+
+def open_font_handler(
+    font_path: str | Path | None = None,
+    faces: Iterable[int] | None = None,
+    *,
+    data: FontData | None = None,
+) -> FontNameHandler | FontCollectionHandler:
+    """Open a font file (or font data) with the matching handler.
 
     Args:
-        handler: FontNameHandler with modified font
-        output_mode: Output handling mode:
-            - "0" or None: Replace input file
-            - "1": Backup original with --TIMESTAMP, then replace
-            - "2": Save as input path with --TIMESTAMP suffix
-            - Path string: Save to explicit path
+        font_path: Path to font file or collection
+        faces: Face indices for collections (default: all faces); for single
+            fonts only face 0 is valid
+        data: Font file contents, instead of font_path
 
     Returns:
-        Final output path
+        FontCollectionHandler for collections, otherwise FontNameHandler
 
     Raises:
-        OSError: If file operations fail
+        ValueError: If faces are given for a single font other than face 0
+    """
+    with phase("open"):
+        if data is not None:
+            data = read_font_data(data)
+            count_read(len(data))
+            collection = is_collection(data[:4])
+        else:
+            assert font_path is not None  # One source is always given
+            count_read(font_path)
+            with open(font_path, "rb") as f:
+                collection = is_collection(f.read(4))
+        if collection:
+            return FontCollectionHandler(font_path, faces, data=data)
+
+        if faces is not None and list(faces) != [0]:
+            source = font_path if font_path is not None else "Font data"
+            raise ValueError(f"{source} is not a font collection; only face 0 exists")
+        return FontNameHandler(font_path, data=data)
+
+
+def parse_faces(faces: int | str | Iterable[int] | None) -> list[int] | None:
+    """Parse a --face value: an index, "0,2", a sequence, or None for all.
+
+    Raises:
+        ValueError: If the value is not a list of non-negative integers
+    """
+    if faces is None or faces == "":
+        return None
+    if isinstance(faces, int):
+        items: list[Any] = [faces]
+    elif isinstance(faces, str):
+        items = [part.strip() for part in faces.split(",") if part.strip()]
+    else:
+        items = list(faces)
+    try:
+        result = [int(item) for item in items]
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid face selection: {faces!r}") from e
+    if any(face < 0 for face in result):
+        raise ValueError(f"Invalid face selection: {faces!r}")
+    return result
+
+
+def font_format(font_path: str | Path) -> str:
+    """Return the container format of a font file: sfnt, woff or woff2."""
+    with open(font_path, "rb") as f:
+        return data_format(f.read(4))
+
+
+def data_format(data: bytes) -> str:
+    """Return the container format of font data: sfnt, woff or woff2."""
+    signature = bytes(data[:4])
+    if signature == WOFF_TAG:
+        return "woff"
+    if signature == WOFF2_TAG:
+        return "woff2"
+    return "sfnt"
+
+
+def parse_formats(formats: str | Iterable[str] | None) -> list[str] | None:
+    """Parse a --formats value: "sfnt,woff,woff2", a sequence, or None.
+
+    "ttf" and "otf" are accepted as aliases of "sfnt".
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    if formats is None or formats == "":
+        return None
+    items = formats.split(",") if isinstance(formats, str) else list(formats)
+    result: list[str] = []
+    for item in items:
+        fmt = str(item).strip().lower()
+        fmt = FORMAT_ALIASES.get(fmt, fmt)
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format {item!r} (expected {', '.join(OUTPUT_FORMATS)})"
+            )
+        if fmt not in result:
+            result.append(fmt)
+    return result or None
+
+
+def _format_suffix(fmt: str, input_path: Path) -> str:
+    """File extension for writing input_path's font in another format."""
+    if fmt == font_format(input_path):
+        return input_path.suffix
+    if fmt != "sfnt":
+        return f".{fmt}"
+    # WOFF and WOFF2 headers store the sfnt flavor at offset 4
+    with open(input_path, "rb") as f:
+        f.seek(4)
+        return ".otf" if f.read(4) == b"OTTO" else ".ttf"
+
+
+def _format_paths(
+    input_path: Path, final_path: Path, formats: Sequence[str]
+) -> dict[str, Path]:
+    """Map each output format to its file next to final_path."""
+    return {
+        fmt: final_path.with_suffix(_format_suffix(fmt, input_path)) for fmt in formats
+    }
+
+
+def plan_output_paths(
+    input_path: str | Path,
+    output_mode: str | Path,
+    formats: Sequence[str] | None = None,
+) -> list[Path]:
+    """Return the paths save_font_safely/save_font_formats would write.
+
+    Nothing is written; in mode "2" the timestamp is the current one.
+
+    Args:
+        input_path: Input font file
+        output_mode: Output mode as for save_font_safely
+        formats: Output formats (default: the input's format)
+
+    Returns:
+        Output paths, in the order of formats
     """
-    input_path = handler.font_path
+    input_path = Path(input_path)
+    final_path, _ = _resolve_output_path(input_path, output_mode)
+    if not formats:
+        return [final_path]
+    return list(_format_paths(input_path, final_path, formats).values())
 
-    # Determine final output path
+
+def _resolve_output_path(
+    input_path: Path, output_mode: str | Path
+) -> tuple[Path, bool]:
+    """Map an output mode to (final path, whether to back up the original)."""
     if output_mode is None or output_mode == "0":
-        final_path = input_path
-        backup_original = False
-    elif output_mode == "1":
-        final_path = input_path
-        backup_original = True
-    elif output_mode == "2":
+        return input_path, False
+    if output_mode == "1":
+        return input_path, True
+    if output_mode == "2":
         # Add timestamp suffix to input filename
         timestamp = make_timestamp()
-        final_path = (
-            input_path.parent / f"{input_path.stem}--{timestamp}{input_path.suffix}"
+        return (
+            input_path.parent / f"{input_path.stem}--{timestamp}{input_path.suffix}",
+            False,
         )
-        backup_original = False
-    else:
-        final_path = Path(output_mode)
-        backup_original = False
+    final_path = Path(output_mode)
+    if final_path.is_dir():
+        final_path = final_path / input_path.name
+    return final_path, False
 
-    logger.debug(
-        f"Save mode: {output_mode}, final path: {final_path}, backup: {backup_original}"
-    )
 
-    # Write to temporary file in same directory as final output
-    # This ensures we're on the same filesystem for atomic move
+def _handler_path(handler: FontNameHandler | FontCollectionHandler) -> Path:
+    """Return the input file of a handler opened from a path.
+
+    Raises:
+        ValueError: If the handler works on in-memory data
+    """
+    if handler.font_path is None:
+        raise ValueError("In-memory fonts have no input file; use to_bytes()")
+    return handler.font_path
+
+
+def _write_safely(
+    final_path: Path,
+    write: Callable[[BinaryIO], object],
+    backup_original: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> None:
+    """Write a file via temp file → optional backup → atomic replace.
+
+    Args:
+        final_path: Destination path
+        write: Function writing the complete file to the binary file object
+            it is given
+        backup_original: Keep an existing final_path as a --TIMESTAMP backup,
+            hard-linked or cloned rather than copied (see fileops.backup_file)
+        durability: fsync the file ("file"), and the directory after the
+            rename ("full"); see fontnemo.fileops
+
+    Raises:
+        OSError: If file operations fail
+    """
+    # Temp file in the output directory: same filesystem, so the final
+    # rename is atomic (unnamed where O_TMPFILE is supported)
     final_dir = final_path.parent
-    with tempfile.NamedTemporaryFile(
-        mode="wb",
-        delete=False,
-        dir=final_dir,
-        prefix=".fontnemo_tmp_",
-        suffix=final_path.suffix,
-    ) as tmp_file:
-        tmp_path = Path(tmp_file.name)
+    try:
+        tmp_file = TempFile(final_dir, final_path.suffix)
+    except OSError as e:
+        raise OSError(f"Failed to save font: {e}") from e
 
     try:
-        # Save font to temp file
-        handler.save(tmp_path)
+        with phase("write"):
+            write(tmp_file.file)
+        count_written(tmp_file.size())
+        if durability != "none":
+            with phase("sync"):
+                tmp_file.sync()
 
         # Create backup if requested
         if backup_original and final_path.exists():
@@ -228,17 +857,197 @@ def save_font_safely(
             backup_path = (
                 final_path.parent / f"{final_path.stem}--{timestamp}{final_path.suffix}"
             )
-            logger.info(f"Creating backup: {backup_path}")
-            backup_path.write_bytes(final_path.read_bytes())
+            with phase("backup"):
+                method = backup_file(final_path, backup_path, durability != "none")
+            logger.info(f"Created backup ({method}): {backup_path}")
+            if method != "link":
+                count_read(backup_path)
+                count_written(backup_path)
 
         # Atomic move: temp file → final location
-        tmp_path.replace(final_path)
+        with phase("replace"):
+            tmp_file.commit(final_path)
+        if durability == "full":
+            with phase("sync"):
+                sync_directory(final_dir)
         logger.info(f"Saved font: {final_path}")
 
     except Exception as e:
         # Clean up temp file on error
-        if tmp_path.exists():
-            tmp_path.unlink()
+        tmp_file.discard()
         raise OSError(f"Failed to save font: {e}") from e
 
+
+def save_font_safely(
+    handler: FontNameHandler | FontCollectionHandler,
+    output_mode: str | Path,
+    durability: str = DEFAULT_DURABILITY,
+) -> Path:
+    """Save font with safe write pattern: temp → backup → move.
+
+    In mode "0" with durability "none" the name table is patched into the
+    input file in place when it fits in the existing slot, so no other bytes
+    of the font are touched.
+
+    Args:
+        handler: FontNameHandler or FontCollectionHandler with modified names
+        output_mode: Output handling mode:
+            - "0" or None: Replace input file
+            - "1": Backup original with --TIMESTAMP, then replace
+            - "2": Save as input path with --TIMESTAMP suffix
+            - Path string: Save to explicit path (an existing directory
+              receives the file under the input's name)
+        durability: "none", "file" or "full" (see fontnemo.fileops)
+
+    Returns:
+        Final output path
+
+    Raises:
+        OSError: If file operations fail
+    """
+    input_path = _handler_path(handler)
+    final_path, backup_original = _resolve_output_path(input_path, output_mode)
+
+    logger.debug(
+        f"Save mode: {output_mode}, final path: {final_path}, backup: {backup_original}"
+    )
+
+    _save_handler(handler, final_path, backup_original, durability)
     return final_path
+
+
+def _save_handler(
+    handler: FontNameHandler | FontCollectionHandler,
+    final_path: Path,
+    backup_original: bool,
+    durability: str = DEFAULT_DURABILITY,
+) -> None:
+    """Save a handler's font to final_path, in place when possible."""
+    # Cheapest path: overwrite the name table inside the input file. The
+    # patch is several writes into the live file, so a crash can leave a
+    # mix of old and new; durable saves always go through a temp file.
+    if (
+        durability == "none"
+        and final_path == handler.font_path
+        and not backup_original
+        and handler.save_in_place()
+    ):
+        logger.info(f"Saved font: {final_path}")
+        return
+    _write_safely(final_path, handler.write, backup_original, durability)
+
+
+def save_font_formats(
+    handler: FontNameHandler | FontCollectionHandler,
+    output_mode: str | Path,
+    formats: Sequence[str],
+    durability: str = DEFAULT_DURABILITY,
+) -> list[Path]:
+    """Save the modified font in several container formats from one load.
+
+    The output in the input's own format is saved as by save_font_safely.
+    Other formats are encoded from the renamed font compiled once to sfnt
+    data; the zlib/brotli encoders run in parallel threads (alongside the
+    main save) and every file is written via temp file → atomic replace.
+    Each extra file is placed next to the main output path, with its own
+    extension (font.ttf → font.woff, font.woff2).
+
+    Args:
+        handler: Handler with modified names
+        output_mode: Output mode as for save_font_safely
+        formats: Formats to write, from OUTPUT_FORMATS
+        durability: "none", "file" or "full" (see fontnemo.fileops)
+
+    Returns:
+        Written paths, in the order of formats
+
+    Raises:
+        ValueError: If a collection is to be written as WOFF/WOFF2
+        OSError: If file operations fail
+    """
+    input_path = _handler_path(handler)
+    final_path, backup_original = _resolve_output_path(input_path, output_mode)
+    own_format = font_format(input_path)
+    paths = _format_paths(input_path, final_path, formats)
+    extra = [fmt for fmt in formats if fmt != own_format]
+
+    logger.debug(f"Save formats {list(formats)}: {[str(p) for p in paths.values()]}")
+
+    if not extra:
+        _save_handler(handler, paths[own_format], backup_original, durability)
+        return list(paths.values())
+    if isinstance(handler, FontCollectionHandler):
+        raise ValueError("Font collections can only be written as sfnt")
+
+    sfnt = handler.compile_sfnt()
+
+    def encode_and_write(fmt: str) -> None:
+        with phase("encode"):
+            data = FORMAT_ENCODERS[fmt](sfnt)
+        _write_safely(
+            paths[fmt], lambda out: out.write(data), backup_original, durability
+        )
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(extra)) as pool:
+        futures = [pool.submit(encode_and_write, fmt) for fmt in extra]
+        if own_format in paths:
+            _save_handler(handler, paths[own_format], backup_original, durability)
+        for future in futures:
+            future.result()
+
+    return list(paths.values())
+
+
+def verify_saved_font(
+    font_path: str | Path, expected_family_name: str, face: int = 0
+) -> None:
+    """Cheaply verify a written font without a full fontTools load.
+
+    Only the table directory, the head and name tables are read: their
+    checksums must match the directory, and the family name read back must
+    equal the expected value.
+
+    Args:
+        font_path: Written font file
+        expected_family_name: Family name that should have been written
+        face: Face index within a collection
+
+    Raises:
+        ValueError: If verification fails
+    """
+    with phase("verify"):
+        count_read(font_path)
+        verify_name_table(font_path, face)
+        handler = FontNameHandler(font_path, face)
+        family_name = handler.read_family_name()
+        handler.close()
+    if family_name != expected_family_name:
+        raise ValueError(
+            f"Verification failed for {font_path}: family name is "
+            f"{family_name!r}, expected {expected_family_name!r}"
+        )
+    logger.debug(f"Verified: {font_path}")
+
+
+def verify_font_data(data: bytes, expected_family_name: str, face: int = 0) -> None:
+    """Verify renamed font data, as verify_saved_font does for files.
+
+    Args:
+        data: Font file contents
+        expected_family_name: Family name that should have been written
+        face: Face index within a collection
+
+    Raises:
+        ValueError: If verification fails
+    """
+    verify_name_buffer(data, face)
+    handler = FontNameHandler(face=face, data=data)
+    family_name = handler.read_family_name()
+    handler.close()
+    if family_name != expected_family_name:
+        raise ValueError(
+            f"Verification failed: family name is {family_name!r}, "
+            f"expected {expected_family_name!r}"
+        )
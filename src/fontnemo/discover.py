@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/discover.py
+"""Font discovery in directory trees.
+
+Directories are walked with ``os.scandir`` (whose entries carry the file
+type, so no ``stat`` call is needed per entry) and every candidate file is
+identified by its first 4 bytes (FONT_SIGNATURES), not by its extension:
+fonts with unusual or missing extensions are found, and sources, images and
+other files in a font archive are skipped before any font parser sees them.
+
+- Include/exclude patterns are ``fnmatch`` patterns. A pattern containing
+  ``/`` is matched against the path relative to the walked directory,
+  others against the entry's name. Excluded directories are not entered.
+  When include patterns are given, a file must match one of them.
+- Symlink policies (SYMLINK_POLICIES): ``skip`` ignores symlinks, ``files``
+  (default) follows symlinks to files but does not enter symlinked
+  directories, ``follow`` follows both (each directory is visited once,
+  so symlink loops end).
+- With ``jobs`` > 1, subdirectories are scanned (and their files sniffed) in
+  a thread pool; results are sorted, so the order does not depend on it.
+
+Named temp files of an interrupted save (``.fontnemo_tmp_*``) are never
+reported.
+"""
+
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Final
+
+from fontnemo.fileops import TEMP_PREFIX
+from fontnemo.log import logger
+
+# First 4 bytes of TrueType, OpenType/CFF, Apple TrueType, collection, WOFF
+# and WOFF2 files
+FONT_SIGNATURES: Final[frozenset[bytes]] = frozenset(
+    {b"\x00\x01\x00\x00", b"OTTO", b"true", b"ttcf", b"wOFF", b"wOF2"}
+)
+
+SYMLINK_POLICIES: Final[tuple[str, ...]] = ("skip", "files", "follow")
+DEFAULT_SYMLINKS: Final[str] = "files"
+
+# (path, path relative to the walked directory, (st_dev, st_ino) or None)
+_Directory = tuple[str, str, tuple[int, int] | None]
+
+
+def is_font_file(path: str | Path) -> bool:
+    """Return True if the file starts with one of FONT_SIGNATURES."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        return os.read(fd, 4) in FONT_SIGNATURES
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def parse_symlinks(symlinks: str | None) -> str:
+    """Validate a symlink policy (None means DEFAULT_SYMLINKS).
+
+    Raises:
+        ValueError: If symlinks is not one of SYMLINK_POLICIES
+    """
+    if not symlinks:
+        return DEFAULT_SYMLINKS
+    policy = str(symlinks).strip().lower()
+    if policy not in SYMLINK_POLICIES:
+        raise ValueError(
+            f"Unknown symlink policy {symlinks!r}; use one of "
+            + ", ".join(SYMLINK_POLICIES)
+        )
+    return policy
+
+
+def parse_patterns(patterns: str | Iterable[str] | None) -> tuple[str, ...]:
+    """Parse comma-separated patterns (or a sequence of them) into a tuple."""
+    if not patterns:
+        return ()
+    if isinstance(patterns, str):
+        patterns = patterns.split(",")
+    return tuple(p.strip() for p in patterns if p.strip())
+
+
+def _matches(patterns: Sequence[str], name: str, rel: str) -> bool:
+    """Return True if name (or rel, for patterns with "/") matches a pattern."""
+    from fnmatch import fnmatch
+
+    return any(fnmatch(rel if "/" in p else name, p) for p in patterns)
+
+
+def is_selected(rel: str, include: Sequence[str], exclude: Sequence[str]) -> bool:
+    """Return True if a walk would consider the file at rel (POSIX, relative).
+
+    The file and each directory above it are checked against exclude, and
+    the file against include; temp files of interrupted saves never pass.
+    """
+    parts = rel.split("/")
+    if parts[-1].startswith(TEMP_PREFIX):
+        return False
+    if exclude and any(
+        _matches(exclude, part, "/".join(parts[: i + 1]))
+        for i, part in enumerate(parts)
+    ):
+        return False
+    return not include or _matches(include, parts[-1], rel)
+
+
+class _Scanner:
+    """Scans one directory at a time with fixed filters (thread-safe)."""
+
+    def __init__(
+        self, include: Sequence[str], exclude: Sequence[str], symlinks: str
+    ) -> None:
+        self.include = include
+        self.exclude = exclude
+        self.symlinks = symlinks
+
+    def scan(self, directory: _Directory) -> tuple[list[str], list[_Directory]]:
+        """Return the font files and the subdirectories to walk of directory."""
+        path, rel, _ = directory
+        fonts: list[str] = []
+        subdirs: list[_Directory] = []
+        try:
+            entries = os.scandir(path)
+        except OSError as e:
+            logger.debug(f"Cannot scan {path}: {e}")
+            return fonts, subdirs
+
+        with entries:
+            for entry in entries:
+                entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+                if self.exclude and _matches(self.exclude, entry.name, entry_rel):
+                    continue
+                try:
+                    link = entry.is_symlink()
+                    if link and self.symlinks == "skip":
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, entry_rel, self._key(entry)))
+                        continue
+                    if link and entry.is_dir():
+                        if self.symlinks == "follow":
+                            subdirs.append((entry.path, entry_rel, self._key(entry)))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue  # Dangling symlink or vanished entry
+                if entry.name.startswith(TEMP_PREFIX):
+                    continue
+                if self.include and not _matches(self.include, entry.name, entry_rel):
+                    continue
+                if is_font_file(entry.path):
+                    fonts.append(entry.path)
+        return fonts, subdirs
+
+    def _key(self, entry: os.DirEntry[str]) -> tuple[int, int] | None:
+        """Identity of a directory, to visit it once when following symlinks."""
+        if self.symlinks != "follow":
+            return None
+        st = entry.stat()
+        return (st.st_dev, st.st_ino)
+
+
+def discover_fonts(
+    directory: str | Path,
+    include: str | Iterable[str] | None = None,
+    exclude: str | Iterable[str] | None = None,
+    symlinks: str = DEFAULT_SYMLINKS,
+    jobs: int = 1,
+) -> list[Path]:
+    """Find font files in a directory tree by their signature.
+
+    Args:
+        directory: Directory to walk recursively
+        include: Patterns files must match (default: all files)
+        exclude: Patterns of files and directories to skip
+        symlinks: Symlink policy, one of SYMLINK_POLICIES
+        jobs: Threads scanning directories (0 = one per CPU core)
+
+    Returns:
+        Sorted font file paths
+
+    Raises:
+        ValueError: If the symlink policy is unknown
+    """
+    from fontnemo.batch import resolve_jobs
+
+    policy = parse_symlinks(symlinks)
+    scanner = _Scanner(parse_patterns(include), parse_patterns(exclude), policy)
+    root_key = None
+    if policy == "follow":
+        st = os.stat(directory)
+        root_key = (st.st_dev, st.st_ino)
+    visited = {root_key}
+    found: list[str] = []
+
+    def unvisited(subdirs: list[_Directory]) -> list[_Directory]:
+        new = []
+        for subdir in subdirs:
+            key = subdir[2]
+            if key is None or key not in visited:
+                visited.add(key)
+                new.append(subdir)
+        return new
+
+    pending: list[_Directory] = [(str(directory), "", root_key)]
+    workers = resolve_jobs(jobs)
+    if workers <= 1:
+        while pending:
+            fonts, subdirs = scanner.scan(pending.pop())
+            found.extend(fonts)
+            pending.extend(unvisited(subdirs))
+    else:
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="fontnemo-discover"
+        ) as pool:
+            running = {pool.submit(scanner.scan, d) for d in pending}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fonts, subdirs = future.result()
+                    found.extend(fonts)
+                    running.update(
+                        pool.submit(scanner.scan, d) for d in unvisited(subdirs)
+                    )
+
+    logger.debug(f"Directory {directory}: {len(found)} font(s)")
+    return sorted(Path(path) for path in found)
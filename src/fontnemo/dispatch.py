@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/dispatch.py
+"""Lightweight command-line dispatcher for the fixed set of fontnemo commands.
+
+Importing and running fire costs more than a typical ``view``. For the known
+commands, arguments are parsed here with fire-compatible syntax:
+
+- positional arguments fill positional parameters, then ``*args``
+- ``--name=value`` and ``--name value`` (hyphens may replace underscores)
+- boolean flags: ``--name``, ``--noname``, ``--name=False``
+- ``--verbose`` is accepted anywhere on the command line
+- hyphens in the command name match underscores (``apply-manifest``)
+
+Anything else (``--help``, unknown commands or flags, missing arguments)
+returns None so the caller can fall back to fire, which produces the usual
+help and error output.
+"""
+
+import inspect
+import typing
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from typing import Any
+
+# Values accepted for boolean flags given as --name=value
+TRUE_VALUES = frozenset({"true", "1", "yes"})
+FALSE_VALUES = frozenset({"false", "0", "no"})
+
+
+@dataclass
+class ParsedCommand:
+    """Result of parsing a command line for a known command."""
+
+    method: str
+    init_kwargs: dict[str, Any] = field(default_factory=dict)
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+def _param_type(param: inspect.Parameter) -> type:
+    """Return bool, int, float or str for a parameter's annotation/default."""
+    annotation = param.annotation
+    candidates = typing.get_args(annotation) or (annotation,)
+    if isinstance(param.default, bool) or bool in candidates:
+        return bool
+    for kind in (int, float):
+        if kind in candidates or type(param.default) is kind:
+            return kind
+    return str
+
+
+def _convert(value: str, param: inspect.Parameter) -> Any:
+    """Convert a command-line string to the parameter's type.
+
+    Raises:
+        ValueError: If the value cannot be converted
+    """
+    kind = _param_type(param)
+    if kind is bool:
+        lowered = value.lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean value: {value!r}")
+    if kind is str:
+        return value
+    return kind(value)
+
+
+def _flag_params(func: Any) -> tuple[list[inspect.Parameter], dict[str, Any]]:
+    """Split a callable's signature into positional params and named params."""
+    positional = []
+    named: dict[str, inspect.Parameter] = {}
+    for param in inspect.signature(func).parameters.values():
+        if param.name == "self":
+            continue
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            positional.append(param)
+        if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+            named[param.name] = param
+        if param.kind is param.VAR_POSITIONAL:
+            positional.append(param)
+    return positional, named
+
+
+def parse_command_line(
+    cls: type, commands: Collection[str], argv: list[str]
+) -> ParsedCommand | None:
+    """Parse argv for one of the known commands of a fire-style CLI class.
+
+    Args:
+        cls: CLI class; ``__init__`` params are global flags
+        commands: Method names that may be dispatched directly
+        argv: Command-line arguments (without program name)
+
+    Returns:
+        ParsedCommand, or None if the command line should be handled by fire
+    """
+    _, init_named = _flag_params(cls)  # The signature of cls is its __init__
+    words = [arg for arg in argv if not arg.startswith("--")]
+    # fire accepts hyphens in command names (apply-manifest)
+    method = words[0].replace("-", "_") if words else ""
+    if method not in commands:
+        return None
+
+    parsed = ParsedCommand(method=method)
+    positional, named = _flag_params(getattr(cls, parsed.method))
+    values: list[str] = []
+
+    command_seen = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+
+        if not arg.startswith("--") or arg == "-":
+            if arg.startswith("-") and arg != "-":
+                return None  # -h and other short options: leave to fire
+            if command_seen:
+                values.append(arg)
+            command_seen = True
+            continue
+
+        if arg == "--":
+            return None
+
+        name, has_value, value = arg[2:].partition("=")
+        name = name.replace("-", "_")
+        base_name = name[2:] if name.startswith("no") else name
+        target = named if name in named or base_name in named else init_named
+        target_kwargs = parsed.kwargs if target is named else parsed.init_kwargs
+
+        if name not in target and name.startswith("no") and name[2:] in target:
+            # --noflag form for booleans
+            param = target[name[2:]]
+            if _param_type(param) is not bool or has_value:
+                return None
+            target_kwargs[param.name] = False
+            continue
+
+        if name not in target:
+            return None
+        param = target[name]
+
+        if not has_value:
+            if _param_type(param) is bool:
+                value = "true"
+                # fire also accepts "--flag True"; never consume other words
+                next_arg = argv[i].lower() if i < len(argv) else ""
+                if next_arg in ("true", "false"):
+                    value = next_arg
+                    i += 1
+            elif i < len(argv):
+                value = argv[i]
+                i += 1
+            else:
+                return None
+
+        try:
+            target_kwargs[param.name] = _convert(value, param)
+        except ValueError:
+            return None
+
+    for param in positional:
+        if param.kind is param.VAR_POSITIONAL:
+            parsed.args.extend(_convert(v, param) for v in values)
+            values = []
+            break
+        if param.name in parsed.kwargs:
+            if values:
+                return None  # Ambiguous mix of flags and positionals
+            break
+        if not values:
+            break
+        try:
+            parsed.args.append(_convert(values.pop(0), param))
+        except ValueError:
+            return None
+    if values:
+        return None  # Surplus positional arguments
+
+    # Let fire report missing required arguments
+    for param in named.values():
+        provided = param.name in parsed.kwargs or (
+            param.kind is param.POSITIONAL_OR_KEYWORD
+            and positional.index(param) < len(parsed.args)
+        )
+        if param.default is param.empty and not provided:
+            return None
+
+    return parsed
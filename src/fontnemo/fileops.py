@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/fileops.py
+"""File operations for safe writes: temp files, durability, zero-copy backups.
+
+Fonts are written to a temp file in the output directory and renamed over
+the output (TempFile). On Linux the temp file is created with ``O_TMPFILE``:
+it has no name until it is linked into place with ``linkat``, so a crash or
+a kill never leaves a ``.fontnemo_tmp_*`` file behind. Elsewhere (or on
+filesystems without ``O_TMPFILE``) a named temp file is used, as before.
+
+Durability levels (``--durability``):
+
+- ``none``: no fsync; the OS writes the data back when it likes. A crash
+  shortly after a save may leave the old or an empty/partial font. Only
+  this level patches a name table into the input file in place.
+- ``file``: each written file is fsynced before it is renamed into place,
+  so the output holds either the old or the new font, complete. Fonts are
+  never patched in place, since a crash during a patch could leave a mix
+  of both.
+- ``full``: as ``file``, and the output directory is fsynced after the
+  rename, so the rename itself survives a crash. Batch runs sync each
+  output directory once at the end instead of once per font.
+
+A backup in output mode "1" keeps the original font under a ``--TIMESTAMP``
+name while the renamed font replaces it. The original file is about to be
+replaced anyway, so the cheapest backup is a second name for its inode (a
+hard link): no data is copied and the backup takes no extra space. Where
+hard links are not supported the file is copied with the cheapest primitive
+available:
+
+1. ``FICLONE`` reflink (Btrfs, XFS, bcachefs; Linux): shares the data
+   blocks copy-on-write
+2. ``os.copy_file_range`` (Linux): copies inside the kernel, and is itself
+   a server-side or reflink copy on many filesystems
+3. ``shutil.copyfile``: a streamed copy (via ``sendfile`` where available),
+   never holding the whole font in memory
+"""
+
+import os
+import shutil
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO, Final
+
+from fontnemo.log import logger
+
+DURABILITY_LEVELS: Final[tuple[str, ...]] = ("none", "file", "full")
+DEFAULT_DURABILITY: Final[str] = "none"
+
+# Name prefix of (named) temp files next to the output
+TEMP_PREFIX: Final[str] = ".fontnemo_tmp_"
+
+# Permissions of new temp files (as tempfile.mkstemp)
+TEMP_MODE: Final[int] = 0o600
+
+# ioctl number of FICLONE (linux/fs.h: _IOW(0x94, 9, int))
+FICLONE: Final[int] = 0x40049409
+
+# Bytes per copy_file_range call (the kernel caps a single call anyway)
+COPY_CHUNK: Final[int] = 1 << 30
+
+# Values returned by backup_file / clone_file
+BACKUP_METHODS: Final[tuple[str, ...]] = ("link", "reflink", "copy_range", "copy")
+
+
+def backup_file(path: str | Path, backup_path: str | Path, sync: bool = False) -> str:
+    """Keep the current contents of path under backup_path.
+
+    Intended for files that are about to be replaced by a rename (not
+    modified in place): a hard link then preserves the original contents at
+    no cost. An existing backup_path is replaced (backups made within the
+    same second share a name).
+
+    Args:
+        path: File to back up
+        backup_path: New name for the backup, in the same filesystem
+        sync: fsync a copied backup (a link shares the original's data)
+
+    Returns:
+        Method used, one of BACKUP_METHODS
+
+    Raises:
+        OSError: If no method could create the backup
+    """
+    if os.path.lexists(backup_path):
+        # Never write through it: it may be a link to another file
+        os.unlink(backup_path)
+    try:
+        os.link(path, backup_path)
+        return "link"
+    except OSError as e:
+        # FAT/exFAT, some network filesystems, or hard links not permitted
+        logger.debug(f"Hard link backup failed ({e}); copying")
+    return clone_file(path, backup_path, sync)
+
+
+def clone_file(src: str | Path, dst: str | Path, sync: bool = False) -> str:
+    """Copy src to a new file dst with the cheapest available primitive.
+
+    Permission bits and timestamps are copied as well; with sync, the copy
+    is fsynced.
+
+    Returns:
+        Method used: "reflink", "copy_range" or "copy"
+
+    Raises:
+        OSError: If the copy fails
+    """
+    method = "copy"
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            if _reflink(fsrc.fileno(), fdst.fileno()):
+                method = "reflink"
+            elif _copy_range(fsrc.fileno(), fdst.fileno()):
+                method = "copy_range"
+            else:
+                shutil.copyfileobj(fsrc, fdst)
+            if sync:
+                fdst.flush()
+                os.fsync(fdst.fileno())
+        except BaseException:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    if method == "copy":
+        logger.debug("Streamed copy (no reflink or copy_file_range)")
+    shutil.copystat(src, dst)
+    return method
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone src_fd into dst_fd with FICLONE; False if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError:
+        # EOPNOTSUPP/EINVAL (no reflink support), EXDEV, ...
+        return False
+    return True
+
+
+def _copy_range(src_fd: int, dst_fd: int) -> bool:
+    """Copy src_fd to dst_fd with os.copy_file_range; False if unsupported.
+
+    Nothing has been written when False is returned.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+    copied = 0
+    while True:
+        try:
+            count = copy_file_range(src_fd, dst_fd, COPY_CHUNK)
+        except OSError:
+            if copied:
+                raise
+            # ENOSYS, EXDEV (older kernels), EINVAL on some filesystems
+            return False
+        if count == 0:
+            return True
+        copied += count
+
+
+def parse_durability(durability: str | None) -> str:
+    """Validate a durability level (None means DEFAULT_DURABILITY).
+
+    Raises:
+        ValueError: If durability is not one of DURABILITY_LEVELS
+    """
+    if not durability:
+        return DEFAULT_DURABILITY
+    level = str(durability).strip().lower()
+    if level not in DURABILITY_LEVELS:
+        raise ValueError(
+            f"Unknown durability {durability!r}; use one of "
+            + ", ".join(DURABILITY_LEVELS)
+        )
+    return level
+
+
+def batch_durability(durability: str) -> str:
+    """Durability for each font of a batch whose directories are synced later.
+
+    With "full", fonts are only fsynced individually ("file"); the caller
+    then syncs every output directory once (sync_directories).
+    """
+    return "file" if durability == "full" else durability
+
+
+def fsync_path(path: str | Path) -> None:
+    """Flush a file's data to disk (e.g. after it was patched in place)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_directory(directory: str | Path) -> None:
+    """Flush a directory's entries (renames, links) to disk.
+
+    Directories cannot be opened for fsync on Windows; nothing is done there.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_directories(directories: Iterable[str | Path]) -> int:
+    """Sync each distinct directory once; return the number synced."""
+    unique = {os.path.abspath(directory) for directory in directories}
+    for directory in sorted(unique):
+        sync_directory(directory)
+    return len(unique)
+
+
+# Cleared when linking an unnamed temp file fails, to stop trying
+_anonymous_supported = True
+
+
+def _open_anonymous(directory: Path) -> int | None:
+    """Open an unnamed O_TMPFILE file in directory, or None if unsupported."""
+    flag = getattr(os, "O_TMPFILE", None)
+    # Linking the file needs /proc/self/fd (linkat with AT_SYMLINK_FOLLOW)
+    if flag is None or not _anonymous_supported or not os.path.isdir("/proc/self/fd"):
+        return None
+    try:
+        # Readable too, so the data can still be copied if linking fails
+        return os.open(directory, flag | os.O_RDWR, TEMP_MODE)
+    except OSError:
+        # EOPNOTSUPP (filesystem), EISDIR/EINVAL (old kernels)
+        return None
+
+
+class TempFile:
+    """Temp file in an output directory, renamed over the output when done.
+
+    Unnamed (O_TMPFILE) where supported, else a named ``.fontnemo_tmp_*``
+    file. ``path`` is None for an unnamed file.
+    """
+
+    def __init__(self, directory: str | Path, suffix: str = "") -> None:
+        """Create the temp file.
+
+        Args:
+            directory: Output directory (the same filesystem as the output)
+            suffix: Extension of named temp files, e.g. ".ttf"
+
+        Raises:
+            OSError: If no temp file can be created
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.path: Path | None = None
+        fd = _open_anonymous(self.directory)
+        if fd is None:
+            import tempfile
+
+            fd, name = tempfile.mkstemp(
+                suffix=suffix, prefix=TEMP_PREFIX, dir=self.directory
+            )
+            self.path = Path(name)
+        self.file: BinaryIO = os.fdopen(fd, "wb")
+
+    def size(self) -> int:
+        """Return the number of bytes written so far."""
+        self.file.flush()
+        return os.fstat(self.file.fileno()).st_size
+
+    def sync(self) -> None:
+        """Flush the written data to disk."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def commit(self, final_path: str | Path) -> None:
+        """Atomically put the file at final_path (replacing an existing file)."""
+        final_path = Path(final_path)
+        self.file.flush()
+        try:
+            if self.path is None:
+                self._link(final_path)
+            else:
+                self.file.close()
+                os.replace(self.path, final_path)
+                self.path = None
+        finally:
+            self.file.close()
+
+    def _link(self, final_path: Path) -> None:
+        """Give the unnamed file its name."""
+        # A directory fd makes os.link call linkat(), which follows the
+        # /proc symlink to the file (plain link() would link the symlink)
+        dir_fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            name = self._link_unnamed(final_path.name, dir_fd)
+            if name is None:
+                return
+            try:
+                os.replace(name, final_path.name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            except BaseException:
+                os.unlink(name, dir_fd=dir_fd)
+                raise
+        finally:
+            os.close(dir_fd)
+
+    def _link_unnamed(self, final_name: str, dir_fd: int) -> str | None:
+        """Link the unnamed file as final_name if that is free (returns None).
+
+        Otherwise link it under a temp name, or copy it to a named temp file
+        if it cannot be linked, and return that name for a rename.
+        """
+        global _anonymous_supported
+        import secrets
+
+        source = f"/proc/self/fd/{self.file.fileno()}"
+        try:
+            try:
+                # New output (modes "2", new paths): link it under its name
+                os.link(source, final_name, dst_dir_fd=dir_fd)
+                return None
+            except FileExistsError:
+                pass
+            # linkat cannot replace a file: link to a temp name, then rename
+            name = f"{TEMP_PREFIX}{secrets.token_hex(4)}{self.suffix}"
+            os.link(source, name, dst_dir_fd=dir_fd)
+            return name
+        except OSError as e:
+            logger.debug(f"Cannot link unnamed temp file ({e}); copying")
+            _anonymous_supported = False
+            return self._copy_named()
+
+    def _copy_named(self) -> str:
+        """Copy the unnamed file's data to a named temp file; return its name."""
+        import tempfile
+
+        fd = self.file.fileno()
+        out_fd, path = tempfile.mkstemp(
+            suffix=self.suffix, prefix=TEMP_PREFIX, dir=self.directory
+        )
+        with os.fdopen(out_fd, "wb") as out:
+            offset = 0
+            while chunk := os.pread(fd, 1 << 20, offset):
+                out.write(chunk)
+                offset += len(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        return os.path.basename(path)
+
+    def discard(self) -> None:
+        """Close and remove the temp file (unnamed files vanish on close)."""
+        self.file.close()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
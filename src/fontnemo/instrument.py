@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/instrument.py
+"""Per-phase timing, I/O and memory instrumentation (``--profile``).
+
+Instrumented code wraps its phases in ``with phase("name"):``. While no
+profile is active (the default) this is a shared no-op context manager, so
+the instrumentation costs next to nothing. Inside ``profiling()`` each phase
+records its wall time, excluding the time of phases nested in it, so the
+phase times of a font add up to (about) its total time:
+
+- ``open``: opening the font and indexing its name records (lightweight
+  reader, no fontTools)
+- ``parse``: loading the TTFont (table directory)
+- ``decode``: decompiling the fontTools name table
+- ``transform``: computing and writing the new names
+- ``compile``: compiling the name table (or a whole sfnt)
+- ``encode``: WOFF/WOFF2 encoding of extra output formats
+- ``write``: writing the temp file, or patching the input in place
+- ``sync``: fsyncing files and directories (``--durability``)
+- ``backup``: copying the original (output mode "1")
+- ``replace``: the atomic rename of the temp file
+- ``verify``: re-reading the written file(s)
+
+Bytes read count the font files opened (input, backup source, verified
+outputs); bytes written count the files written. Peak memory is the
+process's maximum resident set size, plus the peak of traced Python
+allocations when tracemalloc is tracing (e.g. ``PYTHONTRACEMALLOC=1``).
+The first font of each process also pays for importing fontTools (mostly
+in ``decode`` and ``transform``).
+
+If ``FONTNEMO_PROFILE_DUMP`` names a directory, each profiled font is also
+run under cProfile and its stats are dumped there (``NAME.HASH.prof``, for
+``python -m pstats`` or snakeviz).
+"""
+
+import _thread
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final
+
+# Directory receiving one cProfile dump per profiled font
+PROFILE_DUMP_ENV: Final[str] = "FONTNEMO_PROFILE_DUMP"
+
+# Phase names in the order they usually occur (for summaries)
+PHASES: Final[tuple[str, ...]] = (
+    "open",
+    "parse",
+    "decode",
+    "transform",
+    "compile",
+    "encode",
+    "write",
+    "sync",
+    "backup",
+    "replace",
+    "verify",
+)
+
+
+class FontProfile:
+    """Measurements of one profiled font."""
+
+    def __init__(self, label: str) -> None:
+        """Start an empty profile.
+
+        Args:
+            label: Font path (or other name) reported with the profile
+        """
+        self.label = label
+        self.phases: dict[str, list[float]] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+        self._lock = _thread.allocate_lock()
+        # Per-thread stacks of [start, nested seconds] (formats encode in threads)
+        self._stacks: dict[int, list[list[float]]] = {}
+
+    def _enter(self) -> None:
+        stack = self._stacks.setdefault(_thread.get_ident(), [])
+        stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        stack = self._stacks[_thread.get_ident()]
+        start, nested = stack.pop()
+        elapsed = time.perf_counter() - start
+        if stack:
+            stack[-1][1] += elapsed
+        with self._lock:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += elapsed - nested
+            entry[1] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the profile as a JSON-serializable record."""
+        return {
+            "path": self.label,
+            "seconds": round(self.seconds, 6),
+            "phases": {
+                name: {"seconds": round(seconds, 6), "calls": int(calls)}
+                for name, (seconds, calls) in _ordered(self.phases)
+            },
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            **peak_memory(),
+        }
+
+
+class _Phase:
+    """Context manager timing one phase of the active profile."""
+
+    __slots__ = ("name", "profile")
+
+    def __init__(self, name: str, profile: FontProfile) -> None:
+        self.name = name
+        self.profile = profile
+
+    def __enter__(self) -> None:
+        self.profile._enter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.profile._exit(self.name)
+
+
+class _NoPhase:
+    """Shared context manager used while no profile is active."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NO_PHASE: Final[_NoPhase] = _NoPhase()
+
+# Profile of the font being processed in this process (None: not profiling)
+_active: FontProfile | None = None
+
+
+def phase(name: str) -> _Phase | _NoPhase:
+    """Return a context manager timing a phase of the active profile."""
+    if _active is None:
+        return _NO_PHASE
+    return _Phase(name, _active)
+
+
+def count_read(size: int | str | Path) -> None:
+    """Add bytes read to the active profile (a path counts its file size)."""
+    if _active is not None:
+        _active.bytes_read += _size(size)
+
+
+def count_written(size: int | str | Path) -> None:
+    """Add bytes written to the active profile (a path counts its file size)."""
+    if _active is not None:
+        _active.bytes_written += _size(size)
+
+
+def _size(size: int | str | Path) -> int:
+    if isinstance(size, int):
+        return size
+    try:
+        return os.stat(size).st_size
+    except OSError:
+        return 0
+
+
+def peak_memory() -> dict[str, int]:
+    """Return the process's peak memory use in bytes.
+
+    ``peak_rss`` is the maximum resident set size of the process so far (not
+    available on Windows); ``peak_traced`` the peak of Python allocations
+    since the last profile started, if tracemalloc is tracing.
+    """
+    peaks: dict[str, int] = {}
+    try:
+        import resource
+    except ImportError:
+        pass
+    else:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        peaks["peak_rss"] = rss if sys.platform == "darwin" else rss * 1024
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        peaks["peak_traced"] = tracemalloc.get_traced_memory()[1]
+    return peaks
+
+
+@contextmanager
+def profiling(label: str | Path, enabled: bool = True) -> Iterator[FontProfile | None]:
+    """Profile the code run inside ``with profiling(label) as profile:``.
+
+    Yields None (and measures nothing) when not enabled. Profiles do not
+    nest: an outer profile keeps collecting.
+
+    Args:
+        label: Font path reported with the profile
+        enabled: Whether to profile at all
+    """
+    global _active
+    if not enabled or _active is not None:
+        yield None
+        return
+
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    profiler = None
+    if os.environ.get(PROFILE_DUMP_ENV):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    profile = _active = FontProfile(str(label))
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.seconds = time.perf_counter() - start
+        _active = None
+        if profiler is not None:
+            profiler.disable()
+            _dump_stats(profiler, Path(label))
+
+
+def _dump_stats(profiler: Any, path: Path) -> None:
+    """Write cProfile stats for a font to the PROFILE_DUMP_ENV directory."""
+    import hashlib
+
+    directory = Path(os.environ[PROFILE_DUMP_ENV])
+    directory.mkdir(parents=True, exist_ok=True)
+    # Fonts of the same name in other directories get their own dumps
+    tag = hashlib.sha1(str(path.absolute()).encode()).hexdigest()[:8]
+    profiler.dump_stats(str(directory / f"{path.name}.{tag}.prof"))
+
+
+def _ordered(phases: dict[str, Any]) -> list[tuple[str, Any]]:
+    """Return phase items in PHASES order, unknown phases last."""
+    order = {name: i for i, name in enumerate(PHASES)}
+    return sorted(phases.items(), key=lambda item: order.get(item[0], len(order)))
+
+
+def aggregate(profiles: list[dict[str, Any]]) -> dict[str, Any]:
+    """Sum the per-font profile records of a batch.
+
+    Peak memory is the maximum over the fonts (of each worker process).
+
+    Returns:
+        Record with the number of fonts, total seconds, per-phase totals,
+        total bytes and peak memory
+    """
+    phases: dict[str, list[float]] = {}
+    total: dict[str, Any] = {"fonts": len(profiles), "seconds": 0.0}
+    peaks: dict[str, int] = {}
+    bytes_read = bytes_written = 0
+    for profile in profiles:
+        total["seconds"] += profile["seconds"]
+        bytes_read += profile["bytes_read"]
+        bytes_written += profile["bytes_written"]
+        for name, stats in profile["phases"].items():
+            entry = phases.setdefault(name, [0.0, 0])
+            entry[0] += stats["seconds"]
+            entry[1] += stats["calls"]
+        for key in ("peak_rss", "peak_traced"):
+            if key in profile:
+                peaks[key] = max(peaks.get(key, 0), profile[key])
+    total["seconds"] = round(total["seconds"], 6)
+    total["phases"] = {
+        name: {"seconds": round(seconds, 6), "calls": int(calls)}
+        for name, (seconds, calls) in _ordered(phases)
+    }
+    total["bytes_read"] = bytes_read
+    total["bytes_written"] = bytes_written
+    return total | peaks
+
+
+def format_summary(total: dict[str, Any]) -> str:
+    """Format an aggregate() record as a table for the terminal."""
+    seconds = total["seconds"] or 1e-9
+    lines = [f"Profile: {total['fonts']} font(s), {total['seconds'] * 1000:.1f} ms"]
+    for name, stats in total["phases"].items():
+        lines.append(
+            f"  {name:10} {stats['seconds'] * 1000:10.1f} ms"
+            f" {stats['seconds'] / seconds:6.1%} {stats['calls']:6d} call(s)"
+        )
+    lines.append(f"  {'read':10} {total['bytes_read']:13,} bytes")
+    lines.append(f"  {'written':10} {total['bytes_written']:13,} bytes")
+    for key, label in (("peak_rss", "peak RSS"), ("peak_traced", "peak traced")):
+        if key in total:
+            lines.append(f"  {label:11} {total[key] / 2**20:9.1f} MiB")
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/log.py
+"""Lazily initialized loguru logger.
+
+Importing loguru and setting up its sinks costs more than a whole ``view``
+command, so modules log through this proxy instead. loguru is imported the
+first time a message passes the configured level; messages below it are
+dropped without touching loguru at all.
+"""
+
+import sys
+from typing import Any, Final
+
+# loguru severity numbers for the levels used by fontnemo
+LEVELS: Final[dict[str, int]] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+
+class LazyLogger:
+    """Proxy for ``loguru.logger`` that defers import and sink setup."""
+
+    def __init__(self) -> None:
+        """Create an unconfigured proxy (loguru defaults apply)."""
+        self._logger: Any = None
+        self._level: str | None = None
+        self._sink_ready = True
+
+    def configure(self, level: str) -> None:
+        """Set the minimum level; the stderr sink is added on first use.
+
+        Args:
+            level: Minimum level name, e.g. "DEBUG" or "WARNING"
+        """
+        self._level = level
+        self._sink_ready = False
+
+    def enabled(self, level: str) -> bool:
+        """Return True if messages at level would be emitted."""
+        if self._level is None:
+            return True
+        return LEVELS[level] >= LEVELS[self._level]
+
+    def _get(self) -> Any:
+        """Import loguru and install the configured sink if needed."""
+        if self._logger is None:
+            from loguru import logger
+
+            self._logger = logger
+        if not self._sink_ready:
+            self._logger.remove()  # Remove default handler
+            self._logger.add(sys.stderr, level=self._level)
+            self._sink_ready = True
+        return self._logger
+
+    def _log(self, level: str, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.enabled(level):
+            # depth=2 attributes the record to the caller, not this proxy
+            self._get().opt(depth=2).log(level, message, *args, **kwargs)
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a DEBUG message."""
+        self._log("DEBUG", message, *args, **kwargs)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log an INFO message."""
+        self._log("INFO", message, *args, **kwargs)
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a WARNING message."""
+        self._log("WARNING", message, *args, **kwargs)
+
+    def error(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log an ERROR message."""
+        self._log("ERROR", message, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward anything else (opt, add, remove, ...) to loguru."""
+        return getattr(self._get(), name)
+
+
+logger = LazyLogger()
+
+
+def configure_logging(verbose: bool = False) -> None:
+    """Configure logging on stderr (also used to set up pool workers).
+
+    Args:
+        verbose: Enable debug logging
+    """
+    logger.configure("DEBUG" if verbose else "WARNING")
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/manifest.py
+"""Manifest-driven bulk renames with JSONL results (``apply-manifest``).
+
+A manifest lists one rename per row, as CSV (with a header row) or JSONL:
+
+- ``path``: font file (relative paths are relative to the working directory)
+- ``operation``: new, replace, suffix, prefix, timestamp (or n/r/s/p/t), or
+  chain with a ``steps`` argument (see operations.parse_steps)
+- ``output_path``: output mode or path (default: "0")
+- ``face``/``formats``: as the CLI options (optional)
+- operation arguments: an ``args`` object (JSONL) or JSON string (CSV), or
+  one field per argument, e.g. ``new_family``, ``suffix``
+
+Each row is run through operations.rename_font; results are written as one
+JSON object per row, in manifest order.
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Final, TextIO
+
+from fontnemo.batch import run_batch
+from fontnemo.cache import RenameCache, run_with_cache
+from fontnemo.core import parse_faces, parse_formats
+from fontnemo.fileops import DEFAULT_DURABILITY, batch_durability, sync_directories
+from fontnemo.operations import (
+    RenameResult,
+    coerce_params,
+    operation_name,
+    plan_rename,
+    rename_font,
+    resolve_params,
+)
+from fontnemo.utils import make_timestamp
+
+# Manifest fields that are not operation arguments
+RESERVED_FIELDS: Final[frozenset[str]] = frozenset(
+    {"path", "operation", "output_path", "face", "formats", "args"}
+)
+
+
+@dataclass
+class ManifestEntry:
+    """One manifest row, parsed; ``error`` is set if the row is invalid."""
+
+    line: int
+    path: str
+    operation: str = ""
+    params: dict[str, Any] = field(default_factory=dict)
+    output_path: str = "0"
+    faces: list[int] | None = None
+    formats: list[str] | None = None
+    error: str | None = None
+
+
+def parse_entry(line: int, row: dict[str, Any], timestamp: str) -> ManifestEntry:
+    """Parse one manifest row; errors are stored in the entry, not raised.
+
+    Args:
+        line: Line number of the row in the manifest (for reporting)
+        row: Field values (CSV cells are strings, JSONL values may be typed)
+        timestamp: Timestamp used by every ``timestamp`` row of a run
+
+    Returns:
+        ManifestEntry
+    """
+    entry = ManifestEntry(line=line, path=str(row.get("path") or ""))
+    try:
+        if not entry.path:
+            raise ValueError("Missing path")
+        entry.operation = operation_name(row.get("operation") or "")
+
+        raw = row.get("args") or {}
+        if isinstance(raw, str):
+            raw = json.loads(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("args must be an object")
+        raw = dict(raw)
+        for key, value in row.items():
+            # Empty CSV cells mean "not given"
+            if key not in RESERVED_FIELDS and value not in (None, ""):
+                raw[key] = value
+        if entry.operation == "chain":
+            entry.params = resolve_params("chain", raw, timestamp)
+        else:
+            entry.params = coerce_params(entry.operation, raw)
+            if entry.operation == "timestamp":
+                entry.params.setdefault("timestamp", timestamp)
+
+        entry.output_path = str(row.get("output_path") or "0")
+        entry.faces = parse_faces(row.get("face"))
+        entry.formats = parse_formats(row.get("formats"))
+    except (ValueError, TypeError) as e:
+        entry.error = str(e)
+    return entry
+
+
+def _rows(
+    text: str, fmt: str
+) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yield (line number, row, error) for each manifest row.
+
+    A row that cannot be parsed is yielded as None with an error message.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            # Header padding is common in hand-edited spreadsheets; cell
+            # values are kept as they are (a suffix may start with a space)
+            cells = {k.strip(): v for k, v in row.items() if k}
+            yield reader.line_num, cells, None
+        return
+
+    for line, content in enumerate(text.splitlines(), start=1):
+        if not content.strip():
+            continue
+        try:
+            row = json.loads(content)
+        except json.JSONDecodeError as e:
+            yield line, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line, None, "Row must be a JSON object"
+            continue
+        yield line, row, None
+
+
+def read_manifest(manifest: str | Path) -> list[ManifestEntry]:
+    """Read and parse a CSV or JSONL manifest ("-" reads stdin).
+
+    The format follows the extension (.csv; .jsonl, .ndjson, .json), else it
+    is sniffed: JSONL rows start with ``{``.
+
+    Args:
+        manifest: Manifest file path, or "-"
+
+    Returns:
+        Entries in manifest order (invalid rows carry an error)
+
+    Raises:
+        OSError: If the manifest cannot be read
+    """
+    if str(manifest) == "-":
+        text = sys.stdin.read()
+        suffix = ""
+    else:
+        text = Path(manifest).read_text(encoding="utf-8-sig")
+        suffix = Path(manifest).suffix.lower()
+
+    if suffix == ".csv":
+        fmt = "csv"
+    elif suffix in (".jsonl", ".ndjson", ".json"):
+        fmt = "jsonl"
+    else:
+        fmt = "jsonl" if text.lstrip().startswith("{") else "csv"
+
+    timestamp = make_timestamp()
+    entries = []
+    for line, row, error in _rows(text, fmt):
+        if row is None:
+            entries.append(ManifestEntry(line=line, path="", error=error))
+        else:
+            entries.append(parse_entry(line, row, timestamp))
+    return entries
+
+
+def run_entry(
+    entry: ManifestEntry,
+    verify: bool = False,
+    dry_run: bool = False,
+    profile: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> dict[str, Any]:
+    """Run one manifest entry and return its JSON-serializable result.
+
+    Module-level so it can be used as a process-pool worker.
+
+    Args:
+        entry: Parsed manifest entry
+        verify: Re-check the written file(s)
+        dry_run: Only plan the rename (operations.plan_rename)
+        profile: Add the rename's per-phase profile (see fontnemo.instrument)
+        durability: How much to fsync (see fontnemo.fileops)
+
+    Returns:
+        Result record (see ``apply-manifest``)
+    """
+    start = time.perf_counter()
+    result = None
+    if entry.error is None and dry_run:
+        result = plan_rename(
+            entry.path,
+            entry.operation,
+            entry.params,
+            entry.output_path,
+            entry.faces,
+            entry.formats,
+        )
+    elif entry.error is None:
+        result = rename_font(
+            entry.path,
+            entry.operation,
+            entry.params,
+            entry.output_path,
+            verify,
+            entry.faces,
+            entry.formats,
+            profile,
+            durability,
+        )
+    return make_record(entry, result, time.perf_counter() - start)
+
+
+def make_record(
+    entry: ManifestEntry, result: RenameResult | None, seconds: float
+) -> dict[str, Any]:
+    """Build the result record of an entry (result is None if it did not run)."""
+    record: dict[str, Any] = {
+        "line": entry.line,
+        "path": entry.path,
+        "operation": entry.operation,
+        "family_name": None,
+        "family_slug": None,
+        "new_family_name": None,
+        "new_family_slug": None,
+        "output_path": None,
+    }
+    error = entry.error
+    if result is not None:
+        error = result.error
+        record.update(
+            family_name=result.family_name,
+            family_slug=result.family_slug,
+            new_family_name=result.new_family_name,
+            new_family_slug=result.new_family_slug,
+            output_path=str(result.output_path) if result.output_path else None,
+        )
+        if result.output_paths:
+            record["output_paths"] = [str(p) for p in result.output_paths]
+        if result.faces is not None:
+            record["faces"] = [list(item) for item in result.faces]
+    if result is not None and result.changes is not None:
+        record["changes"] = [asdict(change) for change in result.changes]
+    if result is not None and result.profile is not None:
+        record["profile"] = result.profile
+    record["seconds"] = round(seconds, 6)
+    record["cached"] = result is not None and result.cached
+    record["ok"] = error is None
+    record["error"] = error
+    return record
+
+
+def _entry_key(entry: ManifestEntry) -> tuple[Any, ...]:
+    """Cache key arguments of an entry (see RenameCache.lookup)."""
+    return (
+        entry.operation,
+        entry.params,
+        entry.output_path,
+        entry.faces,
+        entry.formats,
+    )
+
+
+def apply_manifest(
+    entries: list[ManifestEntry],
+    out: TextIO,
+    jobs: int | None = 0,
+    verify: bool = False,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple[Any, ...] = (),
+    cache: RenameCache | None = None,
+    dry_run: bool = False,
+    profiles: list[dict[str, Any]] | None = None,
+    durability: str = DEFAULT_DURABILITY,
+) -> int:
+    """Run manifest entries in parallel, streaming JSONL results to out.
+
+    Args:
+        entries: Parsed manifest entries
+        out: Text stream receiving one JSON object per entry, in order
+        jobs: Number of worker processes (0 = all cores)
+        verify: Re-check written files
+        initializer: Optional per-process setup (e.g. logging)
+        initargs: Arguments for initializer
+        cache: Skip entries whose recorded outputs are up to date, and
+            record the others (see fontnemo.cache)
+        dry_run: Plan the renames and report their name record changes
+            instead of writing (the cache is not used)
+        profiles: Profile each rename that runs: its record gets a
+            ``profile`` (see fontnemo.instrument), which is also appended
+            to this list
+        durability: "none", "file" or "full" (see fontnemo.fileops); with
+            "full", each output directory is synced once after all rows
+
+    Returns:
+        Number of failed entries
+    """
+    if dry_run:
+        cache = None
+
+    def lookup(entry: ManifestEntry) -> dict[str, Any] | None:
+        if cache is None or entry.error is not None:
+            return None
+        start = time.perf_counter()
+        result = cache.lookup(entry.path, *_entry_key(entry))
+        if result is None:
+            return None
+        return make_record(entry, result, time.perf_counter() - start)
+
+    # Rows only sync their files; directories are synced once at the end
+    row_durability = batch_durability(durability)
+
+    def run(todo: list[ManifestEntry]) -> Iterator[dict[str, Any]]:
+        return run_batch(
+            run_entry,
+            todo,
+            verify,
+            dry_run,
+            profiles is not None,
+            row_durability,
+            jobs=jobs,
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    def record(entry: ManifestEntry, result: dict[str, Any]) -> None:
+        if cache is not None and result["ok"]:
+            cache.record(_as_result(entry, result), *_entry_key(entry))
+
+    failed = 0
+    directories: set[Path] = set()
+    for result in run_with_cache(cache, entries, lookup, run, record):
+        failed += not result["ok"]
+        if profiles is not None and "profile" in result:
+            profiles.append(result["profile"])
+        if result["ok"] and not result["cached"] and not dry_run:
+            outputs = result.get("output_paths") or [result["output_path"]]
+            directories.update(Path(path).parent for path in outputs)
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+    if durability != row_durability:
+        sync_directories(directories)
+    return failed
+
+
+def _as_result(entry: ManifestEntry, record: dict[str, Any]) -> RenameResult:
+    """Rebuild the RenameResult of a record returned by a worker."""
+    output_paths = record.get("output_paths")
+    faces = record.get("faces")
+    return RenameResult(
+        input_path=Path(entry.path),
+        output_path=Path(record["output_path"]),
+        family_name=record["family_name"],
+        family_slug=record["family_slug"],
+        new_family_name=record["new_family_name"],
+        new_family_slug=record["new_family_slug"],
+        faces=[(face, name) for face, name in faces] if faces else None,
+        output_paths=[Path(p) for p in output_paths] if output_paths else None,
+    )
@@ -0,0 +1,771 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/operations.py
+"""Rename operations shared by the CLI commands and batch runs."""
+
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Final
+
+from fontnemo.core import (
+    FORMAT_ENCODERS,
+    FontCollectionHandler,
+    FontData,
+    FontNameHandler,
+    NameChange,
+    data_format,
+    open_font_handler,
+    parse_formats,
+    plan_output_paths,
+    read_font_data,
+    save_font_formats,
+    save_font_safely,
+    verify_font_data,
+    verify_saved_font,
+)
+from fontnemo.fileops import DEFAULT_DURABILITY
+from fontnemo.instrument import phase, profiling
+from fontnemo.log import logger
+from fontnemo.sfnt import is_collection
+from fontnemo.utils import make_slug, make_timestamp
+
+if TYPE_CHECKING:
+    from fontTools.ttLib import TTFont  # type: ignore[import-untyped]
+
+# Default timestamp separator and the marker stripped from slugs on re-stamp
+TIMESTAMP_SEPARATOR: Final[str] = " tX"
+TIMESTAMP_SLUG_MARKER: Final[str] = "tX"
+
+# Input path / output mode meaning stdin / stdout
+STDIO_PATH: Final[str] = "-"
+
+
+def transform_new(
+    family_name: str, family_slug: str, new_family: str
+) -> tuple[str, str]:
+    """Replace family name entirely; slug is derived from the new name."""
+    return new_family, make_slug(new_family)
+
+
+def transform_replace(
+    family_name: str, family_slug: str, find: str, replace: str
+) -> tuple[str, str]:
+    """Find and replace in family name, and slug-converted in family slug."""
+    new_family_name = family_name.replace(find, replace)
+    new_family_slug = family_slug.replace(make_slug(find), make_slug(replace))
+    return new_family_name, new_family_slug
+
+
+def transform_suffix(
+    family_name: str, family_slug: str, suffix: str
+) -> tuple[str, str]:
+    """Append suffix to family name and slug-converted suffix to slug."""
+    return family_name + suffix, family_slug + make_slug(suffix)
+
+
+def transform_prefix(
+    family_name: str, family_slug: str, prefix: str
+) -> tuple[str, str]:
+    """Prepend prefix to family name and slug-converted prefix to slug."""
+    return prefix + family_name, make_slug(prefix) + family_slug
+
+
+def transform_timestamp(
+    family_name: str,
+    family_slug: str,
+    separator: str = TIMESTAMP_SEPARATOR,
+    replace_timestamp: bool = True,
+    timestamp: str | None = None,
+) -> tuple[str, str]:
+    """Append separator + timestamp, optionally replacing an old timestamp.
+
+    Args:
+        family_name: Current family name
+        family_slug: Current family slug
+        separator: Separator before timestamp
+        replace_timestamp: Remove old timestamp first (default separator only)
+        timestamp: Timestamp to use; generated with TIME_RULE if None
+    """
+    if replace_timestamp and separator == TIMESTAMP_SEPARATOR:
+        # Remove " tX" and everything after from family name
+        if TIMESTAMP_SEPARATOR in family_name:
+            family_name = family_name.split(TIMESTAMP_SEPARATOR)[0]
+
+        # Remove "tX" and everything after from family slug
+        if TIMESTAMP_SLUG_MARKER in family_slug:
+            family_slug = family_slug.split(TIMESTAMP_SLUG_MARKER)[0]
+
+    suffix_str = separator + (timestamp or make_timestamp())
+    return family_name + suffix_str, family_slug + make_slug(suffix_str)
+
+
+def transform_chain(
+    family_name: str, family_slug: str, steps: list[tuple[str, dict[str, Any]]]
+) -> tuple[str, str]:
+    """Apply several transforms in order; each sees the previous result.
+
+    Args:
+        family_name: Current family name
+        family_slug: Current family slug
+        steps: (operation, params) pairs, see parse_steps
+    """
+    for operation, params in steps:
+        family_name, family_slug = OPERATIONS[operation](
+            family_name, family_slug, **params
+        )
+    return family_name, family_slug
+
+
+OPERATIONS: Final[dict[str, Callable[..., tuple[str, str]]]] = {
+    "new": transform_new,
+    "replace": transform_replace,
+    "suffix": transform_suffix,
+    "prefix": transform_prefix,
+    "timestamp": transform_timestamp,
+    "chain": transform_chain,
+}
+
+# Short command names accepted wherever an operation is named in data
+OPERATION_ALIASES: Final[dict[str, str]] = {
+    "n": "new",
+    "r": "replace",
+    "s": "suffix",
+    "p": "prefix",
+    "t": "timestamp",
+}
+
+# Transform parameters that are inputs, not operation arguments
+TRANSFORM_INPUTS: Final[frozenset[str]] = frozenset({"family_name", "family_slug"})
+
+# Parameters filled by the text after "op:" in a chain step
+STEP_ARGUMENTS: Final[dict[str, tuple[str, ...]]] = {
+    "new": ("new_family",),
+    "replace": ("find", "replace"),
+    "suffix": ("suffix",),
+    "prefix": ("prefix",),
+    "timestamp": ("separator",),
+}
+
+
+def operation_name(operation: str) -> str:
+    """Return the operation for a name or alias (case-insensitive).
+
+    Raises:
+        ValueError: If operation is unknown
+    """
+    name = str(operation).strip().lower()
+    name = OPERATION_ALIASES.get(name, name)
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+    return name
+
+
+def coerce_params(operation: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Check arguments against the transform's signature and coerce types.
+
+    Values become strings (fire turns numeric-looking flags into numbers),
+    except for boolean parameters, which also accept true/false/1/0/yes/no.
+
+    Raises:
+        ValueError: If an argument is unknown, missing or not a boolean
+    """
+    import inspect
+
+    from fontnemo.dispatch import FALSE_VALUES, TRUE_VALUES
+
+    signature = inspect.signature(OPERATIONS[operation]).parameters
+    coerced: dict[str, Any] = {}
+    for key, value in params.items():
+        param = signature.get(key)
+        if param is None or key in TRANSFORM_INPUTS:
+            raise ValueError(f"Unknown argument {key!r} for {operation}")
+        if isinstance(param.default, bool) and not isinstance(value, bool):
+            text = str(value).strip().lower()
+            if text not in TRUE_VALUES | FALSE_VALUES:
+                raise ValueError(f"Invalid boolean for {key}: {value!r}")
+            value = text in TRUE_VALUES
+        elif not isinstance(value, bool):
+            value = str(value)
+        coerced[key] = value
+
+    for name, param in signature.items():
+        if name in TRANSFORM_INPUTS or param.default is not param.empty:
+            continue
+        if name not in coerced:
+            raise ValueError(f"Missing argument {name!r} for {operation}")
+    return coerced
+
+
+def parse_steps(steps: str | list[Any]) -> list[tuple[str, dict[str, Any]]]:
+    """Parse a chain of operations.
+
+    Text form: steps separated by ``;``, each ``operation:argument`` (the
+    argument is taken verbatim, spaces included; ``replace`` takes
+    ``find=replacement``), e.g. ``prefix:Beta ;replace:Old=New;timestamp``.
+
+    A JSON array (as text or a list) may hold ``[operation, {args}]`` pairs,
+    ``{"operation": ..., "args": {...}}`` objects or bare operation names.
+
+    Returns:
+        (operation, params) pairs; params are not yet checked
+
+    Raises:
+        ValueError: If the chain is empty or a step is malformed
+    """
+    if isinstance(steps, str) and steps.lstrip().startswith("["):
+        import json
+
+        steps = json.loads(steps)
+
+    parsed: list[tuple[str, dict[str, Any]]] = []
+    if isinstance(steps, str):
+        for step in steps.split(";"):
+            if not step.strip():
+                continue
+            name, has_arg, arg = step.partition(":")
+            operation = operation_name(name)
+            names = STEP_ARGUMENTS.get(operation, ())
+            params: dict[str, Any] = {}
+            if has_arg and names:
+                values = arg.split("=", 1) if len(names) > 1 else [arg]
+                if len(values) != len(names):
+                    raise ValueError(f"Step {step!r}: expected {'='.join(names)}")
+                params = dict(zip(names, values, strict=True))
+            parsed.append((operation, params))
+    else:
+        for step in steps:
+            if isinstance(step, str):
+                parsed.append((operation_name(step), {}))
+            elif isinstance(step, dict):
+                args = step.get("args") or {}
+                parsed.append((operation_name(step.get("operation", "")), dict(args)))
+            elif isinstance(step, list | tuple) and len(step) == 2:
+                parsed.append((operation_name(step[0]), dict(step[1])))
+            else:
+                raise ValueError(f"Invalid chain step: {step!r}")
+
+    if not parsed:
+        raise ValueError("Empty chain: give at least one step")
+    if any(operation == "chain" for operation, _ in parsed):
+        raise ValueError("Chains cannot be nested")
+    return parsed
+
+
+def resolve_params(
+    operation: str, params: dict[str, Any], timestamp: str | None = None
+) -> dict[str, Any]:
+    """Normalize operation parameters once, before fanning out to workers.
+
+    Fire converts numeric-looking flag values to numbers, so string arguments
+    are coerced back to ``str``. For ``timestamp`` the timestamp is generated
+    here so that every font in a batch receives the same value. For
+    ``chain`` the ``steps`` (text or list, see parse_steps) are parsed and
+    every step is resolved and checked.
+
+    Args:
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+        timestamp: Timestamp to use instead of generating one
+
+    Raises:
+        ValueError: If operation is unknown or a chain step is invalid
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+
+    if operation == "chain":
+        stamp = timestamp or make_timestamp()
+        steps = parse_steps(params.get("steps") or "")
+        return {
+            "steps": [
+                (name, coerce_params(name, resolve_params(name, args, stamp)))
+                for name, args in steps
+            ]
+        }
+
+    resolved = {
+        key: value if isinstance(value, bool) else str(value)
+        for key, value in params.items()
+    }
+    if operation == "timestamp" and not resolved.get("timestamp"):
+        resolved["timestamp"] = timestamp or make_timestamp()
+    return resolved
+
+
+@dataclass
+class RenameResult:
+    """Outcome of reading or renaming a single font file.
+
+    ``family_name``/``family_slug`` hold the values found in the input font,
+    ``new_family_name``/``new_family_slug`` the values written by a rename.
+    For collections these refer to the first selected face, and ``faces``
+    lists (face index, family name) for every selected face. When several
+    output formats are written, ``output_paths`` lists all written files.
+    ``cached`` is True when the rename was skipped because the cache (see
+    fontnemo.cache) found its outputs up to date. A dry run (plan_rename)
+    sets ``changes`` to the name records the rename would rewrite.
+    ``profile`` holds the per-phase measurements of a profiled rename (see
+    fontnemo.instrument).
+    """
+
+    input_path: Path
+    output_path: Path | None = None
+    family_name: str | None = None
+    family_slug: str | None = None
+    new_family_name: str | None = None
+    new_family_slug: str | None = None
+    faces: list[tuple[int, str]] | None = None
+    output_paths: list[Path] | None = None
+    error: str | None = None
+    cached: bool = False
+    changes: list[NameChange] | None = None
+    profile: dict[str, Any] | None = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the operation succeeded."""
+        return self.error is None
+
+
+def face_handlers(
+    handler: FontNameHandler | FontCollectionHandler,
+) -> list[FontNameHandler]:
+    """Return the per-face handlers of a font or collection handler."""
+    if isinstance(handler, FontCollectionHandler):
+        return handler.handlers
+    return [handler]
+
+
+def read_font_names(
+    input_path: str | Path, faces: list[int] | None = None
+) -> RenameResult:
+    """Read family name of a font, capturing errors in the result.
+
+    Args:
+        input_path: Input font file
+        faces: Face indices for collections (default: all faces)
+
+    Returns:
+        RenameResult with ``family_name`` set
+    """
+    result = RenameResult(input_path=Path(input_path))
+    try:
+        handler = open_font_handler(input_path, faces)
+        try:
+            names = [(h.face, h.read_family_name()) for h in face_handlers(handler)]
+            result.family_name = names[0][1]
+            if isinstance(handler, FontCollectionHandler):
+                result.faces = names
+        finally:
+            handler.close()
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def apply_operation(
+    handler: FontNameHandler, operation: str, params: dict[str, Any]
+) -> tuple[str | None, str | None, str, str]:
+    """Apply a transform to one face's names in memory (nothing is saved).
+
+    Args:
+        handler: Handler of a single font or collection face
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+
+    Returns:
+        (family_name, family_slug, new_family_name, new_family_slug); the old
+        names are None if ``new`` found none
+    """
+    family_name, family_slug, new_name, new_slug = compute_names(
+        handler, operation, params
+    )
+    logger.info(f"family_name: {family_name!r} → {new_name!r}")
+    logger.info(f"family_slug: {family_slug!r} → {new_slug!r}")
+
+    handler.write_family_name(new_name)
+    handler.write_family_slug(new_slug)
+    return family_name, family_slug, new_name, new_slug
+
+
+def optional_name(read: Callable[[], str]) -> str | None:
+    """Return the name a reader such as read_family_name finds, else None."""
+    try:
+        return read()
+    except ValueError:
+        return None
+
+
+def compute_names(
+    handler: FontNameHandler, operation: str, params: dict[str, Any]
+) -> tuple[str | None, str | None, str, str]:
+    """Read one face's names and apply a transform, without writing anything.
+
+    ``new`` (also as the first step of a chain) does not use the current
+    names, so for it they are only reported, as None if they are missing.
+
+    Returns:
+        (family_name, family_slug, new_family_name, new_family_slug), as
+        apply_operation
+    """
+    transform = OPERATIONS[operation]
+    first = params["steps"][0][0] if operation == "chain" else operation
+    if first == "new":
+        family_name = optional_name(handler.read_family_name)
+        family_slug = optional_name(handler.read_family_slug)
+    else:
+        family_name = handler.read_family_name()
+        family_slug = handler.read_family_slug()
+    new_name, new_slug = transform(family_name or "", family_slug or "", **params)
+    return family_name, family_slug, new_name, new_slug
+
+
+def rename_font(
+    input_path: str | Path,
+    operation: str,
+    params: dict[str, Any],
+    output_path: str | Path = "0",
+    verify: bool = False,
+    faces: list[int] | None = None,
+    formats: list[str] | None = None,
+    profile: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> RenameResult:
+    """Run one load → transform → write → save cycle.
+
+    For collections the transform is applied to each selected face's own
+    names, and all faces are saved together in one pass.
+
+    Errors are captured in the result rather than raised, so this function can
+    be used directly as a process-pool worker.
+
+    Args:
+        input_path: Input font file
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+        output_path: Output mode passed to save_font_safely
+        verify: Re-check the written file with verify_saved_font
+        faces: Face indices for collections (default: all faces)
+        formats: Output formats (see core.OUTPUT_FORMATS) written from the
+            same renamed font (default: the input's format)
+        profile: Measure per-phase time, bytes and peak memory into
+            ``result.profile`` (see fontnemo.instrument)
+        durability: "none", "file" or "full": how much to fsync (see
+            fontnemo.fileops)
+
+    Returns:
+        RenameResult for this font
+    """
+    result = RenameResult(input_path=Path(input_path))
+    with profiling(input_path, profile) as font_profile:
+        _rename_font(
+            result, operation, params, output_path, verify, faces, formats, durability
+        )
+    if font_profile is not None:
+        result.profile = font_profile.as_dict()
+    return result
+
+
+def _rename_font(
+    result: RenameResult,
+    operation: str,
+    params: dict[str, Any],
+    output_path: str | Path,
+    verify: bool,
+    faces: list[int] | None,
+    formats: list[str] | None,
+    durability: str,
+) -> None:
+    """Body of rename_font, filling in result."""
+    input_path = result.input_path
+    try:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        handler = open_font_handler(input_path, faces)
+        try:
+            handlers = face_handlers(handler)
+            for face_handler in handlers:
+                with phase("transform"):
+                    names = apply_operation(face_handler, operation, params)
+                if face_handler is handlers[0]:
+                    (
+                        result.family_name,
+                        result.family_slug,
+                        result.new_family_name,
+                        result.new_family_slug,
+                    ) = names
+
+            if formats:
+                final_paths = save_font_formats(
+                    handler, output_path, formats, durability
+                )
+                result.output_paths = final_paths
+            else:
+                final_paths = [save_font_safely(handler, output_path, durability)]
+
+            # Report the in-memory state that was just written
+            written = [(h.face, h.read_family_name()) for h in handlers]
+            result.new_family_name = written[0][1]
+            if isinstance(handler, FontCollectionHandler):
+                result.faces = written
+        finally:
+            handler.close()
+
+        if verify:
+            for final_path in final_paths:
+                for face, family_name in written:
+                    verify_saved_font(final_path, family_name, face)
+        result.output_path = final_paths[0]
+
+    except Exception as e:
+        result.error = str(e)
+
+
+def written_directories(results: list[RenameResult]) -> set[Path]:
+    """Return the directories renames wrote to (for a batched directory sync).
+
+    Failed and cached results wrote nothing.
+    """
+    directories = set()
+    for result in results:
+        if result.ok and not result.cached and result.output_path is not None:
+            for path in result.output_paths or [result.output_path]:
+                directories.add(path.parent)
+    return directories
+
+
+def plan_rename(
+    input_path: str | Path,
+    operation: str,
+    params: dict[str, Any],
+    output_path: str | Path = "0",
+    faces: list[int] | None = None,
+    formats: list[str] | None = None,
+) -> RenameResult:
+    """Compute what rename_font would do, without writing anything (dry run).
+
+    Names are read through the lightweight reader (fontTools is not
+    imported for sfnt and WOFF fonts) and no output is saved. Errors are
+    captured in the result, as with rename_font.
+
+    Args:
+        input_path: Input font file, or STDIO_PATH ("-") to read stdin
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+        output_path: Output mode, used to report the planned output path(s)
+        faces: Face indices for collections (default: all faces)
+        formats: Output formats (default: the input's format)
+
+    Returns:
+        RenameResult with old/new names, planned output path(s) and
+        ``changes``, the name records that would be rewritten
+    """
+    changes: list[NameChange] = []
+    result = RenameResult(input_path=Path(input_path), changes=changes)
+    try:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        stdin = str(input_path) == STDIO_PATH
+        if stdin:
+            handler = open_font_handler(data=sys.stdin.buffer.read(), faces=faces)
+        else:
+            handler = open_font_handler(input_path, faces)
+        try:
+            handlers = face_handlers(handler)
+            planned = []
+            for face_handler in handlers:
+                names = compute_names(face_handler, operation, params)
+                planned.append((face_handler.face, names[2]))
+                changes += face_handler.plan_family_names(names[2], names[3])
+                if face_handler is handlers[0]:
+                    (
+                        result.family_name,
+                        result.family_slug,
+                        result.new_family_name,
+                        result.new_family_slug,
+                    ) = names
+            if isinstance(handler, FontCollectionHandler):
+                result.faces = planned
+                if formats and set(formats) != {"sfnt"}:
+                    raise ValueError("Font collections can only be written as sfnt")
+        finally:
+            handler.close()
+
+        if not stdin and str(output_path) != STDIO_PATH:
+            paths = plan_output_paths(input_path, output_path, formats)
+            result.output_path = paths[0]
+            if formats:
+                result.output_paths = paths
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def plan_record(result: RenameResult) -> dict[str, Any]:
+    """Return a dry-run result as a JSON-serializable record."""
+    from dataclasses import asdict
+
+    record: dict[str, Any] = {
+        "path": str(result.input_path),
+        "output_path": str(result.output_path) if result.output_path else None,
+        "family_name": result.family_name,
+        "family_slug": result.family_slug,
+        "new_family_name": result.new_family_name,
+        "new_family_slug": result.new_family_slug,
+    }
+    if result.output_paths:
+        record["output_paths"] = [str(p) for p in result.output_paths]
+    if result.faces is not None:
+        record["faces"] = [list(item) for item in result.faces]
+    record["changes"] = [asdict(change) for change in result.changes or []]
+    record["ok"] = result.ok
+    record["error"] = result.error
+    return record
+
+
+def rename_font_data(
+    data: FontData,
+    operation: str,
+    params: dict[str, Any],
+    faces: list[int] | None = None,
+    output_format: str | None = None,
+) -> bytes:
+    """Rename a font held in memory and return the new font file bytes.
+
+    The same name-only writers as for files are used, without touching the
+    filesystem. Unlike rename_font, errors are raised.
+
+    Args:
+        data: Font file contents (bytes-like or a binary file object)
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+        faces: Face indices for collections (default: all faces)
+        output_format: "sfnt", "woff" or "woff2" (default: the input's format)
+
+    Returns:
+        Renamed font file contents
+
+    Raises:
+        ValueError: If the operation, format or font data is invalid
+
+    Example:
+        >>> renamed = rename_font_data(font_bytes, "suffix", {"suffix": " Beta"})
+    """
+    renamed, _ = _rename_data(
+        read_font_data(data),
+        operation,
+        resolve_params(operation, params),
+        faces,
+        output_format,
+    )
+    return renamed
+
+
+def _rename_data(
+    data: bytes,
+    operation: str,
+    params: dict[str, Any],
+    faces: list[int] | None,
+    output_format: str | None,
+) -> tuple[bytes, list[tuple[int, tuple[str | None, str | None, str, str]]]]:
+    """Rename font data; return the output bytes and each face's names."""
+    source_format = data_format(data)
+    formats = parse_formats(output_format) or [source_format]
+    if len(formats) != 1:
+        raise ValueError(f"Expected one output format, got {output_format!r}")
+
+    handler = open_font_handler(data=data, faces=faces)
+    try:
+        names = [
+            (face_handler.face, apply_operation(face_handler, operation, params))
+            for face_handler in face_handlers(handler)
+        ]
+        if formats[0] == source_format:
+            return handler.to_bytes(), names
+        if isinstance(handler, FontCollectionHandler):
+            raise ValueError("Font collections can only be written as sfnt")
+        return FORMAT_ENCODERS[formats[0]](handler.compile_sfnt()), names
+    finally:
+        handler.close()
+
+
+def rename_stream(
+    input_path: str | Path,
+    operation: str,
+    params: dict[str, Any],
+    out: BinaryIO,
+    verify: bool = False,
+    faces: list[int] | None = None,
+    output_format: str | None = None,
+) -> RenameResult:
+    """Rename one font and write it to a binary stream, e.g. stdout.
+
+    No temp file is created: the renamed font is built in memory and written
+    to ``out`` in one go. Its bytes are identical to those a rename to an
+    explicit output path writes. Errors are captured in the result, and
+    nothing is written to ``out`` when the rename fails.
+
+    Args:
+        input_path: Input font file, or STDIO_PATH ("-") to read stdin
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+        out: Writable binary stream receiving the renamed font
+        verify: Check the renamed data with verify_font_data before writing
+        faces: Face indices for collections (default: all faces)
+        output_format: "sfnt", "woff" or "woff2" (default: the input's format)
+
+    Returns:
+        RenameResult for this font (``output_path`` is None)
+    """
+    result = RenameResult(input_path=Path(input_path))
+    try:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        if str(input_path) == STDIO_PATH:
+            data = sys.stdin.buffer.read()
+        else:
+            data = Path(input_path).read_bytes()
+
+        renamed, names = _rename_data(data, operation, params, faces, output_format)
+        (
+            result.family_name,
+            result.family_slug,
+            result.new_family_name,
+            result.new_family_slug,
+        ) = names[0][1]
+        if is_collection(data):
+            result.faces = [(face, face_names[2]) for face, face_names in names]
+
+        if verify:
+            for face, face_names in names:
+                verify_font_data(renamed, face_names[2], face)
+        out.write(renamed)
+        out.flush()
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def rename_ttfont(font: "TTFont", operation: str, params: dict[str, Any]) -> "TTFont":
+    """Rename a loaded TTFont in place and return it.
+
+    Only the font's name table is modified; saving is left to the caller.
+
+    Args:
+        font: fontTools TTFont
+        operation: One of the keys of OPERATIONS
+        params: Keyword arguments for the transform function
+
+    Returns:
+        The same TTFont, with family name and slug records rewritten
+
+    Raises:
+        ValueError: If the operation is unknown or the font has no names
+
+    Example:
+        >>> font = rename_ttfont(TTFont("a.ttf"), "new", {"new_family": "X"})
+    """
+    handler = FontNameHandler(font=font)
+    apply_operation(handler, operation, resolve_params(operation, params))
+    return font
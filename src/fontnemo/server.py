@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/server.py
+"""Warm daemon running fontnemo commands for thin clients (``fontnemo serve``).
+
+The daemon imports fontTools, loguru and the fontnemo modules once, then
+listens on a Unix socket. Each request (see fontnemo.client) carries argv,
+the working directory and the client's stdin/stdout/stderr descriptors. The
+daemon forks a worker per request: the worker starts from the warm
+interpreter, writes directly to the client's descriptors and exits with the
+command's status, which the daemon sends back to the client.
+
+Forking keeps requests isolated (``sys.exit``, logging setup, cwd) and lets
+several commands run at once, up to the configured number of workers.
+"""
+
+import gc
+import importlib
+import json
+import os
+import selectors
+import signal
+import socket
+import stat
+import sys
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.client import (
+    FORWARDED_FDS,
+    PROTOCOL_VERSION,
+    check_private_dir,
+    connect,
+    fallback_socket_dir,
+)
+from fontnemo.log import logger
+
+# Modules imported before forking so workers start warm
+PRELOAD_MODULES: Final[tuple[str, ...]] = (
+    "fontnemo.__main__",
+    "fontnemo.dispatch",
+    "fontnemo.operations",
+    "fontnemo.woff",
+    "fontTools.ttLib.ttFont",
+    "fontTools.ttLib.tables._n_a_m_e",
+    "fontTools.ttLib.tables._h_e_a_d",
+    "fontTools.ttLib.woff2",
+    "concurrent.futures",
+    "loguru",
+    "brotli",
+)
+
+# Largest request accepted (argv and cwd as JSON)
+MAX_REQUEST_BYTES: Final[int] = 1 << 20
+
+# Seconds a client may take to send its request after connecting
+REQUEST_TIMEOUT: Final[float] = 5.0
+
+# Poll interval for exited workers where pidfds are unavailable
+REAP_INTERVAL: Final[float] = 0.05
+
+# Pending connections queued by the kernel while all workers are busy
+LISTEN_BACKLOG: Final[int] = 128
+
+
+def preload() -> None:
+    """Import the modules commands need, so forked workers skip that cost."""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.debug(f"Preload: {name} not available")
+    # Keep preloaded objects out of the collector so forked workers share
+    # their memory pages instead of touching them during collections
+    gc.freeze()
+
+
+def read_request(conn: socket.socket) -> tuple[list[str], str, list[int]]:
+    """Read one request and the client's descriptors from a connection.
+
+    Args:
+        conn: Accepted client connection
+
+    Returns:
+        Tuple of (argv, cwd, descriptors); the caller owns the descriptors
+
+    Raises:
+        ValueError: If the request is malformed or too large
+        OSError: If the connection fails or times out
+    """
+    conn.settimeout(REQUEST_TIMEOUT)
+    data, fds, _, _ = socket.recv_fds(conn, 65536, len(FORWARDED_FDS))
+    try:
+        while not data.endswith(b"\n"):
+            if not data and not fds:
+                raise ConnectionError("Client closed the connection")
+            if len(data) > MAX_REQUEST_BYTES:
+                raise ValueError("Request too large")
+            chunk = conn.recv(65536)
+            if not chunk:
+                raise ConnectionError("Client closed the connection")
+            data += chunk
+
+        request = json.loads(data)
+        if request.get("version") != PROTOCOL_VERSION:
+            raise ValueError(
+                f"Protocol version {request.get('version')} not supported "
+                f"(daemon speaks {PROTOCOL_VERSION}); restart fontnemo serve"
+            )
+        if len(fds) != len(FORWARDED_FDS):
+            raise ValueError("Request did not include stdin/stdout/stderr")
+        argv = [str(arg) for arg in request["argv"]]
+        return argv, str(request["cwd"]), fds
+    except (ValueError, KeyError, TypeError) as e:
+        _close_fds(fds)
+        raise ValueError(f"Invalid request: {e}") from e
+    except OSError:
+        _close_fds(fds)
+        raise
+
+
+def _close_fds(fds: list[int]) -> None:
+    for fd in fds:
+        os.close(fd)
+
+
+def _exit_code(code: Any) -> int:
+    """Map a SystemExit code to a process exit status, as the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_command(argv: list[str], cwd: str) -> int:
+    """Run one fontnemo command line in the current (worker) process.
+
+    Args:
+        argv: Command-line arguments
+        cwd: Working directory for relative paths
+
+    Returns:
+        Exit status
+    """
+    from fontnemo.__main__ import main
+
+    try:
+        os.chdir(cwd)
+        main(argv)
+        code = 0
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return code
+
+
+class FontNemoServer:
+    """Unix socket daemon forking a warm worker per fontnemo command."""
+
+    def __init__(self, socket_path: str | Path, max_workers: int) -> None:
+        """Create a daemon; call bind() and then serve_forever().
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            max_workers: Maximum number of commands run at once
+        """
+        self.socket_path = Path(socket_path)
+        self.max_workers = max(1, max_workers)
+        self._listener: socket.socket | None = None
+        self._selector = selectors.DefaultSelector()
+        self._accepting = False
+        # pid -> (client connection, pidfd or None)
+        self._workers: dict[int, tuple[socket.socket, int | None]] = {}
+
+    def bind(self) -> None:
+        """Create the socket, replacing a stale one left by a dead daemon.
+
+        The fallback socket directory in the temp directory is created with
+        mode 0700. Only a socket owned by this user is ever removed.
+
+        Raises:
+            OSError: If another daemon is listening on the socket, or the
+                path is taken by something else
+        """
+        if self.socket_path.parent == fallback_socket_dir():
+            check_private_dir(self.socket_path.parent, create=True)
+        if self.socket_path.exists():
+            try:
+                connect(self.socket_path).close()
+            except PermissionError:
+                raise
+            except OSError:
+                st = self.socket_path.lstat()
+                if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                    raise OSError(
+                        f"{self.socket_path} exists and is not a socket of yours"
+                    ) from None
+                logger.debug(f"Removing stale socket {self.socket_path}")
+                self.socket_path.unlink()
+            else:
+                raise OSError(f"fontnemo daemon already running on {self.socket_path}")
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the owner may connect: clients run commands with our privileges
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        listener.listen(LISTEN_BACKLOG)
+        listener.setblocking(False)
+        self._listener = listener
+        self._update_accepting()
+
+    def serve_forever(self) -> None:
+        """Accept and run requests until interrupted."""
+        timeout = None if hasattr(os, "pidfd_open") else REAP_INTERVAL
+        while True:
+            for key, _ in self._selector.select(timeout):
+                kind, pid = key.data
+                if kind == "accept":
+                    self._accept()
+                elif kind == "exit":
+                    self._reap(pid, block=True)
+                elif kind == "client" and pid in self._workers:
+                    self._client_readable(pid)
+            if timeout is not None:
+                for pid in list(self._workers):
+                    self._reap(pid, block=False)
+
+    def close(self) -> None:
+        """Stop listening, wait for running workers and remove the socket."""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            self.socket_path.unlink(missing_ok=True)
+        for pid in list(self._workers):
+            self._reap(pid, block=True)
+        self._selector.close()
+
+    def _update_accepting(self) -> None:
+        """Stop accepting while all workers are busy; resume when one exits."""
+        if self._listener is None:
+            return
+        want = len(self._workers) < self.max_workers
+        if want and not self._accepting:
+            self._selector.register(self._listener, selectors.EVENT_READ, ("accept", 0))
+        elif not want and self._accepting:
+            self._selector.unregister(self._listener)
+        self._accepting = want
+
+    def _accept(self) -> None:
+        assert self._listener is not None
+        try:
+            conn, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        try:
+            argv, cwd, fds = read_request(conn)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rejected request: {e}")
+            self._reply(conn, 2, str(e))
+            conn.close()
+            return
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            self._become_worker(conn, fds)
+            os._exit(run_command(argv, cwd))
+
+        _close_fds(fds)
+        logger.debug(f"Worker {pid}: {' '.join(argv)}")
+        pidfd = os.pidfd_open(pid) if hasattr(os, "pidfd_open") else None
+        if pidfd is not None:
+            self._selector.register(pidfd, selectors.EVENT_READ, ("exit", pid))
+        self._selector.register(conn, selectors.EVENT_READ, ("client", pid))
+        self._workers[pid] = (conn, pidfd)
+        self._update_accepting()
+
+    def _become_worker(self, conn: socket.socket, fds: list[int]) -> None:
+        """In a forked worker: drop daemon state and adopt the client's stdio."""
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self._selector.close()
+        if self._listener is not None:
+            self._listener.close()
+        for other, pidfd in self._workers.values():
+            other.close()
+            if pidfd is not None:
+                os.close(pidfd)
+        conn.close()
+        for fd, target in zip(fds, FORWARDED_FDS, strict=True):
+            os.dup2(fd, target)
+            os.close(fd)
+
+    def _client_readable(self, pid: int) -> None:
+        """Stop a worker whose client went away (clients send nothing else)."""
+        conn, _ = self._workers[pid]
+        try:
+            data = conn.recv(1)
+        except OSError:
+            data = b""
+        if not data:
+            logger.debug(f"Worker {pid}: client disconnected, terminating")
+            self._selector.unregister(conn)
+            os.kill(pid, signal.SIGTERM)
+
+    def _reap(self, pid: int, block: bool) -> None:
+        """Collect an exited worker and send its status to the client."""
+        waited, status = os.waitpid(pid, 0 if block else os.WNOHANG)
+        if waited == 0:
+            return
+        conn, pidfd = self._workers.pop(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if code < 0:
+            code = 128 - code  # Killed by a signal, as shells report it
+        if pidfd is not None:
+            self._selector.unregister(pidfd)
+            os.close(pidfd)
+        if self._registered(conn):
+            self._selector.unregister(conn)
+        self._reply(conn, code)
+        conn.close()
+        logger.debug(f"Worker {pid}: exit {code}")
+        self._update_accepting()
+
+    def _registered(self, conn: socket.socket) -> bool:
+        try:
+            self._selector.get_key(conn)
+        except KeyError:
+            return False
+        return True
+
+    @staticmethod
+    def _reply(conn: socket.socket, code: int, error: str | None = None) -> None:
+        reply: dict[str, Any] = {"exit": code}
+        if error:
+            reply["error"] = error
+        try:
+            conn.setblocking(True)
+            conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+        except OSError:
+            pass  # Client already gone
+
+
+def serve(socket_path: str | Path, max_workers: int) -> None:
+    """Run the daemon in the foreground until SIGINT or SIGTERM.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        max_workers: Maximum number of commands run at once
+
+    Raises:
+        OSError: If the platform lacks Unix sockets/fork, or a daemon is
+            already listening on socket_path
+    """
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        raise OSError("fontnemo serve needs Unix domain sockets and fork()")
+
+    preload()
+    server = FontNemoServer(socket_path, max_workers)
+    server.bind()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"fontnemo serving on {server.socket_path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/sfnt.py
+"""Low-level sfnt container access: table directory, checksums, name-only writes.
+
+Both single fonts and TTC/OTC collections are supported; in a collection each
+face has its own table directory and tables may be shared between faces.
+
+Renaming only touches the ``name`` table, so instead of a full TTFont
+decompile/compile cycle the writers here copy every other table byte-for-byte
+from the source file and only rewrite the table directory and
+``head.checkSumAdjustment``.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import BinaryIO, Final, NamedTuple
+
+# sfnt header: sfntVersion, numTables, searchRange, entrySelector, rangeShift
+SFNT_HEADER_FORMAT: Final[str] = ">4sHHHH"
+SFNT_HEADER_SIZE: Final[int] = struct.calcsize(SFNT_HEADER_FORMAT)
+
+# Table record: tag, checksum, offset, length
+TABLE_RECORD_FORMAT: Final[str] = ">4sLLL"
+TABLE_RECORD_SIZE: Final[int] = struct.calcsize(TABLE_RECORD_FORMAT)
+
+# sfntVersion values of single (non-collection, uncompressed) fonts
+SFNT_VERSIONS: Final[frozenset[bytes]] = frozenset(
+    {b"\x00\x01\x00\x00", b"OTTO", b"true"}
+)
+
+# TTC header: ttcTag, version, numFonts (followed by numFonts uint32 offsets)
+TTC_TAG: Final[bytes] = b"ttcf"
+TTC_HEADER_FORMAT: Final[str] = ">4sLL"
+TTC_HEADER_SIZE: Final[int] = struct.calcsize(TTC_HEADER_FORMAT)
+TTC_VERSION_1: Final[int] = 0x00010000
+
+# Signatures of WOFF 1.0 and WOFF 2.0 web fonts (see fontnemo.woff)
+WOFF_TAG: Final[bytes] = b"wOFF"
+WOFF2_TAG: Final[bytes] = b"wOF2"
+
+# name table header (format, count, stringOffset) and name record
+NAME_HEADER_FORMAT: Final[str] = ">HHH"
+NAME_HEADER_SIZE: Final[int] = struct.calcsize(NAME_HEADER_FORMAT)
+NAME_RECORD_FORMAT: Final[str] = ">HHHHHH"
+NAME_RECORD_SIZE: Final[int] = struct.calcsize(NAME_RECORD_FORMAT)
+
+# head.checkSumAdjustment lives at this offset inside the head table
+HEAD_CHECKSUM_ADJUSTMENT_OFFSET: Final[int] = 8
+CHECKSUM_MAGIC: Final[int] = 0xB1B0AFBA
+
+
+class TableEntry(NamedTuple):
+    """One record of the sfnt table directory."""
+
+    tag: str
+    checksum: int
+    offset: int
+    length: int
+
+
+# Name records keyed by (nameID, platformID, platEncID, langID)
+NameKey = tuple[int, int, int, int]
+
+
+class SfntDirectory(NamedTuple):
+    """Parsed sfnt header and table directory."""
+
+    sfnt_version: bytes
+    tables: dict[str, TableEntry]
+
+
+def calc_checksum(data: bytes | bytearray | memoryview) -> int:
+    """Calculate OpenType table checksum (sum of big-endian uint32, mod 2**32).
+
+    Args:
+        data: Table data; padded with zeros to a multiple of 4 bytes
+
+    Returns:
+        Checksum as unsigned 32-bit integer
+    """
+    data = bytes(data)
+    remainder = len(data) % 4
+    if remainder:
+        data += b"\0" * (4 - remainder)
+    values: tuple[int, ...] = struct.unpack(f">{len(data) // 4}L", data)
+    return sum(values) & 0xFFFFFFFF
+
+
+def pad4(length: int) -> int:
+    """Round length up to a multiple of 4."""
+    return (length + 3) & ~3
+
+
+def read_sfnt_directory(
+    buf: bytes | mmap.mmap | memoryview,
+    file_size: int | None = None,
+    offset: int = 0,
+) -> SfntDirectory:
+    """Parse sfnt header and table directory from a buffer.
+
+    Args:
+        buf: Font file contents (bytes, mmap or memoryview), or at least
+            the header and table directory when file_size is given
+        file_size: Total file size used to validate table bounds
+            (default: length of buf)
+        offset: Position of the sfnt header (non-zero for collection faces)
+
+    Returns:
+        SfntDirectory with tables keyed by tag
+
+    Raises:
+        ValueError: If the buffer is not a single uncompressed sfnt font
+    """
+    if len(buf) < offset + SFNT_HEADER_SIZE:
+        raise ValueError("File too short to be an sfnt font")
+
+    sfnt_version, num_tables, *_ = struct.unpack_from(SFNT_HEADER_FORMAT, buf, offset)
+    if sfnt_version not in SFNT_VERSIONS:
+        raise ValueError(f"Not an sfnt font (sfntVersion {sfnt_version!r})")
+
+    directory_end = offset + SFNT_HEADER_SIZE + num_tables * TABLE_RECORD_SIZE
+    if len(buf) < directory_end:
+        raise ValueError("Truncated sfnt table directory")
+
+    if file_size is None:
+        file_size = len(buf)
+
+    tables: dict[str, TableEntry] = {}
+    for i in range(num_tables):
+        record_offset = offset + SFNT_HEADER_SIZE + i * TABLE_RECORD_SIZE
+        tag, checksum, table_offset, length = struct.unpack_from(
+            TABLE_RECORD_FORMAT, buf, record_offset
+        )
+        if table_offset + length > file_size:
+            raise ValueError(f"Table {tag!r} extends past end of file")
+        tag_str = tag.decode("latin-1")
+        tables[tag_str] = TableEntry(tag_str, checksum, table_offset, length)
+
+    return SfntDirectory(sfnt_version, tables)
+
+
+def is_collection(buf: bytes | mmap.mmap | memoryview) -> bool:
+    """Return True if the buffer starts with a TTC/OTC collection header."""
+    return bytes(buf[:4]) == TTC_TAG
+
+
+def read_face_offsets(buf: bytes | mmap.mmap | memoryview) -> list[int]:
+    """Return the offsets of every face's sfnt header.
+
+    A single font has one face at offset 0.
+
+    Raises:
+        ValueError: If the collection header is truncated
+    """
+    if not is_collection(buf):
+        return [0]
+    if len(buf) < TTC_HEADER_SIZE:
+        raise ValueError("Truncated collection header")
+    _tag, _version, num_fonts = struct.unpack_from(TTC_HEADER_FORMAT, buf, 0)
+    if len(buf) < TTC_HEADER_SIZE + 4 * num_fonts:
+        raise ValueError("Truncated collection header")
+    return list(struct.unpack_from(f">{num_fonts}L", buf, TTC_HEADER_SIZE))
+
+
+def read_face_directory(
+    buf: bytes | mmap.mmap | memoryview, face: int = 0
+) -> SfntDirectory:
+    """Parse the table directory of one face (of a collection or single font).
+
+    Raises:
+        ValueError: If face is out of range or the data is not a font
+    """
+    offsets = read_face_offsets(buf)
+    if not 0 <= face < len(offsets):
+        raise ValueError(f"Face index {face} out of range (font has {len(offsets)})")
+    return read_sfnt_directory(buf, offset=offsets[face])
+
+
+def _pack_header(sfnt_version: bytes, num_tables: int) -> bytes:
+    """Pack sfnt header with binary-search fields for num_tables."""
+    entry_selector = max(num_tables.bit_length() - 1, 0)
+    search_range = (1 << entry_selector) * 16
+    range_shift = num_tables * 16 - search_range
+    return struct.pack(
+        SFNT_HEADER_FORMAT,
+        sfnt_version,
+        num_tables,
+        search_range,
+        entry_selector,
+        range_shift,
+    )
+
+
+def pack_directory(sfnt_version: bytes, entries: list[TableEntry]) -> bytes:
+    """Pack sfnt header plus table records sorted by tag."""
+    records = [
+        struct.pack(
+            TABLE_RECORD_FORMAT,
+            e.tag.encode("latin-1"),
+            e.checksum,
+            e.offset,
+            e.length,
+        )
+        for e in sorted(entries, key=lambda e: e.tag.encode("latin-1"))
+    ]
+    return _pack_header(sfnt_version, len(entries)) + b"".join(records)
+
+
+def head_checksum(head: bytes | bytearray | memoryview) -> int:
+    """Checksum of the head table with checkSumAdjustment zeroed."""
+    zeroed = bytearray(head)
+    off = HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+    zeroed[off : off + 4] = b"\0\0\0\0"
+    return calc_checksum(zeroed)
+
+
+def checksum_adjustment(directory: bytes, entries: list[TableEntry]) -> int:
+    """Compute head.checkSumAdjustment from directory bytes and table checksums."""
+    total = calc_checksum(directory) + sum(e.checksum for e in entries)
+    return (CHECKSUM_MAGIC - total) & 0xFFFFFFFF
+
+
+def write_sfnt(
+    src: bytes | mmap.mmap | memoryview,
+    out: BinaryIO,
+    replacements: Mapping[str, bytes],
+    face: int = 0,
+) -> None:
+    """Write a copy of an sfnt font with some tables replaced.
+
+    Tables keep their original order in the file; every table not listed in
+    replacements is copied byte-for-byte from the source. Table directory
+    offsets, lengths, checksums and head.checkSumAdjustment are recomputed.
+
+    Args:
+        src: Source font file contents
+        out: Binary file object to write to
+        replacements: New table data keyed by tag (tags must exist in source)
+        face: Face to extract when src is a collection
+
+    Raises:
+        ValueError: If src is not an sfnt font or a replacement tag is missing
+    """
+    directory = read_face_directory(src, face)
+    missing = set(replacements) - set(directory.tables)
+    if missing:
+        raise ValueError(f"Tables not present in source font: {sorted(missing)}")
+
+    view = memoryview(src)
+    ordered = sorted(directory.tables.values(), key=lambda e: e.offset)
+
+    # Lay out tables after the directory, 4-byte aligned, in source order
+    offset = SFNT_HEADER_SIZE + len(ordered) * TABLE_RECORD_SIZE
+    entries: list[TableEntry] = []
+    chunks: list[bytes | memoryview] = []
+    head_index = None
+    for entry in ordered:
+        if entry.tag in replacements:
+            data: bytes | memoryview = replacements[entry.tag]
+            checksum = calc_checksum(data)
+        else:
+            data = view[entry.offset : entry.offset + entry.length]
+            checksum = entry.checksum
+        if entry.tag == "head":
+            # Recompute: checksum must be taken with checkSumAdjustment zeroed
+            checksum = head_checksum(data)
+            head_index = len(chunks)
+        entries.append(TableEntry(entry.tag, checksum, offset, len(data)))
+        chunks.append(data)
+        offset += pad4(len(data))
+
+    header = pack_directory(directory.sfnt_version, entries)
+
+    if head_index is not None:
+        head = bytearray(chunks[head_index])
+        off = HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+        struct.pack_into(">L", head, off, checksum_adjustment(header, entries))
+        chunks[head_index] = bytes(head)
+
+    out.write(header)
+    for data in chunks:
+        out.write(data)
+        padding = pad4(len(data)) - len(data)
+        if padding:
+            out.write(b"\0" * padding)
+
+
+def write_collection(
+    src: bytes | mmap.mmap | memoryview,
+    out: BinaryIO,
+    replacements: Mapping[int, Mapping[str, bytes]],
+) -> None:
+    """Write a copy of a TTC/OTC collection with some faces' tables replaced.
+
+    Every source table is copied byte-for-byte exactly once, however many
+    faces share it. Replacement tables with identical data are stored once
+    too, so faces renamed the same way keep sharing their name table. A
+    shared table replaced for only some faces is split automatically.
+
+    The output is a version 1.0 collection; a DSIG of a version 2.0 source
+    (which the rename invalidates anyway) is dropped.
+
+    Args:
+        src: Source collection file contents
+        out: Binary file object to write to
+        replacements: Face index → {tag: new table data}
+
+    Raises:
+        ValueError: If src is not a collection or a replacement is invalid
+    """
+    if not is_collection(src):
+        raise ValueError("Not a font collection")
+
+    offsets = read_face_offsets(src)
+    directories = [read_sfnt_directory(src, offset=o) for o in offsets]
+    for face, tables in replacements.items():
+        if not 0 <= face < len(directories):
+            raise ValueError(f"Face index {face} out of range")
+        missing = set(tables) - set(directories[face].tables)
+        if missing:
+            raise ValueError(f"Tables not present in face {face}: {sorted(missing)}")
+
+    view = memoryview(src)
+
+    # Directories follow the TTC header; tables follow the directories
+    offset = TTC_HEADER_SIZE + 4 * len(directories)
+    face_offsets = []
+    for directory in directories:
+        face_offsets.append(offset)
+        offset += SFNT_HEADER_SIZE + len(directory.tables) * TABLE_RECORD_SIZE
+
+    # Place each distinct table once: source tables by (offset, length),
+    # replacement tables by content
+    placed: dict[object, tuple[int, int]] = {}  # key → (offset, checksum)
+    chunks: list[bytes | memoryview] = []
+    chunk_offsets: list[int] = []
+    face_entries: list[list[TableEntry]] = []
+    for face, directory in enumerate(directories):
+        face_replacements = replacements.get(face, {})
+        entries = []
+        for entry in sorted(directory.tables.values(), key=lambda e: e.offset):
+            key: object
+            if entry.tag in face_replacements:
+                data: bytes | memoryview = face_replacements[entry.tag]
+                key = ("new", bytes(data))
+            else:
+                data = view[entry.offset : entry.offset + entry.length]
+                key = ("src", entry.offset, entry.length)
+
+            if key not in placed:
+                if entry.tag == "head":
+                    checksum = head_checksum(data)
+                elif key[0] == "new":
+                    checksum = calc_checksum(data)
+                else:
+                    checksum = entry.checksum
+                placed[key] = (offset, checksum)
+                chunks.append(data)
+                chunk_offsets.append(offset)
+                offset += pad4(len(data))
+
+            table_offset, checksum = placed[key]
+            entries.append(TableEntry(entry.tag, checksum, table_offset, len(data)))
+        face_entries.append(entries)
+
+    # Directories, and head.checkSumAdjustment per face; a head table shared
+    # by several faces keeps the value computed for the first of them
+    directory_blobs = []
+    adjusted: set[int] = set()
+    for directory, entries in zip(directories, face_entries, strict=True):
+        blob = pack_directory(directory.sfnt_version, entries)
+        directory_blobs.append(blob)
+        head = next((e for e in entries if e.tag == "head"), None)
+        if head is None or head.offset in adjusted:
+            continue
+        adjusted.add(head.offset)
+        index = chunk_offsets.index(head.offset)
+        head_data = bytearray(chunks[index])
+        struct.pack_into(
+            ">L",
+            head_data,
+            HEAD_CHECKSUM_ADJUSTMENT_OFFSET,
+            checksum_adjustment(blob, entries),
+        )
+        chunks[index] = bytes(head_data)
+
+    out.write(struct.pack(TTC_HEADER_FORMAT, TTC_TAG, TTC_VERSION_1, len(directories)))
+    out.write(struct.pack(f">{len(face_offsets)}L", *face_offsets))
+    for blob in directory_blobs:
+        out.write(blob)
+    for data in chunks:
+        out.write(data)
+        padding = pad4(len(data)) - len(data)
+        if padding:
+            out.write(b"\0" * padding)
+
+
+def patch_table_in_place(path: str | Path, tag: str, data: bytes) -> bool:
+    """Overwrite one table inside an existing sfnt file, if it fits.
+
+    The new data must fit in the table's current slot, i.e. the space up to
+    the next table (or end of file) including alignment padding. Only the
+    table bytes, the table directory and head.checkSumAdjustment are written,
+    as separate writes: a crash in between leaves an inconsistent font, so
+    callers needing crash safety must write a new file instead.
+
+    Files with other hard links are never patched, since every link would
+    see the change.
+
+    Args:
+        path: Font file to patch
+        tag: Table tag to replace
+        data: New table data
+
+    Returns:
+        True if the file was patched, False if it does not fit, the file has
+        other hard links or is not a plain sfnt font (caller should fall back
+        to a full rewrite)
+    """
+    with open(path, "r+b") as f:
+        if os.fstat(f.fileno()).st_nlink != 1:
+            return False
+        head_bytes = f.read(SFNT_HEADER_SIZE)
+        if len(head_bytes) < SFNT_HEADER_SIZE:
+            return False
+        sfnt_version, num_tables, *_ = struct.unpack(SFNT_HEADER_FORMAT, head_bytes)
+        if sfnt_version not in SFNT_VERSIONS:
+            return False
+
+        file_size = f.seek(0, 2)
+        f.seek(0)
+        directory_size = SFNT_HEADER_SIZE + num_tables * TABLE_RECORD_SIZE
+        try:
+            directory = read_sfnt_directory(f.read(directory_size), file_size)
+        except ValueError:
+            return False
+
+        tables = directory.tables
+        if tag not in tables or "head" not in tables:
+            return False
+
+        entry = tables[tag]
+        following = [e.offset for e in tables.values() if e.offset > entry.offset]
+        slot_end = min(following, default=file_size)
+        if entry.offset + len(data) > slot_end:
+            return False
+
+        # Write new table data, zero-filling the remainder of the old table
+        f.seek(entry.offset)
+        f.write(data)
+        leftover = max(entry.length, len(data))
+        leftover = min(pad4(leftover), slot_end - entry.offset) - len(data)
+        if leftover > 0:
+            f.write(b"\0" * leftover)
+        tables[tag] = TableEntry(tag, calc_checksum(data), entry.offset, len(data))
+
+        head_entry = tables["head"]
+        f.seek(head_entry.offset)
+        head = f.read(head_entry.length)
+        tables["head"] = head_entry._replace(checksum=head_checksum(head))
+
+        entries = list(tables.values())
+        directory_bytes = pack_directory(sfnt_version, entries)
+        f.seek(0)
+        f.write(directory_bytes)
+        f.seek(head_entry.offset + HEAD_CHECKSUM_ADJUSTMENT_OFFSET)
+        f.write(struct.pack(">L", checksum_adjustment(directory_bytes, entries)))
+
+    return True
+
+
+def parse_name_table(data: bytes | memoryview) -> dict[NameKey, bytes]:
+    """Parse raw name table data into undecoded records.
+
+    Malformed records pointing outside the string storage are skipped.
+
+    Args:
+        data: Binary name table
+
+    Returns:
+        Raw string bytes keyed by (nameID, platformID, platEncID, langID)
+    """
+    if len(data) < NAME_HEADER_SIZE:
+        raise ValueError("Truncated name table")
+    _format, count, string_offset = struct.unpack_from(NAME_HEADER_FORMAT, data, 0)
+    count = min(count, (len(data) - NAME_HEADER_SIZE) // NAME_RECORD_SIZE)
+
+    records: dict[NameKey, bytes] = {}
+    for i in range(count):
+        plat_id, enc_id, lang_id, name_id, length, offset = struct.unpack_from(
+            NAME_RECORD_FORMAT, data, NAME_HEADER_SIZE + i * NAME_RECORD_SIZE
+        )
+        start = string_offset + offset
+        if start + length > len(data):
+            continue
+        key = (name_id, plat_id, enc_id, lang_id)
+        # First record wins, matching fontTools getName()
+        records.setdefault(key, bytes(data[start : start + length]))
+    return records
+
+
+def read_name_records(
+    buf: bytes | mmap.mmap | memoryview, face: int = 0
+) -> dict[NameKey, bytes]:
+    """Read undecoded name records from an sfnt, collection or WOFF buffer.
+
+    Args:
+        buf: Font file contents
+        face: Face index within a collection
+
+    Returns:
+        Raw string bytes keyed by (nameID, platformID, platEncID, langID)
+
+    Raises:
+        ValueError: If buf is not an sfnt or WOFF font or has no name table
+    """
+    if bytes(buf[:4]) in (WOFF_TAG, WOFF2_TAG):
+        from fontnemo.woff import read_woff_table
+
+        if face:
+            raise ValueError("WOFF fonts have a single face")
+        return parse_name_table(read_woff_table(buf, "name"))
+
+    directory = read_face_directory(buf, face)
+    entry = directory.tables.get("name")
+    if entry is None:
+        raise ValueError("Font has no 'name' table")
+    with memoryview(buf) as view:
+        data = view[entry.offset : entry.offset + entry.length]
+        try:
+            return parse_name_table(data)
+        finally:
+            data.release()
+
+
+def load_name_records(path: str | Path, face: int = 0) -> dict[NameKey, bytes]:
+    """Memory-map a font file and read its name records.
+
+    Only the sfnt header, table directory and name table are touched.
+
+    Args:
+        path: Font file path
+        face: Face index within a collection
+
+    Returns:
+        Raw string bytes keyed by (nameID, platformID, platEncID, langID)
+    """
+    buf = open_font_buffer(path)
+    try:
+        return read_name_records(buf, face)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def _is_ascii(code: int) -> bool:
+    return 0x20 <= code <= 0x7E or code in (0x09, 0x0A, 0x0D)
+
+
+def decode_name_string(
+    raw: bytes, platform_id: int, encoding_id: int, language_id: int = 0
+) -> str:
+    """Decode a name record string exactly as fontTools' NameRecord.toUnicode.
+
+    Unicode and Windows Unicode records are UTF-16BE. Other encodings are
+    looked up with fontTools.misc.encodingTools.getEncoding (imported only
+    then, so reading Windows names stays free of fontTools), which also
+    registers fontTools' Mac CJK codecs; unknown encodings are ASCII. The
+    same repairs of misencoded UTF-16 are applied.
+
+    Args:
+        raw: Undecoded string bytes
+        platform_id: Name record platformID
+        encoding_id: Name record platEncID
+        language_id: Name record langID (selects some Mac encodings)
+
+    Returns:
+        Decoded string
+
+    Raises:
+        UnicodeDecodeError: If the bytes are invalid in the record's encoding
+    """
+    if platform_id == 0 or (platform_id == 3 and encoding_id in (0, 1, 10)):
+        encoding = "utf_16_be"
+    else:
+        from fontTools.misc.encodingTools import (  # type: ignore[import-untyped]
+            getEncoding,
+        )
+
+        encoding = getEncoding(platform_id, encoding_id, language_id, "ascii")
+
+    if encoding == "utf_16_be" and len(raw) % 2 == 1:
+        # Recover UTF-16 strings with an odd number of bytes
+        if raw[-1] == 0:
+            raw = raw[:-1]
+        elif all(b == 0 if i % 2 else _is_ascii(b) for i, b in enumerate(raw)):
+            raw = b"\0" + raw
+        elif raw[0] == 0 and all(_is_ascii(b) for b in raw[1:]):
+            raw = b"".join(b"\0" + bytes([b]) for b in raw[1:])
+
+    string = raw.decode(encoding)
+    if all(
+        ord(c) == 0 if i % 2 == 0 else _is_ascii(ord(c)) for i, c in enumerate(string)
+    ):
+        # ASCII text encoded twice, as UTF-16BE inside another encoding
+        string = string[1::2]
+    return string
+
+
+def verify_name_table(path: str | Path, face: int = 0) -> None:
+    """Verify name table, head table and directory checksums of a font file.
+
+    See verify_name_buffer.
+
+    Args:
+        path: Font file path
+        face: Face index within a collection
+
+    Raises:
+        ValueError: If the file is not an sfnt font or a checksum mismatches
+    """
+    buf = open_font_buffer(path)
+    try:
+        verify_name_buffer(buf, face)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def verify_name_buffer(buf: bytes | mmap.mmap | memoryview, face: int = 0) -> None:
+    """Verify name table, head table and directory checksums of font data.
+
+    Reads only the table directory plus the ``name`` and ``head`` tables:
+
+    - the name table checksum must match its directory entry
+    - the head table checksum (adjustment zeroed) must match its entry
+    - head.checkSumAdjustment must agree with the directory checksums
+      (single fonts only, as collection faces may share one head table)
+
+    WOFF and WOFF2 fonts are checked by fontnemo.woff.verify_woff.
+
+    Args:
+        buf: Font file contents
+        face: Face index within a collection
+
+    Raises:
+        ValueError: If the data is not an sfnt font or a checksum mismatches
+    """
+    if bytes(buf[:4]) in (WOFF_TAG, WOFF2_TAG):
+        from fontnemo.woff import verify_woff
+
+        verify_woff(buf)
+        return
+
+    directory = read_face_directory(buf, face)
+    tables = directory.tables
+    for tag in ("name", "head"):
+        if tag not in tables:
+            raise ValueError(f"Font has no {tag!r} table")
+
+    name = tables["name"]
+    head = tables["head"]
+    with memoryview(buf) as view:
+        name_data = bytes(view[name.offset : name.offset + name.length])
+        head_data = bytes(view[head.offset : head.offset + head.length])
+
+    if calc_checksum(name_data) != name.checksum:
+        raise ValueError("'name' table checksum mismatch")
+    if head_checksum(head_data) != head.checksum:
+        raise ValueError("'head' table checksum mismatch")
+
+    if not is_collection(buf):
+        num_tables = len(tables)
+        directory_bytes = bytes(
+            buf[: SFNT_HEADER_SIZE + num_tables * TABLE_RECORD_SIZE]
+        )
+        (adjustment,) = struct.unpack_from(
+            ">L", head_data, HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+        )
+        expected = checksum_adjustment(directory_bytes, list(tables.values()))
+        if adjustment != expected:
+            raise ValueError("head.checkSumAdjustment does not match directory")
+
+
+def open_font_buffer(path: str | Path) -> mmap.mmap | bytes:
+    """Memory-map a font file read-only (empty files are returned as bytes).
+
+    Args:
+        path: Font file path
+
+    Returns:
+        Read-only buffer with the file contents
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap cannot map empty files
+            return f.read()
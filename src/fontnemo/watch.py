@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/watch.py
+"""Rename fonts as they land in watched directories (``fontnemo watch``).
+
+Changes are reported by Linux inotify (InotifyBackend, watching every
+directory below the roots, including ones created later) or, where inotify
+is unavailable, by comparing periodic snapshots of size, mtime and inode
+(PollingBackend). Only files changed after the watch starts are renamed.
+
+A build or copy writes a font in bursts, so a changed file is renamed once
+it has been quiet for ``debounce`` seconds (at least one poll interval when
+polling). Each rename resolves its parameters afresh, so ``timestamp``
+stamps every landed font with the time it was renamed.
+
+The watcher must not react to its own writes, or it would rename its
+outputs forever. It skips:
+
+- ``.fontnemo_tmp_*`` files, which save_font_safely renames into place
+- ``STEM--TIMESTAMP.EXT`` names (backups in mode 1, copies in mode 2)
+  whose TIMESTAMP is a make_timestamp value from since the watch began,
+  so a user's ``Font--bold.ttf`` is still renamed
+- files whose size, mtime and inode still match an output it wrote
+- files that are still being renamed
+"""
+
+import os
+import re
+import select
+import struct
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Final
+
+from fontnemo.discover import is_font_file, is_selected, parse_patterns
+from fontnemo.fileops import DEFAULT_DURABILITY
+from fontnemo.log import logger
+from fontnemo.operations import RenameResult, rename_font, resolve_params
+
+DEFAULT_DEBOUNCE: Final[float] = 0.5
+DEFAULT_POLL_INTERVAL: Final[float] = 1.0
+
+# Longest the watcher blocks, so stop() and finished renames are noticed
+MAX_WAIT: Final[float] = 0.2
+
+# Outputs of modes 1 and 2 (see save_font_safely): STEM--TIMESTAMP, where
+# TIMESTAMP is make_timestamp's lowercase base-36 without leading zeros
+STAMPED_STEM: Final[re.Pattern[str]] = re.compile(r"--([1-9a-z][0-9a-z]*)$")
+
+# inotify(7) event bits
+IN_CLOSE_WRITE: Final[int] = 0x00000008
+IN_MOVED_TO: Final[int] = 0x00000080
+IN_CREATE: Final[int] = 0x00000100
+IN_Q_OVERFLOW: Final[int] = 0x00004000
+IN_IGNORED: Final[int] = 0x00008000
+IN_ONLYDIR: Final[int] = 0x01000000
+IN_ISDIR: Final[int] = 0x40000000
+WATCH_MASK: Final[int] = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+_EVENT: Final[struct.Struct] = struct.Struct("iIII")
+
+# (size, mtime_ns, inode) of a file
+Stamp = tuple[int, int, int]
+
+
+def _stamp(path: str) -> Stamp | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class InotifyBackend:
+    """Changed files reported by Linux inotify, watched recursively."""
+
+    # Events arrive as they happen, so debouncing needs no minimum
+    interval = 0.0
+
+    def __init__(self, roots: Iterable[str]) -> None:
+        """Watch the roots and every directory below them.
+
+        Raises:
+            OSError: If inotify is unavailable or a root cannot be watched
+                (e.g. fs.inotify.max_user_watches is exhausted)
+        """
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this system")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        self._dirs: dict[int, str] = {}
+        try:
+            for root in roots:
+                self._watch_tree(root)
+        except BaseException:
+            self.close()
+            raise
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            import ctypes
+
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        # Watching a moved directory again returns its watch with the new path
+        self._dirs[wd] = directory
+
+    def _watch_tree(self, root: str) -> list[str]:
+        """Watch root and its subdirectories; return the files already in them."""
+        files = []
+        for directory, _, names in os.walk(root):
+            self._watch(directory)
+            files += [os.path.join(directory, name) for name in names]
+        return files
+
+    def changes(self, timeout: float) -> list[str]:
+        """Return the files written or moved in, waiting up to timeout seconds."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        paths: list[str] = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("Watch: inotify queue overflowed, changes were lost")
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if not mask & IN_ISDIR:
+                paths.append(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                # Files may land before the new directory is watched
+                try:
+                    paths += self._watch_tree(path)
+                except OSError as e:
+                    logger.warning(f"Watch: {e}")
+        return paths
+
+    def close(self) -> None:
+        """Close the inotify descriptor (and every watch with it)."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingBackend:
+    """Changed files found by comparing periodic snapshots of the roots."""
+
+    def __init__(
+        self, roots: Iterable[str], interval: float = DEFAULT_POLL_INTERVAL
+    ) -> None:
+        """Take the baseline snapshot; files in it are not reported."""
+        self.roots = list(roots)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def _scan(self) -> dict[str, Stamp]:
+        snapshot = {}
+        stack = list(self.roots)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            snapshot[entry.path] = (
+                                st.st_size,
+                                st.st_mtime_ns,
+                                st.st_ino,
+                            )
+                    except OSError:
+                        continue
+        return snapshot
+
+    def changes(self, timeout: float) -> list[str]:
+        """Return the files new or changed since the last poll, if one is due."""
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(wait, 0.0))
+        self._next = time.monotonic() + self.interval
+        previous, self._snapshot = self._snapshot, self._scan()
+        return [p for p, stamp in self._snapshot.items() if previous.get(p) != stamp]
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class FontWatcher:
+    """Debounces changes under the roots and renames the fonts that landed."""
+
+    def __init__(
+        self,
+        roots: Iterable[str | Path],
+        operation: str,
+        params: dict[str, Any],
+        output_path: str = "0",
+        verify: bool = False,
+        durability: str = DEFAULT_DURABILITY,
+        include: str | Iterable[str] | None = None,
+        exclude: str | Iterable[str] | None = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        polling: bool = False,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        jobs: int = 1,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple[Any, ...] = (),
+        on_result: Callable[[RenameResult], None] | None = None,
+    ) -> None:
+        """Set up a watch; nothing is watched until run().
+
+        Args:
+            roots: Directories to watch recursively
+            operation: Operation applied to landed fonts (see OPERATIONS)
+            params: Its parameters, resolved again for every rename
+            output_path: Output mode or directory (see rename_font)
+            verify: Re-check each written file
+            durability: Durability level of each save
+            include: Patterns landed files must match
+            exclude: Patterns of files and directories to ignore
+            debounce: Seconds a file must be quiet before it is renamed
+            polling: Poll instead of using inotify
+            interval: Seconds between polls
+            jobs: Worker processes renaming fonts (1 = in-process)
+            initializer: Optional per-process setup (e.g. logging)
+            initargs: Arguments for initializer
+            on_result: Called with the result of every rename
+
+        Raises:
+            ValueError: If a root is not a directory or params are invalid
+        """
+        self.roots = [os.path.abspath(root) for root in roots]
+        for root in self.roots:
+            if not os.path.isdir(root):
+                raise ValueError(f"Not a directory: {root}")
+        resolve_params(operation, params)
+        self.operation = operation
+        self.params = params
+        self.output_path = str(output_path)
+        self.verify = verify
+        self.durability = durability
+        self.include = parse_patterns(include)
+        self.exclude = parse_patterns(exclude)
+        self.debounce = debounce
+        self.polling = polling
+        self.interval = interval
+        self.jobs = jobs
+        self.initializer = initializer
+        self.initargs = initargs
+        self.on_result = on_result
+        self._stopped = False
+        self._pending: dict[str, float] = {}
+        self._running: dict[str, Any] = {}
+        self._written: dict[str, Stamp] = {}
+        self._started = int(time.time())
+
+    def stop(self) -> None:
+        """Make run() return (from another thread or a signal handler)."""
+        self._stopped = True
+
+    def _open_backend(self) -> InotifyBackend | PollingBackend:
+        if not self.polling:
+            try:
+                return InotifyBackend(self.roots)
+            except OSError as e:
+                logger.warning(f"Watch: {e}; polling instead")
+        return PollingBackend(self.roots, self.interval)
+
+    def run(self) -> None:
+        """Watch and rename until stop() is called."""
+        backend = self._open_backend()
+        debounce = max(self.debounce, backend.interval)
+        kind = "inotify" if isinstance(backend, InotifyBackend) else "polling"
+        logger.info(f"Watching {len(self.roots)} directory(ies) with {kind}")
+
+        pool = None
+        if self.jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        try:
+            while not self._stopped:
+                now = time.monotonic()
+                wait = min(
+                    (t + debounce - now for t in self._pending.values()),
+                    default=MAX_WAIT,
+                )
+                for path in backend.changes(min(max(wait, 0.0), MAX_WAIT)):
+                    if self._wanted(path):
+                        self._pending[path] = time.monotonic()
+                self._collect()
+                self._dispatch(time.monotonic() - debounce, pool)
+        finally:
+            backend.close()
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            self._collect()
+
+    def _wanted(self, path: str) -> bool:
+        """Return True if a changed path may be a font to rename."""
+        root = next(
+            (r for r in self.roots if path.startswith(os.path.join(r, ""))), None
+        )
+        if root is None:
+            return False
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        if not is_selected(rel, self.include, self.exclude):
+            return False
+        return not self._own_stamp(Path(path).stem)
+
+    def _own_stamp(self, stem: str) -> bool:
+        """Return True if stem carries a timestamp this watch could write."""
+        match = STAMPED_STEM.search(stem)
+        if match is None:
+            return False
+        # The value bounds the length too: a stamp written since the watch
+        # began has as many digits as make_timestamp() gives now
+        return self._started <= int(match[1], 36) <= time.time()
+
+    def _dispatch(self, quiet_since: float, pool: Any) -> None:
+        """Rename the pending files that have been quiet long enough."""
+        due = [
+            path
+            for path, changed in self._pending.items()
+            if changed <= quiet_since and path not in self._running
+        ]
+        if not due:
+            return
+        params = resolve_params(self.operation, self.params)
+        for path in due:
+            del self._pending[path]
+            stamp = _stamp(path)
+            if stamp is None or self._written.get(path) == stamp:
+                continue
+            if not is_font_file(path):
+                continue
+            args = (
+                path,
+                self.operation,
+                params,
+                self.output_path,
+                self.verify,
+                None,
+                None,
+                False,
+                self.durability,
+            )
+            if pool is None:
+                self._finish(rename_font(*args))
+            else:
+                self._running[path] = pool.submit(rename_font, *args)
+
+    def _collect(self) -> None:
+        """Finish the renames that workers have completed."""
+        for path, future in list(self._running.items()):
+            if not future.done():
+                continue
+            del self._running[path]
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                result = RenameResult(input_path=Path(path), error=str(e))
+            self._finish(result)
+
+    def _finish(self, result: RenameResult) -> None:
+        """Remember the outputs' stamps, so their events are ignored."""
+        if result.ok:
+            outputs = result.output_paths or [result.output_path or result.input_path]
+            for output in outputs:
+                path = os.path.abspath(output)
+                if (stamp := _stamp(path)) is not None:
+                    self._written[path] = stamp
+        if self.on_result is not None:
+            self.on_result(result)
@@ -0,0 +1,831 @@
+#!/usr/bin/env python3
+# this_file: src/fontnemo/woff.py
+"""WOFF 1.0 and WOFF 2.0 web font containers: table access and name-only writes.
+
+WOFF 1.0 compresses every table separately with zlib. A rename decompresses
+and recompresses only the ``name`` table and the small ``head`` table (whose
+checkSumAdjustment changes); the compressed streams of all other tables are
+copied through byte-for-byte.
+
+WOFF 2.0 stores all tables in a single brotli stream, with ``glyf``, ``loca``
+and possibly ``hmtx`` transformed. A rename decompresses the stream, swaps the
+``name`` table bytes and compresses the stream again. Transformed tables are
+kept as they are, so no glyph data is reconstructed or re-encoded, but the
+brotli compression of the whole stream remains the dominant cost. WOFF 2.0
+requires the optional ``brotli`` package.
+"""
+
+import io
+import struct
+import zlib
+from collections.abc import Mapping, Sequence
+from typing import Any, BinaryIO, Final, NamedTuple
+
+from fontnemo.sfnt import (
+    HEAD_CHECKSUM_ADJUSTMENT_OFFSET,
+    SFNT_HEADER_SIZE,
+    TABLE_RECORD_SIZE,
+    TTC_TAG,
+    WOFF2_TAG,
+    WOFF_TAG,
+    TableEntry,
+    calc_checksum,
+    checksum_adjustment,
+    head_checksum,
+    pack_directory,
+    pad4,
+    read_sfnt_directory,
+)
+
+# WOFF 1.0 header: signature, flavor, length, numTables, reserved,
+# totalSfntSize, majorVersion, minorVersion, metaOffset, metaLength,
+# metaOrigLength, privOffset, privLength
+WOFF_HEADER_FORMAT: Final[str] = ">4sLLHHLHHLLLLL"
+WOFF_HEADER_SIZE: Final[int] = struct.calcsize(WOFF_HEADER_FORMAT)
+
+# WOFF 1.0 table directory entry: tag, offset, compLength, origLength,
+# origChecksum
+WOFF_TABLE_FORMAT: Final[str] = ">4sLLLL"
+WOFF_TABLE_SIZE: Final[int] = struct.calcsize(WOFF_TABLE_FORMAT)
+
+# zlib level for recompressed WOFF 1.0 tables (the fontTools default)
+ZLIB_COMPRESSION_LEVEL: Final[int] = 6
+
+# WOFF 2.0 header: signature, flavor, length, numTables, reserved,
+# totalSfntSize, totalCompressedSize, majorVersion, minorVersion, metaOffset,
+# metaLength, metaOrigLength, privOffset, privLength
+WOFF2_HEADER_FORMAT: Final[str] = ">4sLLHHLLHHLLLLL"
+WOFF2_HEADER_SIZE: Final[int] = struct.calcsize(WOFF2_HEADER_FORMAT)
+
+# Tags encoded by index in the low 6 bits of WOFF 2.0 table flags
+WOFF2_KNOWN_TAGS: Final[tuple[str, ...]] = (
+    "cmap", "head", "hhea", "hmtx", "maxp", "name", "OS/2", "post",
+    "cvt ", "fpgm", "glyf", "loca", "prep", "CFF ", "VORG", "EBDT",
+    "EBLC", "gasp", "hdmx", "kern", "LTSH", "PCLT", "VDMX", "vhea",
+    "vmtx", "BASE", "GDEF", "GPOS", "GSUB", "EBSC", "JSTF", "MATH",
+    "CBDT", "CBLC", "COLR", "CPAL", "SVG ", "sbix", "acnt", "avar",
+    "bdat", "bloc", "bsln", "cvar", "fdsc", "feat", "fmtx", "fvar",
+    "gvar", "hsty", "just", "lcar", "mort", "morx", "opbd", "prop",
+    "trak", "Zapf", "Silf", "Glat", "Gloc", "Feat", "Sill",
+)  # fmt: skip
+
+# Flags index meaning "an explicit 4-byte tag follows"
+WOFF2_EXPLICIT_TAG: Final[int] = 63
+
+# Tables for which transform version 0 is a real transform (for all other
+# tables version 0 is the null transform)
+WOFF2_TRANSFORMED_BY_DEFAULT: Final[frozenset[str]] = frozenset({"glyf", "loca"})
+
+# brotli settings used by fontTools' WOFF 2.0 writer
+BROTLI_QUALITY: Final[int] = 11
+
+
+class WoffTableEntry(NamedTuple):
+    """One record of the WOFF 1.0 table directory."""
+
+    tag: str
+    offset: int
+    comp_length: int
+    orig_length: int
+    orig_checksum: int
+
+
+class Woff2TableEntry(NamedTuple):
+    """One record of the WOFF 2.0 table directory.
+
+    ``offset`` is the position in the decompressed table stream;
+    ``transform_length`` is None for tables stored untransformed.
+    """
+
+    tag: str
+    flags: int
+    orig_length: int
+    transform_length: int | None
+    offset: int
+
+    @property
+    def length(self) -> int:
+        """Length of the table data in the decompressed stream."""
+        if self.transform_length is None:
+            return self.orig_length
+        return self.transform_length
+
+
+class WoffDirectory(NamedTuple):
+    """Parsed WOFF 1.0 or 2.0 header and table directory.
+
+    For WOFF 2.0, ``data_offset`` and ``data_length`` locate the compressed
+    table stream; for WOFF 1.0 they are 0.
+    """
+
+    signature: bytes
+    flavor: int
+    major_version: int
+    minor_version: int
+    tables: dict[str, Any]
+    metadata: tuple[int, int, int]  # offset, length, origLength
+    private: tuple[int, int]  # offset, length
+    total_sfnt_size: int
+    data_offset: int = 0
+    data_length: int = 0
+
+
+def is_woff(buf: bytes | memoryview | Any) -> bool:
+    """Return True if buf starts with a WOFF 1.0 or WOFF 2.0 signature."""
+    return bytes(buf[:4]) in (WOFF_TAG, WOFF2_TAG)
+
+
+def _brotli() -> Any:
+    """Import brotli, explaining how to install it if missing."""
+    try:
+        import brotli
+    except ImportError as e:
+        raise ImportError(
+            "WOFF2 support requires the brotli package (pip install 'fontnemo[woff]')"
+        ) from e
+    return brotli
+
+
+def _check_block(buf: Any, offset: int, length: int, what: str) -> None:
+    """Raise ValueError if a block lies outside the buffer."""
+    if offset + length > len(buf):
+        raise ValueError(f"{what} extends past end of file")
+
+
+def read_woff_directory(buf: bytes | memoryview | Any) -> WoffDirectory:
+    """Parse the header and table directory of a WOFF 1.0 font.
+
+    Args:
+        buf: WOFF file contents
+
+    Returns:
+        WoffDirectory with WoffTableEntry tables in directory order
+
+    Raises:
+        ValueError: If buf is not a valid WOFF 1.0 font
+    """
+    if len(buf) < WOFF_HEADER_SIZE or bytes(buf[:4]) != WOFF_TAG:
+        raise ValueError("Not a WOFF font")
+    (
+        _signature,
+        flavor,
+        _length,
+        num_tables,
+        _reserved,
+        total_sfnt_size,
+        major_version,
+        minor_version,
+        meta_offset,
+        meta_length,
+        meta_orig_length,
+        priv_offset,
+        priv_length,
+    ) = struct.unpack_from(WOFF_HEADER_FORMAT, buf, 0)
+
+    _check_block(buf, WOFF_HEADER_SIZE, num_tables * WOFF_TABLE_SIZE, "Directory")
+    tables: dict[str, WoffTableEntry] = {}
+    for i in range(num_tables):
+        tag, offset, comp_length, orig_length, checksum = struct.unpack_from(
+            WOFF_TABLE_FORMAT, buf, WOFF_HEADER_SIZE + i * WOFF_TABLE_SIZE
+        )
+        tag_str = tag.decode("latin-1")
+        _check_block(buf, offset, comp_length, f"Table {tag_str!r}")
+        if comp_length > orig_length:
+            raise ValueError(f"Table {tag_str!r} has invalid compressed length")
+        tables[tag_str] = WoffTableEntry(
+            tag_str, offset, comp_length, orig_length, checksum
+        )
+    _check_block(buf, meta_offset, meta_length, "Metadata")
+    _check_block(buf, priv_offset, priv_length, "Private data")
+
+    return WoffDirectory(
+        signature=WOFF_TAG,
+        flavor=flavor,
+        major_version=major_version,
+        minor_version=minor_version,
+        tables=tables,
+        metadata=(meta_offset, meta_length, meta_orig_length),
+        private=(priv_offset, priv_length),
+        total_sfnt_size=total_sfnt_size,
+    )
+
+
+def _read_base128(buf: Any, pos: int) -> tuple[int, int]:
+    """Decode a WOFF 2.0 UIntBase128 value; return (value, next position)."""
+    value = 0
+    for i in range(5):
+        if pos >= len(buf):
+            raise ValueError("Truncated WOFF2 table directory")
+        byte = buf[pos]
+        pos += 1
+        if i == 0 and byte == 0x80:
+            raise ValueError("UIntBase128 value with leading zeros")
+        if value & 0xFE000000:
+            raise ValueError("UIntBase128 value overflows 32 bits")
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+    raise ValueError("UIntBase128 value longer than 5 bytes")
+
+
+def _pack_base128(value: int) -> bytes:
+    """Encode a value as WOFF 2.0 UIntBase128."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def read_woff2_directory(buf: bytes | memoryview | Any) -> WoffDirectory:
+    """Parse the header and table directory of a WOFF 2.0 font.
+
+    Args:
+        buf: WOFF2 file contents
+
+    Returns:
+        WoffDirectory with Woff2TableEntry tables in stream order
+
+    Raises:
+        ValueError: If buf is not a valid single-font WOFF 2.0 file
+    """
+    if len(buf) < WOFF2_HEADER_SIZE or bytes(buf[:4]) != WOFF2_TAG:
+        raise ValueError("Not a WOFF2 font")
+    (
+        _signature,
+        flavor,
+        _length,
+        num_tables,
+        _reserved,
+        total_sfnt_size,
+        total_compressed_size,
+        major_version,
+        minor_version,
+        meta_offset,
+        meta_length,
+        meta_orig_length,
+        priv_offset,
+        priv_length,
+    ) = struct.unpack_from(WOFF2_HEADER_FORMAT, buf, 0)
+    if struct.pack(">L", flavor) == TTC_TAG:
+        raise ValueError("WOFF2 font collections are not supported")
+
+    tables: dict[str, Woff2TableEntry] = {}
+    pos = WOFF2_HEADER_SIZE
+    offset = 0
+    for _ in range(num_tables):
+        if pos >= len(buf):
+            raise ValueError("Truncated WOFF2 table directory")
+        flags = buf[pos]
+        pos += 1
+        index = flags & 0x3F
+        if index == WOFF2_EXPLICIT_TAG:
+            _check_block(buf, pos, 4, "Table tag")
+            tag = bytes(buf[pos : pos + 4]).decode("latin-1")
+            pos += 4
+        else:
+            tag = WOFF2_KNOWN_TAGS[index]
+        orig_length, pos = _read_base128(buf, pos)
+
+        version = flags >> 6
+        if tag in WOFF2_TRANSFORMED_BY_DEFAULT:
+            transformed = version == 0
+        else:
+            transformed = version != 0
+        transform_length = None
+        if transformed:
+            transform_length, pos = _read_base128(buf, pos)
+
+        entry = Woff2TableEntry(tag, flags, orig_length, transform_length, offset)
+        tables[tag] = entry
+        offset += entry.length
+
+    _check_block(buf, pos, total_compressed_size, "Compressed data")
+    _check_block(buf, meta_offset, meta_length, "Metadata")
+    _check_block(buf, priv_offset, priv_length, "Private data")
+
+    return WoffDirectory(
+        signature=WOFF2_TAG,
+        flavor=flavor,
+        major_version=major_version,
+        minor_version=minor_version,
+        tables=tables,
+        metadata=(meta_offset, meta_length, meta_orig_length),
+        private=(priv_offset, priv_length),
+        total_sfnt_size=total_sfnt_size,
+        data_offset=pos,
+        data_length=total_compressed_size,
+    )
+
+
+def read_woff2_stream(buf: bytes | memoryview | Any) -> tuple[WoffDirectory, bytes]:
+    """Read the directory and the decompressed table stream of a WOFF 2.0 font.
+
+    Raises:
+        ValueError: If the stream does not match the table directory
+    """
+    directory = read_woff2_directory(buf)
+    start = directory.data_offset
+    compressed = bytes(buf[start : start + directory.data_length])
+    try:
+        stream = _brotli().decompress(compressed)
+    except ImportError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Cannot decompress WOFF2 data: {e}") from e
+    expected = sum(entry.length for entry in directory.tables.values())
+    if len(stream) != expected:
+        raise ValueError("WOFF2 data does not match its table directory")
+    return directory, stream
+
+
+def read_woff_table(buf: bytes | memoryview | Any, tag: str) -> bytes:
+    """Return the decompressed data of one table of a WOFF 1.0 or 2.0 font.
+
+    For WOFF 1.0 only that table is decompressed. For WOFF 2.0 the whole
+    table stream has to be decompressed; transformed tables are rejected.
+
+    Args:
+        buf: WOFF or WOFF2 file contents
+        tag: Table tag
+
+    Returns:
+        Table data as stored in the equivalent sfnt font
+
+    Raises:
+        ValueError: If the font or table is missing, corrupt or transformed
+    """
+    if bytes(buf[:4]) == WOFF2_TAG:
+        directory, stream = read_woff2_stream(buf)
+        entry2 = directory.tables.get(tag)
+        if entry2 is None:
+            raise ValueError(f"Font has no {tag!r} table")
+        if entry2.transform_length is not None:
+            raise ValueError(f"Table {tag!r} is transformed")
+        return stream[entry2.offset : entry2.offset + entry2.length]
+
+    entry = read_woff_directory(buf).tables.get(tag)
+    if entry is None:
+        raise ValueError(f"Font has no {tag!r} table")
+    return _decompress_table(buf, entry)
+
+
+def _decompress_table(buf: Any, entry: WoffTableEntry) -> bytes:
+    """Return the decompressed data of a WOFF 1.0 table."""
+    data = bytes(buf[entry.offset : entry.offset + entry.comp_length])
+    if entry.comp_length < entry.orig_length:
+        try:
+            data = zlib.decompress(data)
+        except zlib.error as e:
+            raise ValueError(f"Cannot decompress table {entry.tag!r}: {e}") from e
+    if len(data) != entry.orig_length:
+        raise ValueError(f"Table {entry.tag!r} has wrong decompressed length")
+    return data
+
+
+def _compress_table(data: bytes) -> bytes:
+    """zlib-compress a WOFF 1.0 table, or keep it raw if that is not smaller."""
+    compressed = zlib.compress(data, ZLIB_COMPRESSION_LEVEL)
+    return compressed if len(compressed) < len(data) else data
+
+
+def _sfnt_offsets(lengths: Mapping[str, int]) -> dict[str, int]:
+    """Offsets of tables in the decoded sfnt font.
+
+    Decoders lay tables out in the order of their data in the WOFF file
+    (which for fontTools output is also the order they were compiled in), so
+    lengths must be given in that order.
+    """
+    offsets = {}
+    offset = SFNT_HEADER_SIZE + len(lengths) * TABLE_RECORD_SIZE
+    for tag, length in lengths.items():
+        offsets[tag] = offset
+        offset += pad4(length)
+    return offsets
+
+
+def _decoded_adjustment(
+    flavor: int, checksums: Mapping[str, int], lengths: Mapping[str, int]
+) -> int:
+    """head.checkSumAdjustment of the sfnt font a WOFF file decodes to.
+
+    Args:
+        flavor: sfntVersion of the decoded font
+        checksums: Table checksums keyed by tag
+        lengths: Uncompressed table lengths, in the order of the table data
+    """
+    offsets = _sfnt_offsets(lengths)
+    entries = [
+        TableEntry(tag, checksums[tag], offsets[tag], lengths[tag]) for tag in offsets
+    ]
+    directory = pack_directory(struct.pack(">L", flavor), entries)
+    return checksum_adjustment(directory, entries)
+
+
+def _physical_order(tables: Mapping[str, WoffTableEntry]) -> list[WoffTableEntry]:
+    """WOFF 1.0 table entries in the order of their data in the file."""
+    return sorted(tables.values(), key=lambda e: e.offset)
+
+
+def _write_blocks(
+    out: BinaryIO, chunks: Sequence[bytes | memoryview], pad_last: bool
+) -> None:
+    """Write data blocks, each padded to 4 bytes (the last one optionally)."""
+    for i, data in enumerate(chunks):
+        out.write(data)
+        padding = pad4(len(data)) - len(data)
+        if padding and (pad_last or i < len(chunks) - 1):
+            out.write(b"\0" * padding)
+
+
+def _extension_blocks(
+    buf: Any, directory: WoffDirectory, offset: int
+) -> tuple[list[memoryview], tuple[int, int, int], tuple[int, int], int]:
+    """Place the metadata and private blocks of a source font at offset.
+
+    Returns:
+        (blocks, metadata header fields, private header fields, end offset)
+    """
+    view = memoryview(buf)
+    blocks = []
+    meta_offset, meta_length, meta_orig_length = directory.metadata
+    priv_offset, priv_length = directory.private
+    metadata = (0, 0, 0)
+    private = (0, 0)
+    if meta_length:
+        blocks.append(view[meta_offset : meta_offset + meta_length])
+        metadata = (offset, meta_length, meta_orig_length)
+        offset += pad4(meta_length) if priv_length else meta_length
+    if priv_length:
+        blocks.append(view[priv_offset : priv_offset + priv_length])
+        private = (offset, priv_length)
+        offset += priv_length
+    return blocks, metadata, private, offset
+
+
+def write_woff(
+    src: bytes | memoryview | Any,
+    out: BinaryIO,
+    replacements: Mapping[str, bytes],
+) -> None:
+    """Write a copy of a WOFF 1.0 font with some tables replaced.
+
+    Replaced tables and ``head`` are compressed again; every other table's
+    compressed data is copied byte-for-byte. head.checkSumAdjustment is
+    recomputed for the decoded sfnt font. Metadata and private blocks are kept.
+
+    Args:
+        src: Source WOFF file contents
+        out: Binary file object to write to
+        replacements: New (uncompressed) table data keyed by tag
+
+    Raises:
+        ValueError: If src is not a WOFF font or a replacement tag is missing
+    """
+    directory = read_woff_directory(src)
+    tables: dict[str, WoffTableEntry] = directory.tables
+    missing = set(replacements) - set(tables)
+    if missing:
+        raise ValueError(f"Tables not present in source font: {sorted(missing)}")
+
+    new_data = dict(replacements)
+    checksums = {tag: entry.orig_checksum for tag, entry in tables.items()}
+    lengths = {e.tag: e.orig_length for e in _physical_order(tables)}
+    for tag, table in replacements.items():
+        checksums[tag] = calc_checksum(table)
+        lengths[tag] = len(table)
+
+    if "head" in tables:
+        head = bytearray(new_data.get("head") or _decompress_table(src, tables["head"]))
+        checksums["head"] = head_checksum(head)
+        struct.pack_into(
+            ">L",
+            head,
+            HEAD_CHECKSUM_ADJUSTMENT_OFFSET,
+            _decoded_adjustment(directory.flavor, checksums, lengths),
+        )
+        new_data["head"] = bytes(head)
+
+    # Table data keeps the source order; directory records are sorted by tag
+    view = memoryview(src)
+    offset = WOFF_HEADER_SIZE + len(tables) * WOFF_TABLE_SIZE
+    records: dict[str, bytes] = {}
+    chunks: list[bytes | memoryview] = []
+    for entry in _physical_order(tables):
+        if entry.tag in new_data:
+            data: bytes | memoryview = _compress_table(new_data[entry.tag])
+        else:
+            data = view[entry.offset : entry.offset + entry.comp_length]
+        records[entry.tag] = struct.pack(
+            WOFF_TABLE_FORMAT,
+            entry.tag.encode("latin-1"),
+            offset,
+            len(data),
+            lengths[entry.tag],
+            checksums[entry.tag],
+        )
+        chunks.append(data)
+        offset += pad4(len(data))
+
+    blocks, metadata, private, length = _extension_blocks(src, directory, offset)
+    total_sfnt_size = (
+        SFNT_HEADER_SIZE
+        + len(tables) * TABLE_RECORD_SIZE
+        + sum(pad4(n) for n in lengths.values())
+    )
+
+    out.write(
+        struct.pack(
+            WOFF_HEADER_FORMAT,
+            WOFF_TAG,
+            directory.flavor,
+            length,
+            len(tables),
+            0,
+            total_sfnt_size,
+            directory.major_version,
+            directory.minor_version,
+            *metadata,
+            *private,
+        )
+    )
+    for tag in sorted(records, key=lambda t: t.encode("latin-1")):
+        out.write(records[tag])
+    _write_blocks(out, [*chunks, *blocks], pad_last=not blocks)
+
+
+def write_woff2(
+    src: bytes | memoryview | Any,
+    out: BinaryIO,
+    replacements: Mapping[str, bytes],
+) -> None:
+    """Write a copy of a WOFF 2.0 font with some untransformed tables replaced.
+
+    The table stream is decompressed, the replaced tables are swapped in and
+    the stream is brotli-compressed again; transformed tables (glyf, loca,
+    hmtx) are copied as they are. As the checksums of transformed tables are
+    not stored, head.checkSumAdjustment is updated by the change in the
+    replaced tables' checksums, lengths and offsets.
+
+    Args:
+        src: Source WOFF2 file contents
+        out: Binary file object to write to
+        replacements: New table data keyed by tag
+
+    Raises:
+        ValueError: If src is not a WOFF2 font or a replacement is invalid
+    """
+    directory, stream = read_woff2_stream(src)
+    tables: dict[str, Woff2TableEntry] = directory.tables
+    missing = set(replacements) - set(tables)
+    if missing:
+        raise ValueError(f"Tables not present in source font: {sorted(missing)}")
+    for tag in replacements:
+        if tables[tag].transform_length is not None:
+            raise ValueError(f"Cannot replace transformed table {tag!r}")
+
+    view = memoryview(stream)
+    new_data: dict[str, bytes | memoryview] = dict(replacements)
+
+    if "head" in tables:
+        entry = tables["head"]
+        head = bytearray(
+            new_data.get("head") or view[entry.offset : entry.offset + entry.length]
+        )
+        old_lengths = {tag: e.orig_length for tag, e in tables.items()}
+        new_lengths = dict(old_lengths)
+        for tag, table in replacements.items():
+            new_lengths[tag] = len(table)
+        old_offsets = _sfnt_offsets(old_lengths)
+        new_offsets = _sfnt_offsets(new_lengths)
+
+        # Each table's checksum is summed twice (table data and directory
+        # record), its offset and length once
+        delta = 0
+        for tag in tables:
+            delta += new_offsets[tag] - old_offsets[tag]
+            delta += new_lengths[tag] - old_lengths[tag]
+        for tag, new_table in new_data.items():
+            e = tables[tag]
+            old = view[e.offset : e.offset + e.length]
+            if tag == "head":
+                delta += 2 * (head_checksum(head) - head_checksum(old))
+            else:
+                delta += 2 * (calc_checksum(new_table) - calc_checksum(old))
+
+        (adjustment,) = struct.unpack_from(">L", head, HEAD_CHECKSUM_ADJUSTMENT_OFFSET)
+        struct.pack_into(
+            ">L",
+            head,
+            HEAD_CHECKSUM_ADJUSTMENT_OFFSET,
+            (adjustment - delta) & 0xFFFFFFFF,
+        )
+        new_data["head"] = bytes(head)
+
+    records = []
+    parts: list[bytes | memoryview] = []
+    total_sfnt_size = directory.total_sfnt_size
+    for entry in tables.values():
+        data: bytes | memoryview
+        if entry.tag in new_data:
+            data = new_data[entry.tag]
+            orig_length = len(data)
+            total_sfnt_size += pad4(orig_length) - pad4(entry.orig_length)
+        else:
+            data = view[entry.offset : entry.offset + entry.length]
+            orig_length = entry.orig_length
+        parts.append(data)
+
+        record = bytes([entry.flags])
+        if entry.flags & 0x3F == WOFF2_EXPLICIT_TAG:
+            record += entry.tag.encode("latin-1")
+        record += _pack_base128(orig_length)
+        if entry.transform_length is not None:
+            record += _pack_base128(entry.transform_length)
+        records.append(record)
+
+    brotli = _brotli()
+    compressed = brotli.compress(
+        b"".join(parts), mode=brotli.MODE_FONT, quality=BROTLI_QUALITY
+    )
+    table_directory = b"".join(records)
+
+    # The compressed stream directly follows the directory; both together
+    # are padded to 4 bytes
+    data_end = WOFF2_HEADER_SIZE + len(table_directory) + len(compressed)
+    blocks, metadata, private, length = _extension_blocks(
+        src, directory, pad4(data_end)
+    )
+    if not blocks:
+        length = pad4(data_end)
+
+    out.write(
+        struct.pack(
+            WOFF2_HEADER_FORMAT,
+            WOFF2_TAG,
+            directory.flavor,
+            length,
+            len(tables),
+            0,
+            total_sfnt_size,
+            len(compressed),
+            directory.major_version,
+            directory.minor_version,
+            *metadata,
+            *private,
+        )
+    )
+    out.write(table_directory)
+    out.write(compressed)
+    out.write(b"\0" * (pad4(data_end) - data_end))
+    _write_blocks(out, blocks, pad_last=False)
+
+
+def encode_woff(sfnt: bytes | memoryview | Any) -> bytes:
+    """Compress a single sfnt font to WOFF 1.0.
+
+    Every table is zlib-compressed (or stored raw if that is smaller) in the
+    order of the source file. head.checkSumAdjustment is set for that
+    layout, and the WOFF version is taken from head.fontRevision, as
+    fontTools does.
+
+    Args:
+        sfnt: Uncompressed font file contents
+
+    Returns:
+        WOFF file contents
+
+    Raises:
+        ValueError: If sfnt is not a single sfnt font
+    """
+    directory = read_sfnt_directory(sfnt)
+    view = memoryview(sfnt)
+    ordered = sorted(directory.tables.values(), key=lambda e: e.offset)
+    data = {e.tag: bytes(view[e.offset : e.offset + e.length]) for e in ordered}
+    checksums = {e.tag: e.checksum for e in ordered}
+    lengths = {e.tag: e.length for e in ordered}
+    (flavor,) = struct.unpack(">L", directory.sfnt_version)
+
+    major_version = minor_version = 0
+    if "head" in data:
+        head = bytearray(data["head"])
+        major_version, minor_version = struct.unpack_from(">HH", head, 4)
+        checksums["head"] = head_checksum(head)
+        struct.pack_into(
+            ">L",
+            head,
+            HEAD_CHECKSUM_ADJUSTMENT_OFFSET,
+            _decoded_adjustment(flavor, checksums, lengths),
+        )
+        data["head"] = bytes(head)
+
+    offset = WOFF_HEADER_SIZE + len(ordered) * WOFF_TABLE_SIZE
+    records = []
+    chunks: list[bytes | memoryview] = []
+    for entry in ordered:
+        compressed = _compress_table(data[entry.tag])
+        records.append(
+            struct.pack(
+                WOFF_TABLE_FORMAT,
+                entry.tag.encode("latin-1"),
+                offset,
+                len(compressed),
+                entry.length,
+                checksums[entry.tag],
+            )
+        )
+        chunks.append(compressed)
+        offset += pad4(len(compressed))
+    records.sort()
+
+    total_sfnt_size = (
+        SFNT_HEADER_SIZE
+        + len(ordered) * TABLE_RECORD_SIZE
+        + sum(pad4(n) for n in lengths.values())
+    )
+    out = io.BytesIO()
+    out.write(
+        struct.pack(
+            WOFF_HEADER_FORMAT,
+            WOFF_TAG,
+            flavor,
+            offset,
+            len(ordered),
+            0,
+            total_sfnt_size,
+            major_version,
+            minor_version,
+            0,
+            0,
+            0,
+            0,
+            0,
+        )
+    )
+    out.writelines(records)
+    _write_blocks(out, chunks, pad_last=True)
+    return out.getvalue()
+
+
+def encode_woff2(sfnt: bytes | memoryview | Any) -> bytes:
+    """Compress a single sfnt font to WOFF 2.0 with the fontTools encoder.
+
+    The glyf/loca transform needs the decompiled glyphs, so this is left to
+    fontTools; it dominates the cost together with brotli compression.
+
+    Args:
+        sfnt: Uncompressed font file contents
+
+    Returns:
+        WOFF2 file contents
+    """
+    _brotli()
+    from fontTools.ttLib import TTFont  # type: ignore[import-untyped]
+
+    font = TTFont(io.BytesIO(bytes(sfnt)), recalcTimestamp=False)
+    try:
+        font.flavor = "woff2"
+        out = io.BytesIO()
+        font.save(out)
+    finally:
+        font.close()
+    return out.getvalue()
+
+
+def verify_woff(buf: bytes | memoryview | Any) -> None:
+    """Verify the name and head tables of a WOFF 1.0 or 2.0 font.
+
+    For WOFF 1.0 the decompressed ``name`` and ``head`` tables must match
+    their stored checksums and head.checkSumAdjustment must agree with the
+    decoded sfnt directory. WOFF 2.0 stores no table checksums, so only the
+    table stream is decompressed and checked against the directory.
+
+    Raises:
+        ValueError: If the font is corrupt or a checksum mismatches
+    """
+    if bytes(buf[:4]) == WOFF2_TAG:
+        directory, _ = read_woff2_stream(buf)
+        for tag in ("name", "head"):
+            if tag not in directory.tables:
+                raise ValueError(f"Font has no {tag!r} table")
+        return
+
+    directory = read_woff_directory(buf)
+    tables: dict[str, WoffTableEntry] = directory.tables
+    for tag in ("name", "head"):
+        if tag not in tables:
+            raise ValueError(f"Font has no {tag!r} table")
+
+    name = _decompress_table(buf, tables["name"])
+    head = _decompress_table(buf, tables["head"])
+    if calc_checksum(name) != tables["name"].orig_checksum:
+        raise ValueError("'name' table checksum mismatch")
+    if head_checksum(head) != tables["head"].orig_checksum:
+        raise ValueError("'head' table checksum mismatch")
+
+    checksums = {tag: entry.orig_checksum for tag, entry in tables.items()}
+    lengths = {e.tag: e.orig_length for e in _physical_order(tables)}
+    (adjustment,) = struct.unpack_from(">L", head, HEAD_CHECKSUM_ADJUSTMENT_OFFSET)
+    if adjustment != _decoded_adjustment(directory.flavor, checksums, lengths):
+        raise ValueError("head.checkSumAdjustment does not match directory")
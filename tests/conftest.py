@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# this_file: tests/conftest.py
+"""Shared fixtures for the test suite."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def test_font_path() -> Path:
+    """Return path to test font fixture."""
+    return Path(__file__).parent / "fixtures" / "test_font_basic.ttf"
+
+
+@pytest.fixture
+def temp_font_copy(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create temporary copy of test font."""
+    temp_font = tmp_path / "test_font_copy.ttf"
+    shutil.copy(test_font_path, temp_font)
+    return temp_font
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from fontTools import fontBuilder
 from fontTools.pens.t2CharStringPen import T2CharStringPen
-from fontTools.ttLib import TTFont
+from fontTools.ttLib import TTCollection, TTFont
 
 
 def create_minimal_font(output_path: Path, family_name: str) -> None:
@@ -89,6 +89,30 @@ def create_minimal_font(output_path: Path, family_name: str) -> None:
     print(f"Created: {output_path}")
 
 
+def create_collection(
+    output_path: Path, source_path: Path, family_names: list[str]
+) -> None:
+    """Create a font collection with one face per family name.
+
+    All faces are copies of the source font, so every table except ``name``
+    is shared between them.
+
+    Args:
+        output_path: Where to save the collection
+        source_path: Font to copy into each face
+        family_names: Family name of each face
+    """
+    collection = TTCollection()
+    for family_name in family_names:
+        font = TTFont(str(source_path))
+        name_table = font["name"]
+        for record in name_table.names:
+            if record.nameID in (1, 16):
+                record.string = family_name
+        collection.fonts.append(font)
+    collection.save(str(output_path), shareTables=True)
+
+
 def main() -> None:
     """Create test font fixtures."""
     fixtures_dir = Path(__file__).parent / "fixtures"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# this_file: tests/test_aio.py
+"""Tests for the asyncio API."""
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo import AsyncRenamer
+from fontnemo.aio import MemoryBudget
+from fontnemo.core import FontNameHandler
+
+
+@pytest.fixture
+def fonts(test_font_path: Path, tmp_path: Path) -> list[Path]:
+    """Return temporary copies of the test font."""
+    paths = [tmp_path / f"font{i}.ttf" for i in range(5)]
+    for path in paths:
+        shutil.copy(test_font_path, path)
+    return paths
+
+
+def test_read_and_rename(fonts: list[Path]) -> None:
+    """Test a font is read and renamed through the thread pool."""
+
+    async def run() -> tuple[str | None, str | None]:
+        async with AsyncRenamer(cpu_workers=0) as renamer:
+            result = await renamer.rename_font(fonts[0], "s", {"suffix": " X"})
+            assert result.ok, result.error
+            return (await renamer.read_font_names(fonts[0])).family_name, (
+                result.new_family_name
+            )
+
+    assert asyncio.run(run()) == ("Roboto X", "Roboto X")
+
+
+def test_rename_fonts_within_limits(
+    test_font_path: Path, fonts: list[Path], tmp_path: Path
+) -> None:
+    """Test a batch is renamed in order with one font in flight at a time."""
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    size = test_font_path.stat().st_size
+
+    async def run() -> list[str | None]:
+        # Room for one font's estimate only
+        async with AsyncRenamer(max_in_flight=3, memory_budget=size * 3) as renamer:
+            results = await renamer.rename_fonts(
+                fonts, "timestamp", {}, output_path=out_dir
+            )
+            assert renamer.budget.used == 0
+            return [result.new_family_name for result in results]
+
+    names = asyncio.run(run())
+    assert len(set(names)) == 1  # one timestamp for the whole batch
+    assert sorted(p.name for p in out_dir.iterdir()) == [p.name for p in fonts]
+
+
+def test_rename_font_data_in_process_pool(test_font_path: Path) -> None:
+    """Test in-memory renames run in worker processes."""
+
+    async def run() -> bytes:
+        async with AsyncRenamer(cpu_workers=1) as renamer:
+            return await renamer.rename_font_data(
+                test_font_path.read_bytes(), "new", {"new_family": "Async"}
+            )
+
+    handler = FontNameHandler(data=asyncio.run(run()))
+    assert handler.read_family_name() == "Async"
+
+
+def test_invalid_operation(test_font_path: Path) -> None:
+    """Test invalid operations are raised before any work is scheduled."""
+
+    async def run() -> None:
+        async with AsyncRenamer() as renamer:
+            await renamer.rename_font(test_font_path, "rotate", {})
+
+    with pytest.raises(ValueError, match="Unknown operation"):
+        asyncio.run(run())
+
+
+def test_memory_budget() -> None:
+    """Test reservations wait for room, and an oversized one runs alone."""
+    active: list[int] = []
+    peak = 0
+
+    async def hold(budget: MemoryBudget, size: int) -> None:
+        nonlocal peak
+        async with budget.reserve(size):
+            active.append(size)
+            if size > budget.limit:
+                assert active == [size]
+            peak = max(peak, sum(active))
+            await asyncio.sleep(0.01)
+            active.remove(size)
+
+    async def run() -> None:
+        budget = MemoryBudget(100)
+        await asyncio.gather(*(hold(budget, size) for size in (60, 60, 30, 500)))
+        assert budget.used == 0
+
+    asyncio.run(run())
+    # 60 + 30 fit together, the other 60 and 500 ran on their own
+    assert peak == 500
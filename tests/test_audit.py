@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# this_file: tests/test_audit.py
+"""Tests for the family slug and style collision audit."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo.__main__ import main
+from fontnemo.audit import AuditFace, FamilyAudit, near_key
+from fontnemo.operations import rename_font
+
+
+def face(path: str, name: str, slug: str, subfamily: str = "Regular") -> AuditFace:
+    """Return an audited face."""
+    return AuditFace(path, 0, name, slug, subfamily)
+
+
+class TestFamilyAudit:
+    """Tests for grouping faces into issues."""
+
+    def test_slug_collision(self) -> None:
+        """Test families that make_slug maps to one slug collide."""
+        audit = FamilyAudit()
+        audit.add(
+            [
+                face("a.ttf", "My Font", "MyFont"),
+                face("b.ttf", "My [Font]", "MyFont"),
+                face("c.ttf", "My Font", "MyFont", "Bold"),
+            ]
+        )
+        (issue,) = audit.issues()
+        assert (issue.kind, issue.key) == ("slug", "MyFont")
+        assert [f.path for f in issue.faces] == ["a.ttf", "b.ttf", "c.ttf"]
+
+    def test_duplicate_style_and_near_collision(self) -> None:
+        """Test duplicate family/subfamily and slugs differing in case."""
+        audit = FamilyAudit()
+        audit.add(
+            [
+                face("a.ttf", "Sans", "Sans"),
+                face("b.ttf", "sans", "sans"),
+                face("c.ttf", "Serif", "Serif"),
+            ]
+        )
+        issues = audit.issues()
+        assert [(i.kind, i.key) for i in issues] == [
+            ("style", "Sans Regular"),
+            ("near", "sans"),
+        ]
+        assert near_key("My-Font_2") == near_key("myfont2")
+
+    def test_planned_only(self) -> None:
+        """Test only issues involving a planned face are reported for a plan."""
+        audit = FamilyAudit()
+        planned = face("c.ttf", "Other", "Other")
+        planned.planned = True
+        audit.add([face("a.ttf", "A", "A"), face("b.ttf", "A", "A"), planned])
+        assert audit.issues(planned_only=True) == []
+        assert len(audit.issues()) == 1
+
+
+@pytest.fixture
+def library(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create a library with two distinct families."""
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    shutil.copy(test_font_path, directory / "roboto.ttf")
+    shutil.copy(test_font_path, directory / "other.ttf")
+    rename_font(directory / "other.ttf", "new", {"new_family": "Other Sans"})
+    return directory
+
+
+def test_cli_clean_library(library: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test a library without collisions passes."""
+    main(["audit", str(library)])
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "0 issue(s) in 2 face(s)" in captured.err
+
+
+def test_cli_would_collide(
+    library: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test a planned rename is checked against the library, writing nothing."""
+    before = (library / "other.ttf").read_bytes()
+    manifest = tmp_path / "plan.jsonl"
+    row = {"path": str(library / "other.ttf"), "operation": "new"}
+    manifest.write_text(json.dumps(row | {"new_family": "Ro-boto"}) + "\n")
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["audit", str(library), f"--manifest={manifest}", "--jsonl"])
+    assert exc_info.value.code == 1
+    (record,) = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert (record["kind"], record["key"]) == ("near", "roboto")
+    assert [f["planned"] for f in record["fonts"]] == [True, False]
+    assert (library / "other.ttf").read_bytes() == before
+
+
+def test_cli_rename_whole_batch(
+    library: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test --rename applies one planned rename to every input font."""
+    with pytest.raises(SystemExit):
+        main(["audit", str(library), "--rename=new:Same"])
+    assert capsys.readouterr().out.startswith("duplicate style: Same")
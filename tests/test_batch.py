@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# this_file: tests/test_batch.py
+"""Tests for batch module (input expansion and parallel runs)."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo.batch import expand_input_paths, resolve_jobs, run_batch
+from fontnemo.operations import read_font_names, rename_font
+
+
+@pytest.fixture
+def font_dir(tmp_path: Path) -> Path:
+    """Create a directory tree with several font copies and a non-font."""
+    source = Path(__file__).parent / "fixtures" / "test_font_basic.ttf"
+    for name in ("a.ttf", "b.ttf", "sub/c.otf"):
+        target = tmp_path / name
+        target.parent.mkdir(exist_ok=True)
+        shutil.copy(source, target)
+    (tmp_path / "notes.txt").write_text("not a font")
+    return tmp_path
+
+
+class TestExpandInputPaths:
+    """Tests for expand_input_paths."""
+
+    def test_directory_is_recursive(self, font_dir: Path) -> None:
+        """Test directories are searched recursively for fonts."""
+        paths = expand_input_paths([font_dir])
+        assert [p.name for p in paths] == ["a.ttf", "b.ttf", "c.otf"]
+
+    def test_glob_and_dedupe(self, font_dir: Path) -> None:
+        """Test glob expansion and duplicate removal."""
+        paths = expand_input_paths([f"{font_dir}/*.ttf", font_dir / "a.ttf"])
+        assert [p.name for p in paths] == ["a.ttf", "b.ttf"]
+
+    def test_glob_without_matches(self, font_dir: Path) -> None:
+        """Test unmatched glob raises."""
+        with pytest.raises(FileNotFoundError):
+            expand_input_paths([f"{font_dir}/*.woff"])
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    def test_resolve_jobs(self) -> None:
+        """Test 0 means all cores."""
+        assert resolve_jobs(0) >= 1
+        assert resolve_jobs(3) == 3
+
+    def test_parallel_rename_keeps_order(self, font_dir: Path) -> None:
+        """Test pool results come back per file, in input order."""
+        paths = expand_input_paths([font_dir])
+        results = list(
+            run_batch(
+                rename_font, paths, "new", {"new_family": "Batch Font"}, "0", jobs=2
+            )
+        )
+        assert [r.input_path for r in results] == paths
+        assert all(r.ok for r in results)
+        assert all(r.new_family_name == "Batch Font" for r in results)
+
+    def test_errors_are_per_file(self, font_dir: Path) -> None:
+        """Test a failing file does not stop the batch."""
+        paths = [font_dir / "a.ttf", font_dir / "notes.txt"]
+        results = list(run_batch(read_font_names, paths, jobs=1))
+        assert [r.ok for r in results] == [True, False]
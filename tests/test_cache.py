@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# this_file: tests/test_cache.py
+"""Tests for the content-addressed rename cache."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from fontnemo.__main__ import main
+from fontnemo.cache import RenameCache, run_with_cache
+from fontnemo.manifest import apply_manifest, parse_entry
+from fontnemo.operations import (
+    RenameResult,
+    read_font_names,
+    rename_font,
+    resolve_params,
+)
+
+
+def cached_rename(
+    cache_dir: Path,
+    path: Path,
+    operation: str,
+    params: dict,
+    output_path: str = "0",
+    max_entries: int = 1000,
+) -> RenameResult:
+    """Run one rename through a freshly opened cache, like a CLI run."""
+    resolved = resolve_params(operation, params)
+    key = (operation, resolved, output_path, None, None)
+    with RenameCache(cache_dir, max_entries) as cache:
+        (result,) = run_with_cache(
+            cache,
+            [path],
+            lambda item: cache.lookup(item, *key),
+            lambda todo: [
+                rename_font(item, operation, resolved, output_path) for item in todo
+            ],
+            lambda item, result: cache.record(result, *key),
+        )
+    return result
+
+
+class TestRenameCache:
+    """Tests for lookups and records."""
+
+    def test_in_place_rerun_is_noop(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test re-running an idempotent in-place rename skips the write."""
+        first = cached_rename(
+            tmp_path / "c", temp_font_copy, "new", {"new_family": "Night"}
+        )
+        assert first.ok and not first.cached
+        mtime = temp_font_copy.stat().st_mtime_ns
+
+        second = cached_rename(
+            tmp_path / "c", temp_font_copy, "new", {"new_family": "Night"}
+        )
+        assert second.cached
+        assert second.new_family_name == "Night"
+        assert temp_font_copy.stat().st_mtime_ns == mtime
+
+    def test_non_idempotent_rerun_runs(
+        self, temp_font_copy: Path, tmp_path: Path
+    ) -> None:
+        """Test a suffix applied in place is applied again on the next run."""
+        for expected in ("Roboto X", "Roboto X X"):
+            result = cached_rename(
+                tmp_path / "c", temp_font_copy, "suffix", {"suffix": " X"}
+            )
+            assert not result.cached
+            assert result.new_family_name == expected
+
+    def test_changed_output_is_rewritten(
+        self, test_font_path: Path, temp_font_copy: Path, tmp_path: Path
+    ) -> None:
+        """Test a hit needs the recorded output to be unchanged."""
+        output = str(tmp_path / "out.ttf")
+        args = (tmp_path / "c", temp_font_copy, "suffix", {"suffix": " X"}, output)
+        assert not cached_rename(*args).cached
+        assert cached_rename(*args).cached
+
+        Path(output).write_bytes(test_font_path.read_bytes())
+        result = cached_rename(*args)
+        assert not result.cached
+        assert read_font_names(output).family_name == "Roboto X"
+
+    def test_key_includes_arguments(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test other arguments and changed inputs miss."""
+        output = str(tmp_path / "out.ttf")
+        cached_rename(
+            tmp_path / "c", temp_font_copy, "suffix", {"suffix": " X"}, output
+        )
+        assert not cached_rename(
+            tmp_path / "c", temp_font_copy, "suffix", {"suffix": " Y"}, output
+        ).cached
+
+        rename_font(temp_font_copy, "new", {"new_family": "Changed"})
+        result = cached_rename(
+            tmp_path / "c", temp_font_copy, "suffix", {"suffix": " Y"}, output
+        )
+        assert not result.cached
+        assert result.new_family_name == "Changed Y"
+
+    def test_lru_eviction(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test entries beyond max_entries are evicted, oldest first."""
+        output = str(tmp_path / "out.ttf")
+        for suffix in (" A", " B"):
+            cached_rename(
+                tmp_path / "c", temp_font_copy, "suffix", {"suffix": suffix}, output, 1
+            )
+        # " B" (most recent) survives; " A" was evicted
+        assert not cached_rename(
+            tmp_path / "c", temp_font_copy, "suffix", {"suffix": " A"}, output, 1
+        ).cached
+
+
+class TestCachedRuns:
+    """Tests for --cache on the CLI and in manifests."""
+
+    def test_cli(
+        self,
+        temp_font_copy: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test a cached CLI rerun prints the same result."""
+        monkeypatch.setenv("FONTNEMO_CACHE_DIR", str(tmp_path / "c"))
+        args = ["new", str(temp_font_copy), "--new_family=Night", "--cache", "--long"]
+        main(args)
+        first = capsys.readouterr().out
+        mtime = temp_font_copy.stat().st_mtime_ns
+        main(args)
+        assert capsys.readouterr().out == first == f"{temp_font_copy}:Night\n"
+        assert temp_font_copy.stat().st_mtime_ns == mtime
+
+    def test_manifest(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test manifest rows report cached results."""
+        row = {"path": str(temp_font_copy), "operation": "new", "new_family": "Night"}
+        entries = [parse_entry(1, row, "x")]
+        records = []
+        for _ in range(2):
+            out = io.StringIO()
+            with RenameCache(tmp_path / "c") as cache:
+                assert apply_manifest(entries, out, jobs=1, cache=cache) == 0
+            records.append(json.loads(out.getvalue()))
+        assert [r["cached"] for r in records] == [False, True]
+        assert records[1]["new_family_name"] == "Night"
+        assert set(records[0]) == set(records[1])
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# this_file: tests/test_catalog.py
+"""Tests for the SQLite family name catalog."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo import catalog
+from fontnemo.__main__ import main
+from fontnemo.catalog import FontCatalog
+from fontnemo.operations import rename_font
+
+
+@pytest.fixture
+def fonts(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create a directory with two fonts, one renamed, and a non-font."""
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    for name in ("a.ttf", "b.ttf"):
+        shutil.copy(test_font_path, directory / name)
+    rename_font(directory / "b.ttf", "new", {"new_family": "Other Sans"})
+    (directory / "broken.ttf").write_bytes(b"\x00\x01\x00\x00 truncated")
+    return directory
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Path:
+    """Return the path of a fresh catalog database."""
+    return tmp_path / "catalog.sqlite"
+
+
+def test_scan_and_query(fonts: Path, db: Path) -> None:
+    """Test a scan stores names, hashes and raw nameIDs for queries."""
+    with FontCatalog(db) as font_catalog:
+        stats = font_catalog.scan(sorted(fonts.iterdir()), [fonts])
+        assert (stats.files, stats.scanned, stats.failed) == (3, 3, 1)
+
+        (record,) = font_catalog.query(family="other sans")
+        assert record["path"] == str(fonts / "b.ttf")
+        assert record["family_slug"] == "OtherSans"
+        assert record["names"][1] == "Other Sans"
+        assert record["names"][6].startswith("OtherSans")
+        assert len(record["digest"]) == 64
+        assert [r["path"] for r in font_catalog.query(slug="Rob*")] == [
+            str(fonts / "a.ttf")
+        ]
+        assert len(list(font_catalog.query())) == 2
+
+
+def test_rescan_reads_only_changed_files(
+    fonts: Path, db: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test re-scans skip unchanged files and drop deleted ones."""
+    with FontCatalog(db) as font_catalog:
+        font_catalog.scan(sorted(fonts.iterdir()), [fonts])
+
+    read: list[str] = []
+    original = catalog.read_catalog_entry
+
+    def counting(path: str) -> catalog.CatalogEntry:
+        read.append(os.path.basename(path))
+        return original(path)
+
+    monkeypatch.setattr(catalog, "read_catalog_entry", counting)
+    rename_font(fonts / "a.ttf", "new", {"new_family": "Third"})
+    (fonts / "broken.ttf").unlink()
+    with FontCatalog(db) as font_catalog:
+        stats = font_catalog.scan(sorted(fonts.iterdir()), [fonts])
+        assert (stats.scanned, stats.unchanged, stats.removed) == (1, 1, 1)
+        assert read == ["a.ttf"]
+        assert [r["family_name"] for r in font_catalog.query()] == [
+            "Third",
+            "Other Sans",
+        ]
+
+
+def test_cli(fonts: Path, db: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test catalog scan and query from the command line."""
+    main(["catalog", "scan", str(fonts), f"--db={db}"])
+    summary = capsys.readouterr().out
+    assert summary == "3 file(s): 3 read, 0 unchanged, 0 removed, 1 failed\n"
+
+    main(["catalog", "query", "--family=Roboto", f"--db={db}"])
+    assert capsys.readouterr().out == f"{fonts / 'a.ttf'}:Roboto\n"
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["catalog", "query", "--family=Missing", f"--db={db}"])
+    assert exc_info.value.code == 1
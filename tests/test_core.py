@@ -2,33 +2,21 @@
 # this_file: tests/test_core.py
 """Tests for core module (font name reading and writing)."""
 
-import shutil
+import os
 from pathlib import Path
 
 import pytest
+from fontTools.ttLib import TTFont
 
 from fontnemo.core import (
     FAMILY_NAME_IDS,
     FAMILY_SLUG_IDS,
     FontNameHandler,
+    parse_faces,
     save_font_safely,
 )
 
 
-@pytest.fixture
-def test_font_path() -> Path:
-    """Return path to test font fixture."""
-    return Path(__file__).parent / "fixtures" / "test_font_basic.ttf"
-
-
-@pytest.fixture
-def temp_font_copy(test_font_path: Path, tmp_path: Path) -> Path:
-    """Create temporary copy of test font."""
-    temp_font = tmp_path / "test_font_copy.ttf"
-    shutil.copy(test_font_path, temp_font)
-    return temp_font
-
-
 class TestFontNameHandler:
     """Tests for FontNameHandler class."""
 
@@ -49,6 +37,21 @@ class TestFontNameHandler:
         assert "Roboto" in family_name or family_name == "Roboto"
         handler.close()
 
+    def test_read_does_not_load_ttfont(self, test_font_path: Path) -> None:
+        """Test reads use the lightweight reader, not a full TTFont."""
+        handler = FontNameHandler(test_font_path)
+        assert handler.read_family_name() == "Roboto"
+        assert handler.read_family_slug() == "Roboto"
+        assert handler._font is None
+        handler.close()
+
+    def test_read_after_write_sees_changes(self, temp_font_copy: Path) -> None:
+        """Test reads reflect in-memory writes."""
+        handler = FontNameHandler(temp_font_copy)
+        handler.write_family_name("Changed")
+        assert handler.read_family_name() == "Changed"
+        handler.close()
+
     def test_read_family_slug(self, test_font_path: Path) -> None:
         """Test reading family slug."""
         handler = FontNameHandler(test_font_path)
@@ -117,6 +120,61 @@ class TestFontNameHandler:
         assert read_name != original_name
         handler2.close()
 
+    def test_index_follows_added_records(self, test_font_path: Path) -> None:
+        """Test the record index sees records added after it was built."""
+        font = TTFont(str(test_font_path))
+        handler = FontNameHandler(font=font)
+        assert handler.read_family_name() == "Roboto"
+        font["name"].setName("Typo", 16, 3, 1, 0x409)
+        assert handler.read_family_name() == "Typo"
+        handler.write_family_name("Indexed")
+        assert font["name"].getDebugName(16) == "Indexed"
+        font.close()
+
+    def test_writes_skip_debug_decoding(
+        self, test_font_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test records are not decoded for log messages below DEBUG."""
+        from fontTools.ttLib.tables._n_a_m_e import NameRecord
+
+        from fontnemo.log import logger
+
+        handler = FontNameHandler(test_font_path)
+        handler.name_table  # Load before counting decodes
+        calls = []
+        original = NameRecord.toUnicode
+
+        def counting(self: NameRecord, errors: str = "strict") -> str:
+            calls.append(self.nameID)
+            return original(self, errors)
+
+        monkeypatch.setattr(NameRecord, "toUnicode", counting)
+        monkeypatch.setattr(logger, "_level", "WARNING")
+        handler.write_family_name("Quiet")
+        handler.write_family_slug("Quiet")
+        assert calls == []
+        handler.close()
+
+    def test_in_memory_source(self, test_font_path: Path) -> None:
+        """Test a handler on font data renames without touching files."""
+        data = test_font_path.read_bytes()
+        handler = FontNameHandler(data=data)
+        handler.write_family_name("Memory")
+        renamed = handler.to_bytes()
+        assert handler.can_write_name_only()
+        assert not handler.save_in_place()
+        with pytest.raises(ValueError, match="In-memory"):
+            save_font_safely(handler, "0")
+        handler.close()
+        assert FontNameHandler(data=renamed).read_family_name() == "Memory"
+
+    def test_exactly_one_source(self, test_font_path: Path) -> None:
+        """Test a path and data together are rejected."""
+        with pytest.raises(ValueError, match="exactly one"):
+            FontNameHandler(test_font_path, data=test_font_path.read_bytes())
+        with pytest.raises(ValueError, match="exactly one"):
+            FontNameHandler()
+
 
 class TestSaveFontSafely:
     """Tests for save_font_safely function."""
@@ -236,3 +294,73 @@ class TestIntegration:
         original_handler = FontNameHandler(temp_font_copy)
         assert original_handler.read_family_name() == original_name
         original_handler.close()
+
+
+class TestNameOnlyWrites:
+    """Tests for saving without a full TTFont round trip."""
+
+    def test_save_uses_name_only_path(self, temp_font_copy: Path) -> None:
+        """Test an untouched font can be written name-only."""
+        handler = FontNameHandler(temp_font_copy)
+        handler.write_family_name("Name Only")
+        assert handler.can_write_name_only()
+        handler.close()
+
+    def test_mode_0_patches_in_place(self, temp_font_copy: Path) -> None:
+        """Test mode '0' keeps the file size when the name table shrinks."""
+        size = temp_font_copy.stat().st_size
+        handler = FontNameHandler(temp_font_copy)
+        handler.write_family_name("X")
+        save_font_safely(handler, "0")
+        handler.close()
+
+        assert temp_font_copy.stat().st_size == size
+        verify = FontNameHandler(temp_font_copy)
+        assert verify.read_family_name() == "X"
+        verify.close()
+
+    def test_mode_0_keeps_hard_links(self, temp_font_copy: Path) -> None:
+        """Test mode '0' replaces the file, leaving other hard links alone."""
+        link = temp_font_copy.with_name("link.ttf")
+        os.link(temp_font_copy, link)
+        handler = FontNameHandler(temp_font_copy)
+        handler.write_family_name("X")
+        save_font_safely(handler, "0")
+        handler.close()
+
+        assert FontNameHandler(temp_font_copy).read_family_name() == "X"
+        assert FontNameHandler(link).read_family_name() == "Roboto"
+        assert temp_font_copy.stat().st_ino != link.stat().st_ino
+
+    def test_loaded_tables_fall_back_to_full_save(self, temp_font_copy: Path) -> None:
+        """Test a font with other tables loaded is saved by fontTools."""
+        handler = FontNameHandler(temp_font_copy)
+        handler.font["head"].fontRevision = 2.5
+        assert not handler.can_write_name_only()
+
+        output = temp_font_copy.parent / "full.ttf"
+        handler.save(output)
+        handler.close()
+
+        font = TTFont(str(output))
+        assert font["head"].fontRevision == 2.5
+        font.close()
+
+
+class TestParseFaces:
+    """Tests for parse_faces."""
+
+    def test_values(self) -> None:
+        """Test the accepted --face forms."""
+        assert parse_faces(None) is None
+        assert parse_faces("") is None
+        assert parse_faces(2) == [2]
+        assert parse_faces("0, 2") == [0, 2]
+        assert parse_faces((1, 3)) == [1, 3]
+
+    def test_invalid(self) -> None:
+        """Test non-integer and negative faces raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_faces("a")
+        with pytest.raises(ValueError):
+            parse_faces("-1")
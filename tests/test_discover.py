@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# this_file: tests/test_discover.py
+"""Tests for font discovery in directory trees."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo.__main__ import main
+from fontnemo.discover import discover_fonts, is_font_file
+
+
+@pytest.fixture
+def tree(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create a font archive with fonts, sources and look-alikes."""
+    root = tmp_path / "archive"
+    for name in ("a.ttf", "sub/b.otf", "sub/deep/no_extension", "build/c.ttf"):
+        target = root / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(test_font_path, target)
+    (root / "fake.ttf").write_text("not a font")
+    (root / "sub" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    (root / "sub" / "empty.otf").write_bytes(b"")
+    shutil.copy(test_font_path, root / "sub" / ".fontnemo_tmp_x.ttf")
+    return root
+
+
+def names(paths: list[Path], root: Path) -> list[str]:
+    """Return paths relative to root, as POSIX strings."""
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+def test_is_font_file(tree: Path) -> None:
+    """Test fonts are identified by their first bytes, not their name."""
+    assert is_font_file(tree / "sub" / "deep" / "no_extension")
+    assert not is_font_file(tree / "fake.ttf")
+    assert not is_font_file(tree / "sub" / "empty.otf")
+    assert not is_font_file(tree / "missing.ttf")
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_discover_by_signature(tree: Path, jobs: int) -> None:
+    """Test the walk finds fonts by signature, serially or in threads."""
+    assert names(discover_fonts(tree, jobs=jobs), tree) == [
+        "a.ttf",
+        "build/c.ttf",
+        "sub/b.otf",
+        "sub/deep/no_extension",
+    ]
+
+
+def test_include_and_exclude(tree: Path) -> None:
+    """Test name patterns, relative path patterns and pruned directories."""
+    found = discover_fonts(tree, include="*.ttf,*.otf", exclude="build")
+    assert names(found, tree) == ["a.ttf", "sub/b.otf"]
+    found = discover_fonts(tree, exclude=["sub/deep"])
+    assert names(found, tree) == ["a.ttf", "build/c.ttf", "sub/b.otf"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_symlink_policies(test_font_path: Path, tree: Path, tmp_path: Path) -> None:
+    """Test symlinks are skipped, followed to files, or followed everywhere."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    shutil.copy(test_font_path, outside / "linked.ttf")
+    (tree / "link.ttf").symlink_to(outside / "linked.ttf")
+    (tree / "linked_dir").symlink_to(outside)
+    (tree / "sub" / "loop").symlink_to(tree)
+
+    def found(symlinks: str) -> set[str]:
+        return set(names(discover_fonts(tree, symlinks=symlinks), tree))
+
+    assert "link.ttf" not in found("skip")
+    assert found("files") == found("skip") | {"link.ttf"}
+    assert found("follow") == found("files") | {"linked_dir/linked.ttf"}
+    with pytest.raises(ValueError, match="symlink policy"):
+        discover_fonts(tree, symlinks="always")
+
+
+def test_cli_filters(tree: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the global --include/--exclude flags apply to directories."""
+    main(["view", str(tree), "--long", "--exclude=build,deep", "--include=*.ttf"])
+    assert capsys.readouterr().out == f"{tree / 'a.ttf'}:Roboto\n"
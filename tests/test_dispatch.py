@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# this_file: tests/test_dispatch.py
+"""Tests for dispatch module (fire-compatible argument parsing)."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo.__main__ import COMMANDS, FontNemoCLI, main
+from fontnemo.dispatch import ParsedCommand, parse_command_line
+
+
+def parse(*argv: str) -> ParsedCommand | None:
+    """Parse argv against the fontnemo CLI."""
+    return parse_command_line(FontNemoCLI, COMMANDS, list(argv))
+
+
+class TestParseCommandLine:
+    """Tests for parse_command_line."""
+
+    def test_positional_and_flags(self) -> None:
+        """Test varargs paths, --name=value and --name value forms."""
+        parsed = parse("n", "a.ttf", "b.ttf", "--new_family=My Font", "--jobs", "4")
+        assert parsed is not None
+        assert parsed.method == "n"
+        assert parsed.args == ["a.ttf", "b.ttf"]
+        assert parsed.kwargs == {"new_family": "My Font", "jobs": 4}
+
+    def test_boolean_flags(self) -> None:
+        """Test --flag, --noflag and --flag=False."""
+        assert parse("view", "a.ttf", "--long").kwargs == {"long": True}
+        assert parse("view", "a.ttf", "--nolong").kwargs == {"long": False}
+        assert parse("t", "a.ttf", "--replace_timestamp=False").kwargs == {
+            "replace_timestamp": False
+        }
+
+    def test_boolean_flag_does_not_consume_path(self) -> None:
+        """Test a bare boolean flag leaves the next path positional."""
+        parsed = parse("view", "--long", "a.ttf")
+        assert parsed is not None
+        assert parsed.args == ["a.ttf"]
+
+    def test_hyphenated_and_global_flags(self) -> None:
+        """Test hyphens in flag names and --verbose anywhere."""
+        parsed = parse("--verbose", "s", "a.ttf", "--output-path", "2", "--suffix=X")
+        assert parsed is not None
+        assert parsed.init_kwargs == {"verbose": True}
+        assert parsed.kwargs == {"output_path": "2", "suffix": "X"}
+
+    def test_hyphenated_command(self) -> None:
+        """Test apply-manifest dispatches to apply_manifest."""
+        parsed = parse("apply-manifest", "plan.csv", "--jobs=2")
+        assert parsed is not None
+        assert parsed.method == "apply_manifest"
+        assert parsed.args == ["plan.csv"]
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ("view", "--help"),
+            ("view", "-h"),
+            ("bogus", "a.ttf"),
+            ("new", "a.ttf", "--new_family"),  # missing value
+            ("view", "a.ttf", "--unknown=1"),
+            ("view", "a.ttf", "--jobs=many"),
+        ],
+    )
+    def test_falls_back_to_fire(self, argv: tuple[str, ...]) -> None:
+        """Test unsupported command lines return None."""
+        assert parse(*argv) is None
+
+
+class TestMain:
+    """Tests for the CLI entry point."""
+
+    def test_view_and_rename(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test direct dispatch of view and a rename command."""
+        font = tmp_path / "font.ttf"
+        shutil.copy(Path(__file__).parent / "fixtures" / "test_font_basic.ttf", font)
+
+        main(["view", str(font)])
+        assert capsys.readouterr().out == "Roboto\n"
+
+        main(["s", str(font), "--suffix= Beta", "--long"])
+        assert capsys.readouterr().out == f"{font}:Roboto Beta\n"
+
+    def test_single_font_positional_form(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test the positional form of single-font releases still works."""
+        font = tmp_path / "font.ttf"
+        shutil.copy(Path(__file__).parent / "fixtures" / "test_font_basic.ttf", font)
+        output = tmp_path / "out.ttf"
+
+        main(["new", str(font), "Family", str(output)])
+        assert capsys.readouterr().out == "Family\n"
+        main(["view", str(output)])
+        assert capsys.readouterr().out == "Family\n"
+
+        main(["replace", str(font), "Rob", "Dob", "--long"])
+        assert capsys.readouterr().out == f"{font}:Doboto\n"
+
+        with pytest.raises(SystemExit):
+            main(["new", str(font), "Family", str(output), "extra"])
+
+    def test_error_exit_status(self, tmp_path: Path) -> None:
+        """Test a failing font exits with status 1."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(["view", str(tmp_path / "missing.ttf")])
+        assert exc_info.value.code == 1
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# this_file: tests/test_fileops.py
+"""Tests for temp files, durability and zero-copy backups."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo import fileops
+from fontnemo.__main__ import main
+from fontnemo.fileops import TempFile, backup_file, clone_file, parse_durability
+from fontnemo.operations import rename_font
+
+
+def no_link(*args: object, **kwargs: object) -> None:
+    """Stand-in for os.link on filesystems without hard links."""
+    raise PermissionError("hard links not permitted")
+
+
+class TestBackupFile:
+    """Tests for backup_file."""
+
+    def test_hard_link(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test the backup shares the original's inode and survives a replace."""
+        backup = tmp_path / "backup.ttf"
+        original = temp_font_copy.read_bytes()
+        assert backup_file(temp_font_copy, backup) == "link"
+        assert backup.stat().st_ino == temp_font_copy.stat().st_ino
+
+        replacement = tmp_path / "new.ttf"
+        replacement.write_bytes(b"renamed")
+        replacement.replace(temp_font_copy)
+        assert backup.read_bytes() == original
+
+    def test_replaces_existing_backup(
+        self, temp_font_copy: Path, tmp_path: Path
+    ) -> None:
+        """Test an existing backup is replaced, not written through."""
+        backup = tmp_path / "backup.ttf"
+        other = tmp_path / "other.ttf"
+        other.write_bytes(b"other")
+        os.link(other, backup)
+        backup_file(temp_font_copy, backup)
+        assert backup.read_bytes() == temp_font_copy.read_bytes()
+        assert other.read_bytes() == b"other"
+
+    def test_copy_fallback(
+        self, temp_font_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a copy is made where hard links fail, keeping permissions."""
+        monkeypatch.setattr(os, "link", no_link)
+        temp_font_copy.chmod(0o640)
+        backup = tmp_path / "backup.ttf"
+        assert backup_file(temp_font_copy, backup) in ("reflink", "copy_range", "copy")
+        assert backup.read_bytes() == temp_font_copy.read_bytes()
+        assert backup.stat().st_ino != temp_font_copy.stat().st_ino
+        assert backup.stat().st_mode & 0o777 == 0o640
+
+
+class TestCloneFile:
+    """Tests for the copy fallbacks of clone_file."""
+
+    @pytest.mark.skipif(
+        not hasattr(os, "copy_file_range"), reason="needs os.copy_file_range"
+    )
+    def test_copy_range(
+        self, temp_font_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test copy_file_range is used where reflinks are not supported."""
+        monkeypatch.setattr(fileops, "_reflink", lambda src, dst: False)
+        copy = tmp_path / "copy.ttf"
+        assert clone_file(temp_font_copy, copy) in ("copy_range", "copy")
+        assert copy.read_bytes() == temp_font_copy.read_bytes()
+
+    def test_streamed_copy(
+        self, temp_font_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the streamed copy of last resort."""
+        monkeypatch.setattr(fileops, "_reflink", lambda src, dst: False)
+        monkeypatch.setattr(fileops, "_copy_range", lambda src, dst: False)
+        copy = tmp_path / "copy.ttf"
+        assert clone_file(temp_font_copy, copy) == "copy"
+        assert copy.read_bytes() == temp_font_copy.read_bytes()
+
+    def test_failed_copy_is_removed(
+        self, temp_font_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a partial copy does not stay behind."""
+
+        def fail(src: int, dst: int) -> bool:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(fileops, "_reflink", fail)
+        copy = tmp_path / "copy.ttf"
+        with pytest.raises(OSError, match="disk full"):
+            clone_file(temp_font_copy, copy)
+        assert not copy.exists()
+
+
+def test_mode_1_backup_keeps_original_inode(temp_font_copy: Path) -> None:
+    """Test output mode "1" keeps the original file itself as the backup."""
+    inode = temp_font_copy.stat().st_ino
+    original = temp_font_copy.read_bytes()
+    result = rename_font(temp_font_copy, "suffix", {"suffix": " X"}, "1")
+    assert result.ok
+    (backup,) = [
+        p
+        for p in temp_font_copy.parent.iterdir()
+        if p.name.startswith(f"{temp_font_copy.stem}--")
+    ]
+    assert backup.stat().st_ino == inode
+    assert backup.read_bytes() == original
+    assert temp_font_copy.stat().st_ino != inode
+
+
+class TestTempFile:
+    """Tests for unnamed/named temp files committed by rename."""
+
+    def test_commit_new_and_existing(self, tmp_path: Path) -> None:
+        """Test a temp file becomes a new file or replaces an existing one."""
+        for content in (b"first", b"second"):
+            tmp_file = TempFile(tmp_path, ".ttf")
+            tmp_file.file.write(content)
+            tmp_file.commit(tmp_path / "out.ttf")
+            assert (tmp_path / "out.ttf").read_bytes() == content
+        assert [p.name for p in tmp_path.iterdir()] == ["out.ttf"]
+
+    def test_discard(self, tmp_path: Path) -> None:
+        """Test a discarded temp file leaves nothing behind."""
+        tmp_file = TempFile(tmp_path, ".ttf")
+        tmp_file.file.write(b"partial")
+        tmp_file.discard()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_named_fallback(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a named temp file is used without O_TMPFILE."""
+        monkeypatch.setattr(fileops, "_open_anonymous", lambda directory: None)
+        tmp_file = TempFile(tmp_path, ".ttf")
+        assert tmp_file.path is not None
+        assert tmp_file.path.name.startswith(".fontnemo_tmp_")
+        tmp_file.file.write(b"data")
+        tmp_file.commit(tmp_path / "out.ttf")
+        assert [p.name for p in tmp_path.iterdir()] == ["out.ttf"]
+
+    def test_link_failure_copies(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an unnamed file that cannot be linked is copied instead."""
+        tmp_file = TempFile(tmp_path, ".ttf")
+        if tmp_file.path is not None:
+            pytest.skip("O_TMPFILE not supported here")
+        monkeypatch.setattr(os, "link", no_link)
+        monkeypatch.setattr(fileops, "_anonymous_supported", True)
+        tmp_file.file.write(b"data")
+        tmp_file.commit(tmp_path / "out.ttf")
+        assert (tmp_path / "out.ttf").read_bytes() == b"data"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.ttf"]
+
+
+class TestDurability:
+    """Tests for fsync per durability level."""
+
+    @pytest.fixture
+    def fsyncs(self, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        """Record os.fsync calls (the file descriptors) without syncing."""
+        calls: list[int] = []
+        monkeypatch.setattr(os, "fsync", calls.append)
+        return calls
+
+    def test_parse_durability(self) -> None:
+        """Test levels are validated."""
+        assert parse_durability(None) == "none"
+        assert parse_durability("FULL") == "full"
+        with pytest.raises(ValueError, match="durability"):
+            parse_durability("always")
+
+    @pytest.mark.parametrize(
+        ("durability", "expected"), [("none", 0), ("file", 1), ("full", 2)]
+    )
+    def test_levels(
+        self, temp_font_copy: Path, fsyncs: list[int], durability: str, expected: int
+    ) -> None:
+        """Test "file" syncs the font and "full" also its directory."""
+        result = rename_font(
+            temp_font_copy, "suffix", {"suffix": " X"}, "2", durability=durability
+        )
+        assert result.ok
+        assert len(fsyncs) == expected
+
+    def test_no_in_place_patch(self, temp_font_copy: Path, fsyncs: list[int]) -> None:
+        """Test a durable mode 0 save replaces the file instead of patching it."""
+        inode = temp_font_copy.stat().st_ino
+        assert rename_font(
+            temp_font_copy, "new", {"new_family": "X"}, durability="file"
+        ).ok
+        assert len(fsyncs) == 1
+        assert temp_font_copy.stat().st_ino != inode
+
+    def test_batch_syncs_directory_once(
+        self,
+        test_font_path: Path,
+        temp_font_copy: Path,
+        tmp_path: Path,
+        fsyncs: list[int],
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test a batch syncs every font but its output directory only once."""
+        for i in range(3):
+            shutil.copy(test_font_path, tmp_path / f"more{i}.ttf")
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+        main(
+            [
+                "suffix",
+                str(tmp_path / "*.ttf"),
+                "--suffix= X",
+                f"--output_path={out_dir}",
+                "--durability=full",
+            ]
+        )
+        assert capsys.readouterr().out.count("Roboto X") == 4
+        assert len(fsyncs) == 4 + 1
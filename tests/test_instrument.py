@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# this_file: tests/test_instrument.py
+"""Tests for per-phase profiling (--profile)."""
+
+import io
+import json
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from fontnemo.__main__ import main
+from fontnemo.instrument import aggregate, format_summary, phase, profiling
+from fontnemo.manifest import apply_manifest, parse_entry
+from fontnemo.operations import rename_font
+
+
+class TestPhases:
+    """Tests for phase timing."""
+
+    def test_inactive_phase_is_noop(self) -> None:
+        """Test phases outside a profile share one no-op context manager."""
+        assert phase("write") is phase("compile")
+        with phase("write"):
+            pass
+
+    def test_nested_phases_are_exclusive(self) -> None:
+        """Test an outer phase does not include the time of nested phases."""
+        with profiling("x") as profile:
+            with phase("outer"):
+                with phase("inner"):
+                    time.sleep(0.05)
+        assert profile is not None
+        record = profile.as_dict()
+        assert record["phases"]["inner"]["seconds"] >= 0.05
+        assert record["phases"]["outer"]["seconds"] < 0.05
+        assert record["seconds"] >= 0.05
+
+    def test_disabled(self) -> None:
+        """Test profiling(enabled=False) measures nothing."""
+        with profiling("x", enabled=False) as profile:
+            assert profile is None
+            assert phase("write") is phase("compile")
+
+
+class TestProfiledRename:
+    """Tests for profiled renames."""
+
+    def test_rename_font_profile(
+        self, test_font_path: Path, temp_font_copy: Path, tmp_path: Path
+    ) -> None:
+        """Test a profiled rename reports phases, bytes and peak memory."""
+        output = tmp_path / "out.ttf"
+        result = rename_font(
+            temp_font_copy,
+            "suffix",
+            {"suffix": " X"},
+            output,
+            verify=True,
+            profile=True,
+        )
+        assert result.ok
+        profile = result.profile
+        assert profile is not None
+        assert profile["path"] == str(temp_font_copy)
+        assert {"open", "compile", "write", "replace", "verify"} <= set(
+            profile["phases"]
+        )
+        size = test_font_path.stat().st_size
+        # Input opened once, output re-read by verify
+        assert profile["bytes_read"] == size + output.stat().st_size
+        assert profile["bytes_written"] == output.stat().st_size
+        assert profile["peak_rss"] > 0
+
+    def test_unprofiled_rename(self, temp_font_copy: Path) -> None:
+        """Test renames are not profiled by default."""
+        assert rename_font(temp_font_copy, "suffix", {"suffix": " X"}).profile is None
+
+    def test_backup_phase(self, temp_font_copy: Path) -> None:
+        """Test output mode "1" reports the backup copy."""
+        result = rename_font(
+            temp_font_copy, "suffix", {"suffix": " X"}, "1", profile=True
+        )
+        assert result.profile is not None
+        assert result.profile["phases"]["backup"]["calls"] == 1
+
+    def test_aggregate(self) -> None:
+        """Test batch totals sum phases and bytes and keep the peak."""
+        profiles = [
+            {
+                "path": name,
+                "seconds": 1.0,
+                "phases": {"write": {"seconds": 0.5, "calls": 1}},
+                "bytes_read": 10,
+                "bytes_written": 20,
+                "peak_rss": rss,
+            }
+            for name, rss in (("a", 100), ("b", 300))
+        ]
+        total = aggregate(profiles)
+        assert total["fonts"] == 2
+        assert total["phases"]["write"] == {"seconds": 1.0, "calls": 2}
+        assert (total["bytes_read"], total["bytes_written"]) == (20, 40)
+        assert total["peak_rss"] == 300
+        assert "write" in format_summary(total)
+
+
+class TestProfileOutput:
+    """Tests for --profile on the CLI and in manifests."""
+
+    def test_cli_profile_json(
+        self,
+        test_font_path: Path,
+        temp_font_copy: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test --profile_json writes one profile per font and a total."""
+        second = tmp_path / "second.ttf"
+        shutil.copy(test_font_path, second)
+        profile_json = tmp_path / "profile.jsonl"
+        main(
+            [
+                "suffix",
+                str(temp_font_copy),
+                str(second),
+                "--suffix= X",
+                f"--profile_json={profile_json}",
+                "--profile",
+            ]
+        )
+        captured = capsys.readouterr()
+        assert captured.out == "Roboto X\nRoboto X\n"
+        assert "Profile: 2 font(s)" in captured.err
+
+        records = [json.loads(line) for line in profile_json.read_text().splitlines()]
+        assert [r.get("path") for r in records[:2]] == [
+            str(temp_font_copy),
+            str(second),
+        ]
+        assert records[2]["total"]["fonts"] == 2
+
+    def test_manifest_profile(self, temp_font_copy: Path) -> None:
+        """Test manifest records carry the profile of each row."""
+        row = {"path": str(temp_font_copy), "operation": "suffix", "suffix": " X"}
+        out = io.StringIO()
+        profiles: list[dict] = []
+        apply_manifest([parse_entry(1, row, "x")], out, jobs=1, profiles=profiles)
+        record = json.loads(out.getvalue())
+        assert record["profile"] == profiles[0]
+        assert record["profile"]["bytes_written"] > 0
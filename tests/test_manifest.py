@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# this_file: tests/test_manifest.py
+"""Tests for manifest module (manifest parsing and JSONL results)."""
+
+import io
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fontnemo.manifest import apply_manifest, parse_entry, read_manifest
+from fontnemo.operations import read_font_names
+
+
+@pytest.fixture
+def fonts(test_font_path: Path, tmp_path: Path) -> list[Path]:
+    """Create three copies of the test font."""
+    paths = [tmp_path / f"{name}.ttf" for name in ("a", "b", "c")]
+    for path in paths:
+        shutil.copy(test_font_path, path)
+    return paths
+
+
+def run(entries: list, jobs: int = 1, dry_run: bool = False) -> tuple[int, list[dict]]:
+    """Apply entries and return (failed count, parsed result records)."""
+    out = io.StringIO()
+    failed = apply_manifest(entries, out, jobs=jobs, dry_run=dry_run)
+    return failed, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestParseEntry:
+    """Tests for parse_entry."""
+
+    def test_columns_and_aliases(self) -> None:
+        """Test per-argument columns, aliases and boolean coercion."""
+        entry = parse_entry(
+            2,
+            {"path": "a.ttf", "operation": "T", "replace_timestamp": "no"},
+            "abc",
+        )
+        assert entry.error is None
+        assert entry.operation == "timestamp"
+        assert entry.params == {"replace_timestamp": False, "timestamp": "abc"}
+
+    def test_args_object(self) -> None:
+        """Test arguments given as a JSON args object."""
+        row = {"path": "a.ttf", "operation": "replace", "args": '{"find": "A"}'}
+        row["replace"] = "B"
+        entry = parse_entry(2, row, "x")
+        assert entry.params == {"find": "A", "replace": "B"}
+
+    def test_chain_steps(self) -> None:
+        """Test a chain row parses its steps with the run's timestamp."""
+        row = {"path": "a.ttf", "operation": "chain", "steps": "s: Pro;t"}
+        entry = parse_entry(2, row, "abc")
+        assert entry.error is None
+        assert entry.params == {
+            "steps": [
+                ("suffix", {"suffix": " Pro"}),
+                ("timestamp", {"timestamp": "abc"}),
+            ]
+        }
+
+    def test_invalid_rows(self) -> None:
+        """Test errors are stored in the entry instead of raised."""
+        assert "Missing path" in str(parse_entry(1, {"operation": "new"}, "x").error)
+        unknown = parse_entry(1, {"path": "a", "operation": "drop"}, "x")
+        assert "Unknown operation" in str(unknown.error)
+        extra = parse_entry(1, {"path": "a", "operation": "s", "bogus": "1"}, "x")
+        assert "Unknown argument 'bogus'" in str(extra.error)
+        missing = parse_entry(1, {"path": "a", "operation": "s"}, "x")
+        assert "Missing argument 'suffix'" in str(missing.error)
+
+
+class TestApplyManifest:
+    """Tests for reading manifests and running them."""
+
+    def test_csv(self, fonts: list[Path], tmp_path: Path) -> None:
+        """Test a CSV manifest keeps cell whitespace and reports each row."""
+        manifest = tmp_path / "plan.csv"
+        manifest.write_text(
+            "path, operation, output_path, new_family, suffix\n"
+            f"{fonts[0]},new,,Alpha,\n"
+            f"{fonts[1]},s,{tmp_path / 'out.ttf'},, Beta\n"
+            f"{tmp_path / 'missing.ttf'},n,,X,\n"
+        )
+        failed, records = run(read_manifest(manifest))
+        assert failed == 1
+        assert [r["line"] for r in records] == [2, 3, 4]
+        assert records[0]["new_family_name"] == "Alpha"
+        assert records[1]["new_family_name"] == "Roboto Beta"
+        assert records[1]["output_path"] == str(tmp_path / "out.ttf")
+        assert records[2]["ok"] is False and records[2]["error"]
+        assert all(record["seconds"] >= 0 for record in records)
+        assert read_font_names(fonts[0]).family_name == "Alpha"
+
+    def test_jsonl_parallel(self, fonts: list[Path], tmp_path: Path) -> None:
+        """Test JSONL rows run in a process pool, with results in order."""
+        manifest = tmp_path / "plan.jsonl"
+        rows = [
+            {"path": str(path), "operation": "prefix", "args": {"prefix": f"{i} "}}
+            for i, path in enumerate(fonts)
+        ]
+        manifest.write_text("\n".join(json.dumps(row) for row in rows) + "\nnope\n")
+        failed, records = run(read_manifest(manifest), jobs=2)
+        assert failed == 1
+        assert [r["new_family_name"] for r in records[:3]] == [
+            "0 Roboto",
+            "1 Roboto",
+            "2 Roboto",
+        ]
+        assert records[3]["error"].startswith("Invalid JSON")
+        assert set(records[3]) == set(records[0])
+
+    def test_dry_run(self, fonts: list[Path]) -> None:
+        """Test a dry run reports planned changes and writes nothing."""
+        before = fonts[0].read_bytes()
+        row = {"path": str(fonts[0]), "operation": "new", "new_family": "Plan"}
+        failed, records = run([parse_entry(1, row, "x")], dry_run=True)
+        assert failed == 0
+        assert records[0]["new_family_name"] == "Plan"
+        assert {change["new"] for change in records[0]["changes"]} == {"Plan"}
+        assert fonts[0].read_bytes() == before
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# this_file: tests/test_operations.py
+"""Tests for operations module (transforms and single-font rename)."""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fontTools.ttLib import TTFont
+
+from fontnemo.core import FontNameHandler
+from fontnemo.operations import (
+    STDIO_PATH,
+    face_handlers,
+    parse_steps,
+    plan_record,
+    plan_rename,
+    read_font_names,
+    rename_font,
+    rename_font_data,
+    rename_stream,
+    rename_ttfont,
+    resolve_params,
+    transform_chain,
+    transform_new,
+    transform_prefix,
+    transform_replace,
+    transform_suffix,
+    transform_timestamp,
+)
+from tests.create_test_fonts import create_collection
+
+
+class TestTransforms:
+    """Tests for the pure name transform functions."""
+
+    def test_new(self) -> None:
+        """Test new name derives slug with SLUG_RULE."""
+        assert transform_new("Old", "Old", "My Font [B]") == ("My Font [B]", "MyFontB")
+
+    def test_replace(self) -> None:
+        """Test replace applies slug-converted find/replace to slug."""
+        assert transform_replace("Draft Sans", "DraftSans", "Draft", "Final") == (
+            "Final Sans",
+            "FinalSans",
+        )
+
+    def test_suffix_and_prefix(self) -> None:
+        """Test suffix and prefix on name and slug."""
+        assert transform_suffix("Font", "Font", " Beta") == ("Font Beta", "FontBeta")
+        assert transform_prefix("Font", "Font", "Pre ") == ("Pre Font", "PreFont")
+
+    def test_timestamp_replaces_old_timestamp(self) -> None:
+        """Test default separator replaces an existing timestamp."""
+        name, slug = transform_timestamp("Font tXabc", "FonttXabc", timestamp="xyz123")
+        assert name == "Font tXxyz123"
+        assert slug == "FonttXxyz123"
+
+    def test_timestamp_custom_separator_accumulates(self) -> None:
+        """Test custom separator keeps existing name intact."""
+        name, _ = transform_timestamp("Font tXabc", "Font", "-", timestamp="x")
+        assert name == "Font tXabc-x"
+
+
+class TestResolveParams:
+    """Tests for resolve_params."""
+
+    def test_coerces_to_str(self) -> None:
+        """Test numeric flag values are coerced to strings."""
+        assert resolve_params("new", {"new_family": 2024}) == {"new_family": "2024"}
+
+    def test_timestamp_generated_once(self) -> None:
+        """Test timestamp operation gets a fixed timestamp."""
+        params = resolve_params("timestamp", {"separator": " tX"})
+        assert params["timestamp"]
+
+    def test_unknown_operation(self) -> None:
+        """Test unknown operation raises ValueError."""
+        with pytest.raises(ValueError):
+            resolve_params("bogus", {})
+
+
+class TestChain:
+    """Tests for chained operations."""
+
+    def test_transform_chain(self) -> None:
+        """Test each step sees the previous step's result."""
+        steps = [
+            ("prefix", {"prefix": "Beta "}),
+            ("replace", {"find": "Draft", "replace": "Final"}),
+            ("timestamp", {"timestamp": "abc"}),
+        ]
+        assert transform_chain("Draft Sans", "DraftSans", steps) == (
+            "Beta Final Sans tXabc",
+            "BetaFinalSanstXabc",
+        )
+
+    def test_parse_text_steps(self) -> None:
+        """Test text steps keep argument spaces and split replace on '='."""
+        assert parse_steps("p:Beta ;r:Old=New;timestamp") == [
+            ("prefix", {"prefix": "Beta "}),
+            ("replace", {"find": "Old", "replace": "New"}),
+            ("timestamp", {}),
+        ]
+
+    def test_parse_json_steps(self) -> None:
+        """Test JSON pairs, objects and bare names."""
+        steps = '[["suffix", {"suffix": " Pro"}], {"operation": "n", "args": {}}, "t"]'
+        assert parse_steps(steps) == [
+            ("suffix", {"suffix": " Pro"}),
+            ("new", {}),
+            ("timestamp", {}),
+        ]
+
+    @pytest.mark.parametrize(
+        ("steps", "message"),
+        [
+            ("", "Empty chain"),
+            ("bogus:x", "Unknown operation"),
+            ("replace:Old", "find=replace"),
+            ('["chain"]', "nested"),
+        ],
+    )
+    def test_invalid_steps(self, steps: str, message: str) -> None:
+        """Test malformed chains are rejected."""
+        with pytest.raises(ValueError, match=message):
+            parse_steps(steps)
+
+    def test_resolve_checks_every_step(self) -> None:
+        """Test steps are checked and share one timestamp."""
+        params = resolve_params("chain", {"steps": "t;t:-"}, timestamp="x")
+        assert params["steps"] == [
+            ("timestamp", {"timestamp": "x"}),
+            ("timestamp", {"separator": "-", "timestamp": "x"}),
+        ]
+        with pytest.raises(ValueError, match="Missing argument 'suffix'"):
+            resolve_params("chain", {"steps": "suffix"})
+
+    def test_chain_matches_sequential_renames(
+        self, temp_font_copy: Path, tmp_path: Path
+    ) -> None:
+        """Test one chained rename writes what the separate commands write."""
+        sequential = tmp_path / "sequential.ttf"
+        shutil.copy(temp_font_copy, sequential)
+        for operation, params in [
+            ("prefix", {"prefix": "Beta "}),
+            ("replace", {"find": "Roboto", "replace": "Sans"}),
+            ("suffix", {"suffix": " Pro"}),
+        ]:
+            assert rename_font(sequential, operation, params).ok
+
+        params = resolve_params(
+            "chain", {"steps": "prefix:Beta ;replace:Roboto=Sans;suffix: Pro"}
+        )
+        result = rename_font(temp_font_copy, "chain", params, verify=True)
+        assert result.ok, result.error
+        assert result.new_family_name == "Beta Sans Pro"
+        assert temp_font_copy.read_bytes() == sequential.read_bytes()
+
+
+class TestPlan:
+    """Tests for dry-run planning."""
+
+    def test_plan_matches_rename(self, temp_font_copy: Path) -> None:
+        """Test the planned changes are exactly what the rename writes."""
+        before = temp_font_copy.read_bytes()
+        params = resolve_params("suffix", {"suffix": " Beta 2"})
+        plan = plan_rename(temp_font_copy, "suffix", params)
+        assert plan.ok, plan.error
+        assert temp_font_copy.read_bytes() == before
+        assert plan.output_path == temp_font_copy
+        assert plan.new_family_slug == "RobotoBeta2"
+
+        old = {
+            (r.nameID, r.platformID, r.platEncID, r.langID): r.toUnicode()
+            for r in TTFont(temp_font_copy)["name"].names
+        }
+        assert rename_font(temp_font_copy, "suffix", params).ok
+        new = {
+            (r.nameID, r.platformID, r.platEncID, r.langID): r.toUnicode()
+            for r in TTFont(temp_font_copy)["name"].names
+        }
+        changed = {key for key in old if old[key] != new[key]}
+        planned = {
+            (c.name_id, c.platform_id, c.plat_enc_id, c.lang_id): (c.old, c.new)
+            for c in plan.changes
+        }
+        assert set(planned) == changed
+        assert all(planned[key] == (old[key], new[key]) for key in changed)
+
+    def test_plan_skips_fonttools(
+        self, temp_font_copy: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test planning reads names without loading a TTFont."""
+
+        def fail(self: FontNameHandler) -> None:
+            raise AssertionError("TTFont loaded")
+
+        monkeypatch.setattr(FontNameHandler, "font", property(fail))
+        plan = plan_rename(temp_font_copy, "new", {"new_family": "Plan"}, "2")
+        assert plan.ok, plan.error
+        assert plan.output_path != temp_font_copy
+        assert not plan.output_path.exists()
+
+    def test_plan_new_reports_old_names(self, temp_font_copy: Path) -> None:
+        """Test new and chains starting with new report the old slug."""
+        old_slug = FontNameHandler(temp_font_copy).read_family_slug()
+        plan = plan_rename(temp_font_copy, "new", {"new_family": "Plan"})
+        assert (plan.family_name, plan.family_slug) == ("Roboto", old_slug)
+        steps = [("new", {"new_family": "Plan"}), ("suffix", {"suffix": " X"})]
+        plan = plan_rename(temp_font_copy, "chain", {"steps": steps})
+        assert plan.family_slug == old_slug
+        assert plan.new_family_name == "Plan X"
+
+    def test_plan_collection_and_record(self, tmp_path: Path) -> None:
+        """Test collection faces are planned and records are serializable."""
+        source = Path(__file__).parent / "fixtures" / "test_font_basic.ttf"
+        collection = tmp_path / "family.ttc"
+        create_collection(collection, source, ["Alpha", "Beta"])
+        plan = plan_rename(collection, "suffix", {"suffix": " X"}, faces=[1])
+        assert plan.faces == [(1, "Beta X")]
+        assert {change.face for change in plan.changes} == {1}
+
+        record = plan_record(plan)
+        assert record["ok"] and record["faces"] == [[1, "Beta X"]]
+        assert record["changes"][0]["new"] in ("Beta X", "BetaX")
+
+    def test_cli_dry_run(
+        self, temp_font_copy: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test --dry-run prints one JSON plan per font and writes nothing."""
+        from fontnemo.__main__ import main
+
+        before = temp_font_copy.read_bytes()
+        main(["s", str(temp_font_copy), "--suffix= Beta", "--dry-run"])
+        (line,) = capsys.readouterr().out.splitlines()
+        record = json.loads(line)
+        assert record["new_family_name"] == "Roboto Beta"
+        assert record["changes"] and record["ok"]
+        assert temp_font_copy.read_bytes() == before
+
+
+class TestRenameFont:
+    """Tests for rename_font and read_font_names."""
+
+    def test_rename_font(self, temp_font_copy: Path) -> None:
+        """Test full rename cycle updates the file."""
+        result = rename_font(temp_font_copy, "suffix", {"suffix": " Beta"})
+        assert result.ok
+        assert result.output_path == temp_font_copy
+        assert result.new_family_name == f"{result.family_name} Beta"
+
+        handler = FontNameHandler(temp_font_copy)
+        assert handler.read_family_name() == result.new_family_name
+        handler.close()
+
+    def test_rename_font_verify(self, temp_font_copy: Path) -> None:
+        """Test verification of the written file passes."""
+        output = temp_font_copy.parent / "verified.ttf"
+        result = rename_font(
+            temp_font_copy, "new", {"new_family": "Verified"}, output, verify=True
+        )
+        assert result.ok, result.error
+        assert result.new_family_name == "Verified"
+
+    def test_rename_font_captures_error(self, tmp_path: Path) -> None:
+        """Test errors are returned in the result, not raised."""
+        result = rename_font(tmp_path / "missing.ttf", "new", {"new_family": "X"})
+        assert not result.ok
+        assert result.error
+
+    def test_read_font_names(self, temp_font_copy: Path) -> None:
+        """Test reading family name into a result."""
+        result = read_font_names(temp_font_copy)
+        assert result.ok
+        assert result.family_name == "Roboto"
+
+
+class TestCollections:
+    """Tests for reading and renaming font collections."""
+
+    @pytest.fixture
+    def ttc_path(self, temp_font_copy: Path, tmp_path: Path) -> Path:
+        """Create a two-face collection."""
+        path = tmp_path / "family.ttc"
+        create_collection(path, temp_font_copy, ["Alpha", "Beta"])
+        return path
+
+    def test_read_all_faces(self, ttc_path: Path) -> None:
+        """Test every face's family name is reported."""
+        result = read_font_names(ttc_path)
+        assert result.ok
+        assert result.family_name == "Alpha"
+        assert result.faces == [(0, "Alpha"), (1, "Beta")]
+
+    def test_rename_each_face(self, ttc_path: Path) -> None:
+        """Test the transform is applied to each face's own name."""
+        result = rename_font(ttc_path, "suffix", {"suffix": " X"}, verify=True)
+        assert result.ok, result.error
+        assert result.faces == [(0, "Alpha X"), (1, "Beta X")]
+        assert read_font_names(ttc_path).faces == result.faces
+
+    def test_rename_selected_face(self, ttc_path: Path) -> None:
+        """Test unselected faces are left unchanged."""
+        result = rename_font(ttc_path, "new", {"new_family": "Gamma"}, faces=[1])
+        assert result.ok, result.error
+        assert read_font_names(ttc_path).faces == [(0, "Alpha"), (1, "Gamma")]
+
+    def test_face_on_single_font(self, temp_font_copy: Path) -> None:
+        """Test selecting a face other than 0 of a single font fails."""
+        assert read_font_names(temp_font_copy, [0]).ok
+        assert not read_font_names(temp_font_copy, [1]).ok
+
+    def test_face_handlers(self, temp_font_copy: Path) -> None:
+        """Test a single font handler is its own only face."""
+        handler = FontNameHandler(temp_font_copy)
+        assert face_handlers(handler) == [handler]
+        handler.close()
+
+
+class TestInMemory:
+    """Tests for the bytes-in/bytes-out and TTFont-in/TTFont-out API."""
+
+    def test_bytes_match_file_rename(self, temp_font_copy: Path) -> None:
+        """Test renaming bytes gives the same font as renaming the file."""
+        data = temp_font_copy.read_bytes()
+        renamed = rename_font_data(data, "suffix", {"suffix": " Mem"})
+        output = temp_font_copy.with_name("out.ttf")
+        assert rename_font(temp_font_copy, "suffix", {"suffix": " Mem"}, output).ok
+        assert renamed == output.read_bytes()
+        assert temp_font_copy.read_bytes() == data
+
+    def test_file_object_and_format(self, temp_font_copy: Path) -> None:
+        """Test a binary file object is accepted and re-encoded as WOFF."""
+        with open(temp_font_copy, "rb") as f:
+            renamed = rename_font_data(
+                f, "new", {"new_family": "Web"}, output_format="woff"
+            )
+        assert renamed[:4] == b"wOFF"
+        handler = FontNameHandler(data=renamed)
+        assert handler.read_family_name() == "Web"
+        assert handler.read_family_slug() == "Web"
+        handler.close()
+
+    def test_collection_bytes(self, temp_font_copy: Path, tmp_path: Path) -> None:
+        """Test collection data is renamed face by face."""
+        path = tmp_path / "family.ttc"
+        create_collection(path, temp_font_copy, ["Alpha", "Beta"])
+        renamed = rename_font_data(path.read_bytes(), "prefix", {"prefix": "X "})
+        path.write_bytes(renamed)
+        assert read_font_names(path).faces == [(0, "X Alpha"), (1, "X Beta")]
+
+    def test_rename_ttfont(self, temp_font_copy: Path) -> None:
+        """Test a loaded TTFont is modified in place and stays open."""
+        font = TTFont(str(temp_font_copy))
+        assert rename_ttfont(font, "new", {"new_family": "Loaded"}) is font
+        assert font["name"].getDebugName(1) == "Loaded"
+        assert font["name"].getDebugName(6) == "Loaded"
+        font["head"]  # Still usable: the handler did not close it
+        font.close()
+
+    def test_invalid_format(self, temp_font_copy: Path) -> None:
+        """Test several or unknown output formats are rejected."""
+        data = temp_font_copy.read_bytes()
+        with pytest.raises(ValueError):
+            rename_font_data(data, "suffix", {"suffix": "X"}, output_format="eot")
+        with pytest.raises(ValueError, match="one output format"):
+            rename_font_data(data, "suffix", {"suffix": "X"}, output_format="woff,ttf")
+
+
+class TestStream:
+    """Tests for renaming to a stream (stdin/stdout pipelines)."""
+
+    def test_identical_to_file_output(self, temp_font_copy: Path) -> None:
+        """Test streamed bytes equal a rename to an explicit path."""
+        out = io.BytesIO()
+        result = rename_stream(temp_font_copy, "suffix", {"suffix": " S"}, out, True)
+        assert result.ok, result.error
+        assert result.new_family_name == "Roboto S"
+        assert result.output_path is None
+
+        output = temp_font_copy.with_name("out.ttf")
+        assert rename_font(temp_font_copy, "suffix", {"suffix": " S"}, output).ok
+        assert out.getvalue() == output.read_bytes()
+        assert not list(temp_font_copy.parent.glob(".fontnemo_tmp_*"))
+
+    def test_reads_stdin(
+        self, temp_font_copy: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test "-" reads the font from stdin."""
+        stdin = io.TextIOWrapper(io.BytesIO(temp_font_copy.read_bytes()))
+        monkeypatch.setattr(sys, "stdin", stdin)
+        out = io.BytesIO()
+        result = rename_stream(STDIO_PATH, "new", {"new_family": "Piped"}, out)
+        assert result.ok, result.error
+        assert FontNameHandler(data=out.getvalue()).read_family_name() == "Piped"
+
+    def test_failure_writes_nothing(self, tmp_path: Path) -> None:
+        """Test a failed rename leaves the stream empty."""
+        bad = tmp_path / "bad.ttf"
+        bad.write_bytes(b"not a font")
+        out = io.BytesIO()
+        assert not rename_stream(bad, "suffix", {"suffix": "X"}, out).ok
+        assert out.getvalue() == b""
+
+    def test_cli_pipeline(self, temp_font_copy: Path) -> None:
+        """Test two commands chained through a pipe."""
+        env = dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent / "src"))
+        command = [sys.executable, "-m", "fontnemo"]
+        first = subprocess.run(
+            [*command, "s", str(temp_font_copy), "--suffix= A", "--output_path=-"],
+            capture_output=True,
+            env=env,
+            check=True,
+        )
+        second = subprocess.run(
+            [*command, "p", "-", "--prefix=B ", "--verify"],
+            input=first.stdout,
+            capture_output=True,
+            env=env,
+            check=True,
+        )
+        assert FontNameHandler(data=second.stdout).read_family_name() == "B Roboto A"
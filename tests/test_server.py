@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# this_file: tests/test_server.py
+"""Tests for the warm daemon (server module) and its thin client."""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from fontnemo.client import (
+    check_private_dir,
+    connect,
+    default_socket_path,
+    encode_request,
+    peer_uid,
+)
+from fontnemo.server import read_request
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"),
+    reason="needs Unix sockets and fork",
+)
+
+
+def run(
+    module: str, args: list[str], socket_path: Path, cwd: Path
+) -> subprocess.CompletedProcess[str]:
+    """Run ``python -m module args`` with the daemon socket configured."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR), FONTNEMO_SOCKET=str(socket_path))
+    return subprocess.run(
+        [sys.executable, "-m", module, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+    )
+
+
+def wait_for_socket(path: Path, timeout: float = 10.0) -> None:
+    """Wait until a daemon accepts connections on path."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connect(path).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"No daemon on {path}")
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Path:
+    """Return a socket path for the test daemon."""
+    return tmp_path / "s.sock"
+
+
+@pytest.fixture
+def daemon(socket_path: Path, tmp_path: Path) -> Iterator[subprocess.Popen[str]]:
+    """Run `fontnemo serve` for the duration of a test."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "fontnemo", "serve", f"--socket_path={socket_path}"],
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+    )
+    try:
+        wait_for_socket(socket_path)
+        yield process
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        process.stderr.close()
+
+
+class TestServer:
+    """Tests for commands forwarded to a running daemon."""
+
+    def test_same_output_as_local(
+        self,
+        test_font_path: Path,
+        daemon: subprocess.Popen[str],
+        socket_path: Path,
+        tmp_path: Path,
+    ) -> None:
+        """Test forwarded view prints what a local run prints."""
+        shutil.copy(test_font_path, tmp_path / "font.ttf")
+        args = ["view", "font.ttf", "--long"]
+        remote = run("fontnemo.client", args, socket_path, tmp_path)
+        local = run("fontnemo", args, socket_path, tmp_path)
+        assert remote.returncode == local.returncode == 0
+        assert remote.stdout == local.stdout == "font.ttf:Roboto\n"
+
+    def test_rename_relative_to_client_cwd(
+        self,
+        test_font_path: Path,
+        daemon: subprocess.Popen[str],
+        socket_path: Path,
+        tmp_path: Path,
+    ) -> None:
+        """Test relative paths resolve against the client's directory."""
+        work = tmp_path / "work"
+        work.mkdir()
+        shutil.copy(test_font_path, work / "font.ttf")
+        result = run(
+            "fontnemo.client", ["s", "font.ttf", "--suffix= Warm"], socket_path, work
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == "Roboto Warm\n"
+
+    def test_error_exit_status(
+        self, daemon: subprocess.Popen[str], socket_path: Path, tmp_path: Path
+    ) -> None:
+        """Test failures keep their exit status and stderr message."""
+        result = run("fontnemo.client", ["view", "missing.ttf"], socket_path, tmp_path)
+        assert result.returncode == 1
+        assert result.stdout == ""
+        assert "missing.ttf" in result.stderr
+
+    def test_second_daemon_refused(
+        self, daemon: subprocess.Popen[str], socket_path: Path, tmp_path: Path
+    ) -> None:
+        """Test a second daemon does not take over a live socket."""
+        result = run(
+            "fontnemo", ["serve", f"--socket_path={socket_path}"], socket_path, tmp_path
+        )
+        assert result.returncode == 1
+        assert "already running" in result.stderr
+
+    def test_fallback_without_daemon(
+        self, test_font_path: Path, socket_path: Path, tmp_path: Path
+    ) -> None:
+        """Test the client runs the command itself when no daemon listens."""
+        shutil.copy(test_font_path, tmp_path / "font.ttf")
+        result = run("fontnemo.client", ["v", "font.ttf"], socket_path, tmp_path)
+        assert result.returncode == 0
+        assert result.stdout == "Roboto\n"
+
+
+class TestReadRequest:
+    """Tests for request parsing."""
+
+    def test_round_trip(self) -> None:
+        """Test argv, cwd and three descriptors are received."""
+        client, server = socket.socketpair()
+        with client, server:
+            socket.send_fds(client, [encode_request(["v", "a.ttf"], "/")], [0, 1, 2])
+            argv, cwd, fds = read_request(server)
+            for fd in fds:
+                os.close(fd)
+        assert (argv, cwd, len(fds)) == (["v", "a.ttf"], "/", 3)
+
+    def test_rejects_other_version(self) -> None:
+        """Test requests from an incompatible client are refused."""
+        client, server = socket.socketpair()
+        with client, server:
+            data = json.dumps({"version": 0, "argv": [], "cwd": "/"}) + "\n"
+            socket.send_fds(client, [data.encode()], [0, 1, 2])
+            with pytest.raises(ValueError, match="Protocol version"):
+                read_request(server)
+
+
+class TestSocketSecurity:
+    """Tests for keeping the daemon socket private to its user."""
+
+    def test_fallback_is_in_private_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the fallback socket is not directly in the shared temp dir."""
+        monkeypatch.delenv("FONTNEMO_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setenv("TMPDIR", str(tmp_path))
+        monkeypatch.setattr("tempfile.tempdir", None)
+        path = default_socket_path()
+        assert path.parent.parent == tmp_path
+        check_private_dir(path.parent, create=True)
+        assert path.parent.stat().st_mode & 0o777 == 0o700
+
+    def test_rejects_shared_dir(self, tmp_path: Path) -> None:
+        """Test a directory other users can enter is refused."""
+        shared = tmp_path / "shared"
+        shared.mkdir(mode=0o755)
+        shared.chmod(0o755)
+        with pytest.raises(PermissionError, match="0700"):
+            check_private_dir(shared)
+        with pytest.raises(FileNotFoundError):
+            check_private_dir(tmp_path / "missing")
+
+    @pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="Linux only")
+    def test_peer_uid(self) -> None:
+        """Test the peer's uid is read from the socket."""
+        client, server = socket.socketpair()
+        with client, server:
+            assert peer_uid(client) == os.getuid()
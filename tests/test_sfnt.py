@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# this_file: tests/test_sfnt.py
+"""Tests for sfnt module (table directory and name-only writes)."""
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+from fontTools.ttLib import TTFont
+
+from fontnemo.core import FontNameHandler
+from fontnemo.sfnt import (
+    CHECKSUM_MAGIC,
+    calc_checksum,
+    decode_name_string,
+    is_collection,
+    load_name_records,
+    patch_table_in_place,
+    read_face_directory,
+    read_sfnt_directory,
+    verify_name_table,
+    write_collection,
+    write_sfnt,
+)
+from tests.create_test_fonts import create_collection
+
+
+def compiled_name(font_path: Path, family_name: str) -> bytes:
+    """Return a compiled name table with a new family name."""
+    handler = FontNameHandler(font_path)
+    handler.write_family_name(family_name)
+    data = handler.compile_name_table()
+    handler.close()
+    return data
+
+
+def table_bytes(data: bytes, tag: str) -> bytes:
+    """Return raw bytes of one table from a font file's contents."""
+    entry = read_sfnt_directory(data).tables[tag]
+    return data[entry.offset : entry.offset + entry.length]
+
+
+class TestChecksum:
+    """Tests for calc_checksum."""
+
+    def test_padding(self) -> None:
+        """Test data is zero-padded to 4 bytes."""
+        assert calc_checksum(b"\x00\x00\x00\x01") == 1
+        assert calc_checksum(b"\x01") == 0x01000000
+
+    def test_wraps_32_bit(self) -> None:
+        """Test sum wraps modulo 2**32."""
+        assert calc_checksum(b"\xff\xff\xff\xff\x00\x00\x00\x02") == 1
+
+    def test_fixture_whole_file(self, test_font_path: Path) -> None:
+        """Test whole-file checksum of a valid font is the magic number."""
+        assert calc_checksum(test_font_path.read_bytes()) == CHECKSUM_MAGIC
+
+
+class TestReadSfntDirectory:
+    """Tests for read_sfnt_directory."""
+
+    def test_reads_tables(self, test_font_path: Path) -> None:
+        """Test directory lists name and head tables."""
+        directory = read_sfnt_directory(test_font_path.read_bytes())
+        assert {"name", "head"} <= set(directory.tables)
+
+    def test_rejects_non_font(self) -> None:
+        """Test non-sfnt data raises ValueError."""
+        with pytest.raises(ValueError):
+            read_sfnt_directory(b"not a font at all")
+
+
+class TestWriteSfnt:
+    """Tests for write_sfnt."""
+
+    def test_copies_other_tables(self, test_font_path: Path) -> None:
+        """Test only the name table changes, other tables are byte-identical."""
+        src = test_font_path.read_bytes()
+        name_data = compiled_name(test_font_path, "A Considerably Longer Family")
+        out = io.BytesIO()
+        write_sfnt(src, out, {"name": name_data})
+        result = out.getvalue()
+
+        assert calc_checksum(result) == CHECKSUM_MAGIC
+        assert table_bytes(result, "name") == name_data
+        for tag in read_sfnt_directory(src).tables:
+            if tag not in ("name", "head"):
+                assert table_bytes(result, tag) == table_bytes(src, tag)
+
+        font = TTFont(io.BytesIO(result), checkChecksums=2)
+        assert font["name"].getDebugName(1) == "A Considerably Longer Family"
+        font.close()
+
+    def test_missing_table(self, test_font_path: Path) -> None:
+        """Test replacing a table that does not exist raises."""
+        with pytest.raises(ValueError):
+            write_sfnt(test_font_path.read_bytes(), io.BytesIO(), {"zzzz": b""})
+
+
+class TestWriteCollection:
+    """Tests for collection reading and write_collection."""
+
+    @pytest.fixture
+    def ttc_path(self, test_font_path: Path, tmp_path: Path) -> Path:
+        """Create a two-face collection sharing all tables except name."""
+        path = tmp_path / "family.ttc"
+        create_collection(path, test_font_path, ["Alpha", "Beta"])
+        return path
+
+    def test_read_faces(self, ttc_path: Path) -> None:
+        """Test each face's directory and name records are read."""
+        data = ttc_path.read_bytes()
+        assert is_collection(data)
+        assert (
+            read_face_directory(data, 0).tables["glyf"]
+            == (read_face_directory(data, 1).tables["glyf"])
+        )
+        assert load_name_records(ttc_path, 1)[(1, 3, 1, 0x409)] == "Beta".encode(
+            "utf_16_be"
+        )
+
+    def test_rename_one_face(self, ttc_path: Path, tmp_path: Path) -> None:
+        """Test replacing one face's name keeps shared tables stored once."""
+        src = ttc_path.read_bytes()
+        name_data = compiled_name(ttc_path, "Gamma")
+        out_path = tmp_path / "out.ttc"
+        with open(out_path, "wb") as out:
+            write_collection(src, out, {0: {"name": name_data}})
+        result = out_path.read_bytes()
+
+        # Only the name table grows or shrinks; shared tables are not duplicated
+        assert abs(len(result) - len(src)) < 64
+        face0 = read_face_directory(result, 0).tables
+        face1 = read_face_directory(result, 1).tables
+        assert face0["glyf"] == face1["glyf"]
+        assert face0["name"].offset != face1["name"].offset
+        for face in (0, 1):
+            verify_name_table(out_path, face)
+
+        from fontTools.ttLib import TTCollection
+
+        collection = TTCollection(str(out_path))
+        names = [font["name"].getDebugName(1) for font in collection.fonts]
+        assert names == ["Gamma", "Beta"]
+        collection.close()
+
+    def test_face_out_of_range(self, ttc_path: Path) -> None:
+        """Test a missing face index raises ValueError."""
+        with pytest.raises(ValueError):
+            read_face_directory(ttc_path.read_bytes(), 5)
+
+
+class TestPatchTableInPlace:
+    """Tests for patch_table_in_place."""
+
+    def test_patch_when_it_fits(self, temp_font_copy: Path) -> None:
+        """Test a shorter name table is patched into the file."""
+        size = temp_font_copy.stat().st_size
+        name_data = compiled_name(temp_font_copy, "Tiny")
+
+        assert patch_table_in_place(temp_font_copy, "name", name_data)
+
+        data = temp_font_copy.read_bytes()
+        assert len(data) == size
+        assert calc_checksum(data) == CHECKSUM_MAGIC
+        assert table_bytes(data, "name") == name_data
+
+    def test_no_patch_when_too_large(self, temp_font_copy: Path) -> None:
+        """Test a larger name table leaves the file untouched."""
+        original = temp_font_copy.read_bytes()
+        name_data = compiled_name(temp_font_copy, "Very Long Family Name " * 20)
+
+        assert not patch_table_in_place(temp_font_copy, "name", name_data)
+        assert temp_font_copy.read_bytes() == original
+
+    def test_no_patch_with_hard_links(self, temp_font_copy: Path) -> None:
+        """Test a file with other hard links is not patched."""
+        link = temp_font_copy.with_name("link.ttf")
+        os.link(temp_font_copy, link)
+        original = temp_font_copy.read_bytes()
+
+        assert not patch_table_in_place(
+            temp_font_copy, "name", compiled_name(temp_font_copy, "Tiny")
+        )
+        assert link.read_bytes() == original
+
+
+class TestNameReader:
+    """Tests for the lightweight name table reader."""
+
+    def test_matches_fonttools(self, test_font_path: Path) -> None:
+        """Test decoded records match fontTools for every record."""
+        records = load_name_records(test_font_path)
+        font = TTFont(str(test_font_path))
+        for rec in font["name"].names:
+            key = (rec.nameID, rec.platformID, rec.platEncID, rec.langID)
+            raw = records[key]
+            assert decode_name_string(
+                raw, rec.platformID, rec.platEncID, rec.langID
+            ) == (rec.toUnicode())
+        font.close()
+
+    def test_decode_mac_roman(self) -> None:
+        """Test Mac Roman records are decoded with mac_roman."""
+        assert decode_name_string("Schön".encode("mac_roman"), 1, 0) == "Schön"
+
+    @pytest.mark.parametrize(
+        ("raw", "platform_id", "encoding_id", "language_id"),
+        [
+            ("明朝".encode("shift_jis"), 1, 1, 11),  # Mac Japanese
+            ("Шрифт".encode("mac_cyrillic"), 1, 7, 32),  # Mac Cyrillic
+            ("Þór".encode("mac_iceland"), 1, 0, 15),  # Mac Roman, Icelandic
+            ("Ab".encode("utf_16_be") + b"\0", 3, 1, 0x409),  # Odd UTF-16
+            ("Ab".encode("utf_16_be"), 1, 0, 0),  # UTF-16 in a Mac record
+        ],
+    )
+    def test_legacy_encodings_match_fonttools(
+        self, raw: bytes, platform_id: int, encoding_id: int, language_id: int
+    ) -> None:
+        """Test legacy encodings decode as fontTools' NameRecord does."""
+        from fontTools.ttLib.tables._n_a_m_e import NameRecord
+
+        rec = NameRecord()
+        rec.nameID, rec.string = 1, raw
+        rec.platformID, rec.platEncID, rec.langID = (
+            platform_id,
+            encoding_id,
+            language_id,
+        )
+        assert decode_name_string(raw, platform_id, encoding_id, language_id) == (
+            rec.toUnicode()
+        )
+
+    def test_rejects_non_font(self, tmp_path: Path) -> None:
+        """Test reading a non-font raises ValueError."""
+        path = tmp_path / "empty.ttf"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            load_name_records(path)
+
+
+class TestVerifyNameTable:
+    """Tests for verify_name_table."""
+
+    def test_valid_font(self, test_font_path: Path) -> None:
+        """Test an unmodified font verifies."""
+        verify_name_table(test_font_path)
+
+    def test_corrupted_name_table(self, temp_font_copy: Path) -> None:
+        """Test a flipped byte in the name table is detected."""
+        data = bytearray(temp_font_copy.read_bytes())
+        entry = read_sfnt_directory(bytes(data)).tables["name"]
+        data[entry.offset + entry.length - 1] ^= 0xFF
+        temp_font_copy.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError, match="'name' table checksum"):
+            verify_name_table(temp_font_copy)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# this_file: tests/test_startup.py
+"""Startup-time benchmark guarding the CLI's lazy imports."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Wall-time budget for one `fontnemo view` process, in seconds
+STARTUP_BUDGET = float(os.environ.get("FONTNEMO_STARTUP_BUDGET", "0.5"))
+
+# Modules that must not be imported by a plain `view`
+HEAVY_MODULES = ("fire", "loguru", "fontTools", "concurrent.futures")
+
+
+def run_python(code: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter with fontnemo importable."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+class TestStartup:
+    """Tests for CLI startup cost."""
+
+    def test_view_avoids_heavy_imports(self, test_font_path: Path) -> None:
+        """Test `view` runs without importing fire, loguru or fontTools."""
+        code = (
+            "import sys\n"
+            "from fontnemo.__main__ import main\n"
+            f"main(['view', {str(test_font_path)!r}])\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        output = run_python(code).stdout.splitlines()
+        assert output == ["Roboto", "[]"]
+
+    def test_view_startup_time(self, test_font_path: Path) -> None:
+        """Test `fontnemo view` stays within the startup budget."""
+        code = (
+            "from fontnemo.__main__ import main; "
+            f"main(['view', {str(test_font_path)!r}])"
+        )
+        run_python(code)  # Warm up bytecode caches
+
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            run_python(code)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        if best > STARTUP_BUDGET:
+            pytest.fail(f"view took {best:.3f}s, budget {STARTUP_BUDGET:.3f}s")
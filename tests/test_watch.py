@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# this_file: tests/test_watch.py
+"""Tests for renaming fonts as they land in watched directories."""
+
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from fontnemo.core import FontNameHandler
+from fontnemo.discover import is_selected
+from fontnemo.operations import RenameResult
+from fontnemo.utils import make_timestamp
+from fontnemo.watch import FontWatcher, PollingBackend
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="watch tests rely on POSIX renames"
+)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> None:
+    """Wait until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+@pytest.fixture(params=[False, True], ids=["inotify", "polling"])
+def watching(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Iterator[tuple[Path, list[RenameResult]]]:
+    """Run a suffix watch on an empty directory in a thread."""
+    root = tmp_path / "watched"
+    root.mkdir()
+    results: list[RenameResult] = []
+    watcher = FontWatcher(
+        [root],
+        "suffix",
+        {"suffix": " Beta"},
+        exclude="drafts",
+        debounce=0.1,
+        polling=request.param,
+        interval=0.1,
+        on_result=results.append,
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    time.sleep(0.3)  # Let the watch (or the first snapshot) start
+    try:
+        yield root, results
+    finally:
+        watcher.stop()
+        thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_landed_font_is_renamed_once(
+    test_font_path: Path,
+    watching: tuple[Path, list[RenameResult]],
+) -> None:
+    """Test a font written in bursts is renamed once and its save ignored."""
+    root, results = watching
+    data = test_font_path.read_bytes()
+    (root / "sub").mkdir()
+    with open(root / "sub" / "new.ttf", "wb") as f:
+        for i in range(0, len(data), 4096):
+            f.write(data[i : i + 4096])
+            f.flush()
+
+    wait_for(lambda: len(results) == 1)
+    time.sleep(0.5)  # The rename's own save must not trigger another
+    assert len(results) == 1
+    assert results[0].ok
+    assert FontNameHandler(root / "sub" / "new.ttf").read_family_name() == (
+        "Roboto Beta"
+    )
+
+
+def test_ignored_names(
+    test_font_path: Path, watching: tuple[Path, list[RenameResult]]
+) -> None:
+    """Test temp files, stamped outputs, excluded paths and non-fonts."""
+    root, results = watching
+    shutil.copy(test_font_path, root / ".fontnemo_tmp_abc.ttf")
+    shutil.copy(test_font_path, root / f"font--{make_timestamp()}.ttf")
+    (root / "drafts").mkdir()
+    shutil.copy(test_font_path, root / "drafts" / "draft.ttf")
+    (root / "notes.txt").write_text("not a font")
+    shutil.copy(test_font_path, root / "kept.ttf")
+
+    wait_for(lambda: len(results) == 1)
+    time.sleep(0.5)
+    assert [r.input_path.name for r in results] == ["kept.ttf"]
+
+
+def test_user_double_dash_names(
+    test_font_path: Path, watching: tuple[Path, list[RenameResult]]
+) -> None:
+    """Test names that only look stamped are renamed."""
+    root, results = watching
+    shutil.copy(test_font_path, root / "Font--bold.ttf")
+    shutil.copy(test_font_path, root / "Font--medium.ttf")  # Base-36 of 2012
+
+    wait_for(lambda: len(results) == 2)
+    assert sorted(r.input_path.name for r in results) == [
+        "Font--bold.ttf",
+        "Font--medium.ttf",
+    ]
+
+
+def test_is_selected() -> None:
+    """Test the walk's filters applied to a single relative path."""
+    assert is_selected("a/b.ttf", (), ())
+    assert not is_selected("a/.fontnemo_tmp_x.ttf", (), ())
+    assert not is_selected("build/b.ttf", (), ("build",))
+    assert not is_selected("a/b.otf", ("*.ttf",), ())
+    assert is_selected("a/b.ttf", ("a/*",), ("b",))
+
+
+def test_polling_reports_changes(tmp_path: Path) -> None:
+    """Test polling reports new and changed files, not the baseline."""
+    (tmp_path / "old.ttf").write_bytes(b"old")
+    backend = PollingBackend([str(tmp_path)], interval=0.0)
+    assert backend.changes(0.1) == []
+    (tmp_path / "new.ttf").write_bytes(b"new")
+    assert backend.changes(0.1) == [str(tmp_path / "new.ttf")]
+
+
+def test_invalid_root(tmp_path: Path) -> None:
+    """Test a missing directory is refused."""
+    with pytest.raises(ValueError, match="Not a directory"):
+        FontWatcher([tmp_path / "missing"], "timestamp", {})
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# this_file: tests/test_woff.py
+"""Tests for woff module (WOFF/WOFF2 table access and name-only writes)."""
+
+import io
+from pathlib import Path
+
+import pytest
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.sfnt import WOFFFlavorData
+
+from fontnemo.core import (
+    FAMILY_NAME_IDS,
+    FAMILY_SLUG_IDS,
+    FontNameHandler,
+    parse_formats,
+)
+from fontnemo.operations import read_font_names, rename_font
+from fontnemo.woff import (
+    _pack_base128,
+    _read_base128,
+    encode_woff,
+    read_woff2_stream,
+    read_woff_directory,
+    read_woff_table,
+    verify_woff,
+    write_woff,
+)
+from tests.create_test_fonts import create_collection
+
+
+def make_web_font(source: Path, path: Path, flavor: str) -> Path:
+    """Save a copy of source with the given WOFF flavor."""
+    font = TTFont(str(source))
+    font.flavor = flavor
+    if flavor == "woff":
+        font.flavorData = WOFFFlavorData()
+        font.flavorData.metaData = b"<metadata version='1.0'/>"
+        font.flavorData.privData = b"private"
+    font.save(str(path))
+    font.close()
+    return path
+
+
+def renamed_reference(path: Path, family_name: str) -> TTFont:
+    """Rename a web font with a full fontTools round-trip (for comparison)."""
+    font = TTFont(str(path), recalcTimestamp=False)
+    for record in font["name"].names:
+        if record.nameID in FAMILY_NAME_IDS:
+            record.string = family_name
+        elif record.nameID in FAMILY_SLUG_IDS:
+            record.string = family_name.replace(" ", "")
+    out = io.BytesIO()
+    font.save(out)
+    font.close()
+    return TTFont(io.BytesIO(out.getvalue()))
+
+
+@pytest.fixture
+def woff_path(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create a WOFF 1.0 copy of the test font with metadata."""
+    return make_web_font(test_font_path, tmp_path / "font.woff", "woff")
+
+
+@pytest.fixture
+def woff2_path(test_font_path: Path, tmp_path: Path) -> Path:
+    """Create a WOFF 2.0 copy of the test font."""
+    pytest.importorskip("brotli")
+    return make_web_font(test_font_path, tmp_path / "font.woff2", "woff2")
+
+
+class TestBase128:
+    """Tests for UIntBase128 encoding."""
+
+    def test_round_trip(self) -> None:
+        """Test values encode and decode to themselves."""
+        for value in (0, 1, 127, 128, 16383, 16384, 2**32 - 1):
+            data = _pack_base128(value)
+            assert _read_base128(data, 0) == (value, len(data))
+
+    def test_leading_zeros(self) -> None:
+        """Test a leading 0x80 byte is rejected."""
+        with pytest.raises(ValueError):
+            _read_base128(b"\x80\x01", 0)
+
+
+class TestWoff:
+    """Tests for WOFF 1.0 reading and writing."""
+
+    def test_read_name_table(self, woff_path: Path) -> None:
+        """Test the name table is decompressed to the sfnt table data."""
+        font = TTFont(str(woff_path))
+        expected = font.reader["name"]
+        font.close()
+        assert read_woff_table(woff_path.read_bytes(), "name") == expected
+        assert read_font_names(woff_path).family_name == "Roboto"
+
+    def test_write_copies_other_streams(self, woff_path: Path) -> None:
+        """Test only name and head are recompressed."""
+        src = woff_path.read_bytes()
+        handler = FontNameHandler(woff_path)
+        handler.write_family_name("Renamed")
+        out = io.BytesIO()
+        write_woff(src, out, {"name": handler.compile_name_table()})
+        handler.close()
+        result = out.getvalue()
+
+        verify_woff(result)
+        old = read_woff_directory(src)
+        new = read_woff_directory(result)
+        for tag, entry in old.tables.items():
+            if tag in ("name", "head"):
+                continue
+            new_entry = new.tables[tag]
+            new_data = result[new_entry.offset : new_entry.offset + entry.comp_length]
+            assert new_data == src[entry.offset : entry.offset + entry.comp_length]
+
+    def test_matches_fonttools(self, woff_path: Path) -> None:
+        """Test name, head and metadata match a full fontTools round-trip."""
+        reference_path = woff_path.with_name("ref.woff")
+        reference_path.write_bytes(woff_path.read_bytes())
+        reference = renamed_reference(reference_path, "Renamed")
+
+        result = rename_font(woff_path, "new", {"new_family": "Renamed"}, verify=True)
+        assert result.ok, result.error
+
+        font = TTFont(str(woff_path))
+        assert font.flavor == "woff"
+        assert font.reader["name"] == reference.reader["name"]
+        assert font.reader["head"] == reference.reader["head"]
+        assert font.flavorData.metaData == reference.flavorData.metaData
+        assert font.flavorData.privData == b"private"
+        font.close()
+
+    def test_verify_detects_corruption(self, woff_path: Path) -> None:
+        """Test a wrong stored name checksum is detected."""
+        data = bytearray(woff_path.read_bytes())
+        index = list(read_woff_directory(data).tables).index("name")
+        # origChecksum is the last field of the 20-byte directory record
+        data[44 + index * 20 + 19] ^= 0xFF
+        with pytest.raises(ValueError, match="'name' table checksum"):
+            verify_woff(bytes(data))
+
+    def test_output_modes(self, woff_path: Path) -> None:
+        """Test timestamped output keeps the .woff suffix and the original."""
+        original = woff_path.read_bytes()
+        result = rename_font(woff_path, "suffix", {"suffix": " Web"}, "2")
+        assert result.ok, result.error
+        assert result.output_path is not None
+        assert result.output_path.suffix == ".woff"
+        assert woff_path.read_bytes() == original
+        assert read_font_names(result.output_path).family_name == "Roboto Web"
+
+    def test_no_in_place_patch(self, woff_path: Path) -> None:
+        """Test compressed fonts are never patched in place."""
+        handler = FontNameHandler(woff_path)
+        handler.write_family_name("R")
+        assert not handler.save_in_place()
+        handler.close()
+
+
+class TestWoff2:
+    """Tests for WOFF 2.0 reading and writing."""
+
+    def test_read_names(self, woff2_path: Path) -> None:
+        """Test names are read from the decompressed stream."""
+        assert read_font_names(woff2_path).family_name == "Roboto"
+
+    def test_matches_fonttools(self, woff2_path: Path) -> None:
+        """Test output matches a full fontTools round-trip table by table."""
+        reference_path = woff2_path.with_name("ref.woff2")
+        reference_path.write_bytes(woff2_path.read_bytes())
+        reference = renamed_reference(reference_path, "Renamed")
+
+        result = rename_font(woff2_path, "new", {"new_family": "Renamed"}, verify=True)
+        assert result.ok, result.error
+
+        font = TTFont(str(woff2_path))
+        assert font.flavor == "woff2"
+        for tag in font.keys():
+            if tag != "GlyphOrder":
+                assert font.getTableData(tag) == reference.getTableData(tag), tag
+        font.close()
+
+    def test_transformed_tables_kept(self, woff2_path: Path) -> None:
+        """Test transformed glyf data is carried over unchanged."""
+        old_dir, old_stream = read_woff2_stream(woff2_path.read_bytes())
+        assert rename_font(woff2_path, "suffix", {"suffix": " X"}).ok
+        new_dir, new_stream = read_woff2_stream(woff2_path.read_bytes())
+
+        old, new = old_dir.tables["glyf"], new_dir.tables["glyf"]
+        assert old.transform_length is not None
+        old_glyf = old_stream[old.offset : old.offset + old.length]
+        assert new_stream[new.offset : new.offset + new.length] == old_glyf
+
+
+class TestMultiFormat:
+    """Tests for writing several output formats from one rename."""
+
+    def test_parse_formats(self) -> None:
+        """Test aliases are normalized and unknown formats rejected."""
+        assert parse_formats("") is None
+        assert parse_formats("ttf, woff,sfnt") == ["sfnt", "woff"]
+        with pytest.raises(ValueError, match="Unknown output format"):
+            parse_formats("eot")
+
+    def test_encode_woff(self, test_font_path: Path) -> None:
+        """Test native WOFF encoding decodes to the same tables."""
+        sfnt = test_font_path.read_bytes()
+        data = encode_woff(sfnt)
+        verify_woff(data)
+        source = TTFont(io.BytesIO(sfnt))
+        font = TTFont(io.BytesIO(data))
+        assert font.flavor == "woff"
+        for tag in source.reader.keys():
+            assert font.reader[tag] == source.reader[tag], tag
+
+    def test_rename_to_all_formats(self, test_font_path: Path, tmp_path: Path) -> None:
+        """Test one rename writes sfnt, WOFF and WOFF2 side by side."""
+        pytest.importorskip("brotli")
+        path = tmp_path / "font.ttf"
+        path.write_bytes(test_font_path.read_bytes())
+        result = rename_font(
+            path,
+            "new",
+            {"new_family": "Multi"},
+            formats=["sfnt", "woff", "woff2"],
+            verify=True,
+        )
+        assert result.ok, result.error
+        assert result.output_paths == [
+            path,
+            path.with_suffix(".woff"),
+            path.with_suffix(".woff2"),
+        ]
+        for output in result.output_paths:
+            assert read_font_names(output).family_name == "Multi"
+
+    def test_timestamped_outputs(self, woff_path: Path) -> None:
+        """Test mode "2" shares one stem and sfnt output from WOFF is .ttf."""
+        original = woff_path.read_bytes()
+        result = rename_font(
+            woff_path, "suffix", {"suffix": " X"}, "2", formats=["woff", "sfnt"]
+        )
+        assert result.ok, result.error
+        assert result.output_paths is not None
+        woff_out, sfnt_out = result.output_paths
+        assert woff_out.suffix == ".woff"
+        assert sfnt_out == woff_out.with_suffix(".ttf")
+        assert woff_path.read_bytes() == original
+        assert read_font_names(sfnt_out).family_name == "Roboto X"
+
+    def test_collection_rejects_web_formats(
+        self, test_font_path: Path, tmp_path: Path
+    ) -> None:
+        """Test collections cannot be written as WOFF."""
+        path = tmp_path / "c.ttc"
+        create_collection(path, test_font_path, ["A", "B"])
+        result = rename_font(path, "suffix", {"suffix": " X"}, formats=["woff"])
+        assert not result.ok
+        assert "collection" in (result.error or "").lower()